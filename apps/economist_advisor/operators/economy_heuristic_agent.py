@@ -6,6 +6,8 @@ class EconomyHeuristicAgent(OperatorAgent):
     Applies economic reasoning to explain impacts of market policies or conditions.
     """
 
+    pure = True
+
     def run(self, state: State) -> State:
         self.log("Applying economic heuristics")
 
@@ -20,4 +22,4 @@ class EconomyHeuristicAgent(OperatorAgent):
         else:
             explanation = "Economic impacts vary. Please specify a clearer focus or topic for analysis."
 
-        return {**state, "output": explanation}
\ No newline at end of file
+        return {"output": explanation}
\ No newline at end of file
@@ -0,0 +1,8 @@
+from rasa.core.agent import OperatorAgent
+
+class ExternalDataOperator(OperatorAgent):
+    reads = ()
+    writes = ("externaldataoperator",)
+
+    def run(self, state):
+        return {"externaldataoperator": "ExternalDataOperator: Not implemented"}
@@ -1,4 +0,0 @@
-class ExternalDataOperator:
-    def run(self, state):
-        state['externaldataoperator'] = "ExternalDataOperator: Not implemented"
-        return state
@@ -0,0 +1,8 @@
+from rasa.core.agent import OperatorAgent
+
+class PortfolioHealthOperator(OperatorAgent):
+    reads = ()
+    writes = ("portfoliohealthoperator",)
+
+    def run(self, state):
+        return {"portfoliohealthoperator": "PortfolioHealthOperator: Not implemented"}
@@ -1,4 +0,0 @@
-class PortfolioHealthOperator:
-    def run(self, state):
-        state['portfoliohealthoperator'] = "PortfolioHealthOperator: Not implemented"
-        return state
@@ -0,0 +1,8 @@
+from rasa.core.agent import OperatorAgent
+
+class SectorInsightsOperator(OperatorAgent):
+    reads = ()
+    writes = ("sectorinsightsoperator",)
+
+    def run(self, state):
+        return {"sectorinsightsoperator": "SectorInsightsOperator: Not implemented"}
@@ -9,6 +9,8 @@ class TravelHeuristicAgent(OperatorAgent):
     Relies on preferences like region, season, and travel style.
     """
 
+    pure = True
+
     def run(self, state: State) -> State:
         self.log("Applying travel heuristics")
 
@@ -22,7 +24,7 @@ class TravelHeuristicAgent(OperatorAgent):
         destination = self._select_destination(region, style, season)
 
         output = f"For a {style} {season} getaway in {region.title()}, consider visiting {destination}."
-        return {**state, "output": output}
+        return {"output": output}
 
     def _select_destination(self, region: str, style: str, season: str) -> str:
         # Simple hardcoded heuristic logic
@@ -0,0 +1,315 @@
+# benchmarks/bench_runner.py
+"""
+End-to-end benchmark of the bundled personas against a fake LLM.
+
+For each persona it reports persona load time, graph compile time, run latency
+percentiles, time to first streamed chunk, throughput under concurrency (thread batch, async batch and, when
+httpx is installed, the `/output` API endpoint) and allocations per run.
+
+`--llm http` (default) serves a fake Ollama on a local port so the real
+LLMAdapter request path is measured; `--llm inproc` replaces the Ollama call
+with a sleep. Results are written as JSON; pass `--compare` with an older
+result file to print the relative change of every metric.
+
+    python -m benchmarks.bench_runner --runs 50 --llm-latency-ms 20
+    python -m benchmarks.bench_runner --compare benchmarks/results/a92c43a.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+PERSONAS = ["travel_concierge", "economist_advisor", "strategic_stock_analyst"]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+from benchmarks.fake_llm import FakeOllamaServer, patch_ollama  # noqa: E402
+from rasa.core.persona import Persona  # noqa: E402
+from rasa.core.runner import Runner  # noqa: E402
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; stable for the small samples benchmarks use."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "mean_ms": statistics.mean(samples_ms),
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+    }
+
+
+def persona_path(name: str) -> str:
+    return str(ROOT / "apps" / name / "persona.yaml")
+
+
+def initial_state(persona: Persona, i: int = 0) -> dict:
+    return {
+        "user_input": f"Benchmark request {i}",
+        "preferences": {"region": "europe"},
+        "metadata": {"tone": persona.metadata.get("tone", "default")},
+    }
+
+
+@contextmanager
+def fake_llm(mode: str, latency_ms: float, token_latency_ms: float = 0.0, cache: bool = False) -> Iterator[Optional[FakeOllamaServer]]:
+    """
+    Point the LLM stack at a fake backend for the duration of the block.
+    The response cache is off unless `cache` is set, since the suite repeats prompts.
+    """
+    import rasa.config.settings  # noqa: F401  (loads .env-llm with override; must happen first)
+
+    saved = {k: os.environ.get(k) for k in ("LLM_PROVIDER", "LLM_HOST", "LLM_CACHE_ENABLED")}
+    os.environ["LLM_PROVIDER"] = "ollama"
+    os.environ["LLM_CACHE_ENABLED"] = "true" if cache else "false"
+    try:
+        if mode == "http":
+            with FakeOllamaServer(latency_ms=latency_ms, token_latency_ms=token_latency_ms) as server:
+                os.environ["LLM_HOST"] = server.url
+                yield server
+        else:
+            with patch_ollama(latency_ms):
+                yield None
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def timed(fn, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_load(name: str, repeat: int) -> Dict[str, float]:
+    path = persona_path(name)
+    load = timed(lambda: Persona.from_yaml(path), repeat)
+    persona = Persona.from_yaml(path)
+    compile_ = timed(lambda: Runner(persona), repeat)
+    return {"load_ms": statistics.median(load), "compile_ms": statistics.median(compile_)}
+
+
+def bench_latency(runner: Runner, runs: int) -> Dict[str, float]:
+    runner.run(initial_state(runner.persona))  # warm up
+    samples = []
+    for i in range(runs):
+        state = initial_state(runner.persona, i)
+        start = time.perf_counter()
+        runner.run(state)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def bench_stream(runner: Runner, runs: int) -> Dict[str, float]:
+    """Time to the first chunk and to the end of `Runner.stream`."""
+    first, total = [], []
+    for i in range(runs):
+        start = time.perf_counter()
+        for n, _ in enumerate(runner.stream(initial_state(runner.persona, i))):
+            if n == 0:
+                first.append((time.perf_counter() - start) * 1000)
+        total.append((time.perf_counter() - start) * 1000)
+    return {"first_chunk_p50_ms": percentile(first, 50), "total_p50_ms": percentile(total, 50)}
+
+
+def bench_allocations(runner: Runner, runs: int) -> Dict[str, float]:
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(runs):
+            state = initial_state(runner.persona, i)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            runner.run(state)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+            retained.append((current - before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib": statistics.median(peaks), "retained_kib": statistics.median(retained)}
+
+
+def bench_throughput(runner: Runner, requests: int, concurrency: int) -> Dict[str, float]:
+    states = lambda: [initial_state(runner.persona, i) for i in range(requests)]  # noqa: E731
+
+    start = time.perf_counter()
+    results = runner.run_batch(states(), max_concurrency=concurrency)
+    thread_s = time.perf_counter() - start
+    errors = sum(isinstance(r, Exception) for r in results)
+
+    start = time.perf_counter()
+    results = asyncio.run(runner.arun_batch(states(), max_concurrency=concurrency))
+    async_s = time.perf_counter() - start
+    errors += sum(isinstance(r, Exception) for r in results)
+
+    return {
+        "thread_rps": requests / thread_s,
+        "async_rps": requests / async_s,
+        "errors": errors,
+    }
+
+
+def bench_api(name: str, requests: int, concurrency: int) -> Optional[Dict[str, float]]:
+    """Concurrent POST /output through the ASGI app; None when httpx is missing."""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    from rasa.api.main import app
+
+    async def drive():
+        gate = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def one(i: int) -> int:
+                async with gate:
+                    start = time.perf_counter()
+                    resp = await client.post("/output", json={"persona": name, "input": f"Benchmark request {i}"})
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    return resp.status_code
+
+            await one(-1)  # warm the runner cache
+            latencies.clear()
+            start = time.perf_counter()
+            codes = await asyncio.gather(*(one(i) for i in range(requests)))
+            return time.perf_counter() - start, latencies, codes
+
+    elapsed, latencies, codes = asyncio.run(drive())
+    return {
+        "rps": requests / elapsed,
+        **summarize(latencies),
+        "errors": sum(code != 200 for code in codes),
+    }
+
+
+def run_suite(args) -> dict:
+    results = {}
+    with fake_llm(args.llm, args.llm_latency_ms, args.token_latency_ms, args.llm_cache):
+        for name in args.personas:
+            runner = Runner(Persona.from_yaml(persona_path(name)))
+            results[name] = {
+                **bench_load(name, args.load_repeat),
+                "latency": bench_latency(runner, args.runs),
+                "stream": bench_stream(runner, min(args.runs, 20)),
+                "throughput": bench_throughput(runner, args.requests, args.concurrency),
+                "allocations": bench_allocations(runner, min(args.runs, 20)),
+                "api": bench_api(name, args.requests, args.concurrency),
+            }
+    return results
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict) -> List[str]:
+    """One line per metric present in both runs, with the relative change."""
+    now, before = flatten(current["results"]), flatten(baseline["results"])
+    lines = [f"Compared with {baseline['meta']['commit']} ({baseline['meta']['timestamp']})"]
+    for key in sorted(now.keys() & before.keys()):
+        old, new = before[key], now[key]
+        change = f"{(new - old) / old * 100:+7.1f}%" if old else "    n/a"
+        lines.append(f"  {key:<58}{old:>12.2f}{new:>12.2f}  {change}")
+    return lines
+
+
+def print_report(results: dict) -> None:
+    print(
+        f"{'persona':<26}{'load ms':>9}{'compile ms':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'ttfc ms':>9}{'thread rps':>12}{'async rps':>11}{'api rps':>9}{'peak KiB':>10}"
+    )
+    for name, r in results.items():
+        api = f"{r['api']['rps']:>9.1f}" if r["api"] else f"{'-':>9}"
+        print(
+            f"{name:<26}{r['load_ms']:>9.2f}{r['compile_ms']:>12.2f}"
+            f"{r['latency']['p50_ms']:>9.2f}{r['latency']['p95_ms']:>9.2f}{r['latency']['p99_ms']:>9.2f}"
+            f"{r['stream']['first_chunk_p50_ms']:>9.2f}"
+            f"{r['throughput']['thread_rps']:>12.1f}{r['throughput']['async_rps']:>11.1f}{api}"
+            f"{r['allocations']['peak_kib']:>10.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--personas", nargs="+", default=PERSONAS)
+    parser.add_argument("--runs", type=int, default=50, help="sequential runs for latency percentiles")
+    parser.add_argument("--requests", type=int, default=64, help="requests per throughput measurement")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--load-repeat", type=int, default=10)
+    parser.add_argument("--llm", choices=("http", "inproc"), default="http")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--token-latency-ms", type=float, default=1.0, help="delay between streamed chunks (http mode)")
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache enabled")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)  # The API resolves personas relative to the repo root
+    for operators_dir in (ROOT / "apps").glob("*/operators"):
+        if str(operators_dir) not in sys.path:
+            sys.path.append(str(operators_dir))
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": run_suite(args),
+    }
+    print_report(report["results"])
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print("\n" + "\n".join(compare(report, baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_scheduling.py
+"""
+Compare serial, DAG and optimized (pruned + fused DAG) plans of the bundled personas.
+
+The LLM call is replaced by a sleep so the numbers do not depend on a live
+backend. `--node-latency-ms` adds the same simulated I/O cost to every agent,
+which is where DAG scheduling pays off: independent agents overlap instead of
+queueing behind each other.
+
+    python -m benchmarks.bench_scheduling --runs 20 --node-latency-ms 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PERSONAS = ["travel_concierge", "economist_advisor", "strategic_stock_analyst"]
+
+for operators_dir in (ROOT / "apps").glob("*/operators"):
+    sys.path.append(str(operators_dir))
+
+from rasa.core.persona import Persona  # noqa: E402
+from rasa.core.runner import Runner  # noqa: E402
+from rasa.frames import stateless_frame  # noqa: E402
+
+
+def fake_llm(latency_s: float):
+    def call_llm(prompt: str, **kwargs) -> str:
+        time.sleep(latency_s)
+        return f"Fake answer to: {prompt}"
+    return call_llm
+
+
+def slow_down(runner: Runner, latency_s: float) -> None:
+    """Wrap every agent's run with a fixed simulated I/O delay."""
+    for name in runner.node_order:
+        agent = runner.frames.get(name) or runner.operators[name]
+        run = agent.run
+
+        def delayed(state, _run=run):
+            time.sleep(latency_s)
+            return _run(state)
+
+        agent.run = delayed
+
+
+MODES = {
+    "serial": {"schedule": "serial", "optimize": False},
+    "dag": {"schedule": "dag", "optimize": False},
+    "optimized": {"schedule": "dag", "optimize": True},
+}
+
+
+def bench(persona_name: str, mode: str, runs: int, node_latency_s: float) -> dict:
+    persona = Persona.from_yaml(str(ROOT / "apps" / persona_name / "persona.yaml"))
+    runner = Runner(persona, **MODES[mode])
+    if node_latency_s:
+        slow_down(runner, node_latency_s)
+
+    timings = []
+    for _ in range(runs):
+        state = {
+            "user_input": "Benchmark request",
+            "preferences": {"region": "europe"},
+            "metadata": {"tone": persona.metadata.get("tone", "default")},
+        }
+        start = time.perf_counter()
+        runner.run(state)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "persona": persona_name,
+        "mode": mode,
+        "nodes": len(runner.plan.nodes),
+        "critical_path": len(runner.critical_path()),
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": statistics.median(timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--node-latency-ms", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    stateless_frame.call_llm = fake_llm(args.llm_latency_ms / 1000)
+
+    print(f"{'persona':<26}{'mode':<11}{'nodes':>6}{'path':>6}{'mean ms':>10}{'p50 ms':>10}")
+    for persona_name in PERSONAS:
+        for mode in MODES:
+            r = bench(persona_name, mode, args.runs, args.node_latency_ms / 1000)
+            print(
+                f"{r['persona']:<26}{r['mode']:<11}{r['nodes']:>6}{r['critical_path']:>6}"
+                f"{r['mean_ms']:>10.1f}{r['p50_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
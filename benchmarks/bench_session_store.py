@@ -0,0 +1,104 @@
+# benchmarks/bench_session_store.py
+"""
+Memory per session and lookup latency of the in-process SessionStore.
+
+Fills the store with `--sessions` users, each holding the two records the
+memory frames write (SessionFrame preferences, ShortTermFrame recent turns),
+then times random lookups and writes. "dict" keeps the same records as live
+Python dicts in an unbounded dict, for comparison with the encoded,
+slotted entries of "store".
+
+    python -m benchmarks.bench_session_store --sessions 100000
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from rasa.memory.in_memory import SessionStore
+
+TURN = "Plan a relaxed two week trip through Japan in May -> " + "Start in Tokyo, then take the train to Kyoto. " * 3
+
+
+def records(user: int) -> Dict[str, dict]:
+    return {
+        f"session:travel/user/{user}": {"preferences": {"budget": 900 + user % 7, "region": "asia"}, "turns": 3},
+        f"short_term:travel/user/{user}": {"turns": [{"input": TURN[:50], "output": TURN[53:]} for _ in range(3)]},
+    }
+
+
+class DictStore:
+    """The baseline: live dicts, no bounds, no eviction."""
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def put(self, key, record):
+        self._entries[key] = record
+
+
+def fill(store, sessions: int) -> float:
+    """Bytes allocated per session while filling `store`."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for user in range(sessions):
+        for key, record in records(user).items():
+            store.put(key, record)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / sessions
+
+
+def latency_us(op: Callable[[str], object], keys: List[str]) -> Dict[str, float]:
+    timings = []
+    for key in keys:
+        start = time.perf_counter_ns()
+        op(key)
+        timings.append((time.perf_counter_ns() - start) / 1000)
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p99": timings[int(len(timings) * 0.99)],
+    }
+
+
+def bench(kind: str, sessions: int, lookups: int) -> dict:
+    store = DictStore() if kind == "dict" else SessionStore(max_entries=2 * sessions, max_bytes=2 ** 40)
+    per_session = fill(store, sessions)
+    rng = random.Random(0)
+    keys = [f"short_term:travel/user/{rng.randrange(sessions)}" for _ in range(lookups)]
+    misses = [f"short_term:travel/user/{sessions + i}" for i in range(lookups)]
+    record = records(0)["short_term:travel/user/0"]
+    return {
+        "kind": kind,
+        "bytes_per_session": per_session,
+        "get": latency_us(store.get, keys),
+        "miss": latency_us(store.get, misses),
+        "put": latency_us(lambda key: store.put(key, record), keys),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    print(f"{args.sessions} sessions, {args.lookups} operations each")
+    print(f"{'kind':<8}{'bytes/session':>15}{'get p50/p99 us':>18}{'miss p50/p99 us':>18}{'put p50/p99 us':>18}")
+    for kind in ("dict", "store"):
+        r = bench(kind, args.sessions, args.lookups)
+        cols = "".join(f"{r[op]['p50']:>9.2f}/{r[op]['p99']:<8.2f}" for op in ("get", "miss", "put"))
+        print(f"{r['kind']:<8}{r['bytes_per_session']:>15.0f}{cols}")
+
+
+if __name__ == "__main__":
+    main()
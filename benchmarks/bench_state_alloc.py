@@ -0,0 +1,110 @@
+# benchmarks/bench_state_alloc.py
+"""
+Measure per-request allocations of delta-based State updates.
+
+"copy" wraps every agent so it returns a full `{**state, ...}` copy with fresh
+`context` and `metadata` dicts, which is how agents behaved before they
+returned partial deltas. "delta" runs the agents as they are. The State is
+padded with a memory recall and an `output_json` payload so the cost of
+copying shows up the way it does in production.
+
+    python -m benchmarks.bench_state_alloc --runs 50 --payload-kb 64
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PERSONAS = ["travel_concierge", "economist_advisor", "strategic_stock_analyst"]
+
+from rasa.core.persona import Persona  # noqa: E402
+from rasa.core.runner import Runner  # noqa: E402
+from rasa.frames import stateless_frame  # noqa: E402
+
+
+def full_copy(runner: Runner) -> None:
+    """Emulate agents that return a full copy of the State."""
+    for name in runner.node_order:
+        agent = runner.frames.get(name) or runner.operators[name]
+        run = agent.run
+
+        def copying(state, _run=run):
+            update = _run(state) or {}
+            return {
+                **state,
+                **update,
+                "context": {**state.get("context", {}), **update.get("context", {})},
+                "metadata": {**state.get("metadata", {}), **update.get("metadata", {})},
+            }
+
+        agent.run = copying
+
+
+def initial_state(persona: Persona, payload_kb: int) -> dict:
+    blob = "x" * 1024
+    return {
+        "user_input": "Benchmark request",
+        "preferences": {"region": "europe", "travel_style": "relaxed"},
+        "context": {f"turn_{i}": blob for i in range(payload_kb * 16)},
+        "memory": {"long_term": [{"text": blob} for _ in range(payload_kb)]},
+        "output_json": [{"item": i, "blob": blob} for i in range(payload_kb)],
+        "metadata": {
+            "tone": persona.metadata.get("tone", "default"),
+            **{f"trace_{i}": i for i in range(payload_kb * 16)},
+        },
+    }
+
+
+def bench(persona_name: str, mode: str, runs: int, payload_kb: int) -> dict:
+    persona = Persona.from_yaml(str(ROOT / "apps" / persona_name / "persona.yaml"))
+    runner = Runner(persona, schedule="serial")
+    if mode == "copy":
+        full_copy(runner)
+
+    runner.run(initial_state(persona, payload_kb))  # warm up
+    peaks, timings = [], []
+    for _ in range(runs):
+        state = initial_state(persona, payload_kb)
+        start = time.perf_counter()
+        runner.run(state)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        state = initial_state(persona, payload_kb)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        runner.run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        peaks.append((peak - baseline) / 1024)
+
+    return {
+        "persona": persona_name,
+        "mode": mode,
+        "peak_kib": statistics.median(peaks),
+        "p50_ms": statistics.median(timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--payload-kb", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    for operators_dir in (ROOT / "apps").glob("*/operators"):
+        sys.path.append(str(operators_dir))
+    stateless_frame.call_llm = lambda prompt, **kwargs: f"Fake answer to: {prompt}"
+
+    print(f"{'persona':<26}{'mode':<8}{'peak KiB/request':>18}{'p50 ms':>10}")
+    for persona_name in PERSONAS:
+        for mode in ("copy", "delta"):
+            r = bench(persona_name, mode, args.runs, args.payload_kb)
+            print(f"{r['persona']:<26}{r['mode']:<8}{r['peak_kib']:>18.1f}{r['p50_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
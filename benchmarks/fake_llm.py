@@ -0,0 +1,193 @@
+# benchmarks/fake_llm.py
+"""
+Deterministic fake LLM backends for benchmarks and tests.
+
+FakeOllamaServer is a local HTTP server speaking enough of Ollama's API
+(`/api/generate`, streaming or not, and `/api/embed`) to drive the real LLMAdapter code path,
+sockets included. `patch_ollama` skips HTTP entirely and replaces the
+adapter's Ollama call in-process.
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+
+def fake_answer(prompt: str) -> str:
+    return f"Fake answer to: {prompt[:80]}"
+
+
+def _tokens(text: str) -> list:
+    return [len(word) for word in text.split()]
+
+
+class FakeOllamaServer:
+    """
+    Threaded fake of Ollama's `/api/generate`.
+
+    `latency_ms` is applied once per request before the first byte;
+    `token_latency_ms` is applied between streamed chunks. Set `fail` to make
+    every request return HTTP 500.
+
+    Like Ollama, a response carries a `context` (one fake token per word of
+    everything seen so far) that can be sent back to continue the
+    conversation; `prefill_tokens` counts the prompt tokens processed and
+    `last_payload` is the most recent /api/generate request body.
+
+        with FakeOllamaServer(latency_ms=50) as server:
+            os.environ["LLM_HOST"] = server.url
+    """
+
+    def __init__(self, latency_ms: float = 0.0, token_latency_ms: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency_ms = latency_ms
+        self.token_latency_ms = token_latency_ms
+        self.fail = False
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prefill_tokens = 0
+        self.last_payload: dict = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            if delta > 0:
+                self.requests += 1
+            self.in_flight += delta
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):  # Keep benchmark output clean
+                pass
+
+            def setup(self):
+                super().setup()
+                # Like Go's net/http (Ollama): no Nagle delay between header and body writes
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server._lock:
+                    server.connections += 1
+
+            def _send_json(self, status: int, body: dict) -> None:
+                raw = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/api/embed":
+                    from rasa.memory.vector_memory import HashEmbedder
+                    texts = payload.get("input", [])
+                    texts = [texts] if isinstance(texts, str) else texts
+                    self._send_json(200, {"model": payload.get("model"), "embeddings": HashEmbedder().embed(texts).tolist()})
+                    return
+                if self.path != "/api/generate":
+                    self._send_json(404, {"error": f"unknown path {self.path}"})
+                    return
+
+                server._track(1)
+                server.last_payload = payload
+                try:
+                    time.sleep(server.latency_ms / 1000)
+                    if server.fail:
+                        self._send_json(500, {"error": "fake failure"})
+                        return
+
+                    prompt = payload.get("prompt", "")
+                    answer = fake_answer(prompt)
+                    prompt_tokens, answer_tokens = _tokens(prompt), _tokens(answer)
+                    with server._lock:
+                        server.prefill_tokens += len(prompt_tokens)
+                    stats = {
+                        "model": payload.get("model", "fake"),
+                        "done": True,
+                        "prompt_eval_count": len(prompt_tokens),
+                        "eval_count": len(answer_tokens),
+                        "context": list(payload.get("context") or []) + prompt_tokens + answer_tokens,
+                    }
+                    if not payload.get("stream", False):
+                        self._send_json(200, {**stats, "response": answer})
+                        return
+
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    words = answer.split(" ")
+                    for i, word in enumerate(words):
+                        chunk = {"model": stats["model"], "response": word + (" " if i < len(words) - 1 else ""), "done": False}
+                        self._write_chunk(json.dumps(chunk).encode() + b"\n")
+                        time.sleep(server.token_latency_ms / 1000)
+                    self._write_chunk(json.dumps({**stats, "response": ""}).encode() + b"\n")
+                    self._write_chunk(b"")
+                finally:
+                    server._track(-1)
+
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+@contextmanager
+def patch_ollama(latency_ms: float = 0.0) -> Iterator[None]:
+    """
+    Replace LLMAdapter's Ollama calls (sync and async) with an in-process
+    sleep + canned answer.
+    """
+    from rasa.llm.llm_adapter import LLMAdapter
+
+    original = LLMAdapter._ollama_generate, LLMAdapter._ollama_agenerate
+
+    def fake_generate(self, prompt: str, **kwargs) -> str:
+        time.sleep(latency_ms / 1000)
+        return fake_answer(prompt)
+
+    async def fake_agenerate(self, prompt: str, **kwargs) -> str:
+        await asyncio.sleep(latency_ms / 1000)
+        return fake_answer(prompt)
+
+    LLMAdapter._ollama_generate = fake_generate
+    LLMAdapter._ollama_agenerate = fake_agenerate
+    try:
+        yield
+    finally:
+        LLMAdapter._ollama_generate, LLMAdapter._ollama_agenerate = original
@@ -95,13 +95,17 @@ def describe(ctx, persona):
     click.echo(f"Operators: {getattr(persona_obj, 'operators', [])}")
     click.echo(f"Domain Operators: {getattr(persona_obj, 'domain_operators', [])}")
     click.echo(f"Metadata: {getattr(persona_obj, 'metadata', {})}")
+    try:
+        click.echo(Runner(persona_obj).plan.describe())
+    except Exception as e:
+        click.secho(f"Execution plan unavailable: {e}", fg="yellow")
 
 # ------------------------
 @cli.command("run", help="Run a persona on user input and preferences.")
 @click.option('--persona', required=True, help="Persona name (folder or path to YAML).")
 @click.option('--input', 'user_input', required=True, help="User input prompt/question.")
 @click.option('--preferences', multiple=True, help="Preferences as key=value (repeatable).")
-@click.option('--stream', is_flag=True, help="Stream output word-by-word.")
+@click.option('--stream', is_flag=True, help="Stream output as it is generated.")
 @click.pass_context
 def run(ctx, persona, user_input, preferences, stream):
     prefs = parse_preferences(preferences)
@@ -116,8 +120,8 @@ def run(ctx, persona, user_input, preferences, stream):
             if stream:
                 resp = requests.post(f"{ctx.obj['api_url']}/stream", json=payload, stream=True)
                 resp.raise_for_status()
-                for chunk in resp.iter_content(chunk_size=32):
-                    click.echo(chunk.decode("utf-8"), nl=False)
+                for chunk in resp.iter_content(chunk_size=None, decode_unicode=True):
+                    click.echo(chunk, nl=False)
                 click.echo()
             else:
                 resp = requests.post(f"{ctx.obj['api_url']}/output", json=payload)
@@ -141,15 +145,13 @@ def run(ctx, persona, user_input, preferences, stream):
             }
         }
         try:
-            result = runner.run(state)
-            output = result.get("output", "")
             if stream:
-                for word in output.split():
-                    click.echo(word, nl=False)
-                    click.echo(" ", nl=False)
+                for chunk in runner.stream(state):
+                    click.echo(chunk, nl=False)
                 click.echo()
             else:
-                click.secho("\n" + output, fg="green")
+                result = runner.run(state)
+                click.secho("\n" + result.get("output", ""), fg="green")
         except Exception as e:
             click.secho(f"Error: {e}", fg="red")
 
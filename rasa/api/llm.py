@@ -1,12 +1,12 @@
 # rasa/api/llm.py
 from fastapi import APIRouter
-from rasa.llm.llm_adapter import LLMAdapter
+from rasa.llm.llm_adapter import get_adapter
 from rasa.config import settings
 router = APIRouter()
 @router.get("/llm/info", tags=["llm"], summary="Get current LLM config (never exposes keys)")
 def get_llm_info():
-    # llm = LLMAdapter.from_config()
-    llm = LLMAdapter(
+    # The shared adapter, so host stats reflect live routing
+    llm = get_adapter(
     provider=settings.get_llm_provider(),
     model=settings.get_llm_model(),
     api_key=settings.get_openai_api_key(),
@@ -23,6 +23,7 @@ def get_llm_info():
         "provider": info.get("provider"),
         "model": info.get("model"),
         "host": info.get("host"),
+        "hosts": info.get("hosts"),
         "mode": info.get("mode"),
         "config": info.get("config"),
         "api_key_present": info.get("api_key_present", False),
@@ -32,7 +33,8 @@ def get_llm_info():
 def llm_health():
     from rasa.llm.llm_client import call_llm
     try:
-        result = call_llm("ping")  # Use a short, harmless prompt
+        # Use a short, harmless prompt; a cached answer would not prove the LLM is up
+        result = call_llm("ping", use_cache=False)
         healthy = bool(result and isinstance(result, str) and len(result.strip()) > 0)
     except Exception as e:
         return {"healthy": False, "error": str(e)}
@@ -2,21 +2,39 @@ from rasa.version import __version__ as rasa_version
 from fastapi import FastAPI, HTTPException, APIRouter, Request, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List, Any
+from typing import Awaitable, Optional, Dict, List, Any, TypeVar
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from rasa.core.runner import Runner
-from rasa.core.persona import Persona
+from rasa.core.runner_cache import get_runner
+from rasa.core.deadline import DeadlineExceeded
+from rasa.llm.limiter import LLMOverloaded
+from rasa.llm.semantic_cache import get_semantic_cache
+from rasa.memory.vector_memory import close_long_term_store
+from rasa.config import settings
 import sys
 sys.path.append("apps/travel_concierge/operators")
 
 from rasa.api import llm
 from rasa.api import status as status_router
+from rasa.api import metrics as metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Check the semantic cache's embedder at boot: a refused one is logged now, not on the first request
+    if settings.get_semantic_cache_enabled():
+        get_semantic_cache()
+    yield
+    # Write long-term memory still buffered in this worker before it exits
+    await asyncio.to_thread(close_long_term_store)
 
 app = FastAPI(
     title="RASA API",
     description="Role-Aligned Software Architecture API – Multi-persona, memory-aware AI",
-    version=rasa_version
+    version=rasa_version,
+    lifespan=lifespan,
 )
 
 class PersonaListResponse(BaseModel):
@@ -28,6 +46,16 @@ class RASARequest(BaseModel):
     preferences: Optional[Dict[str, Any]] = Field(default_factory=dict, description="User preferences (domain-specific)")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata/context")
 
+class RASABatchItem(BaseModel):
+    input: str = Field(..., description="User input prompt")
+    preferences: Optional[Dict[str, Any]] = Field(default_factory=dict, description="User preferences (domain-specific)")
+    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata/context")
+
+class RASABatchRequest(BaseModel):
+    persona: str = Field(..., description="Persona name (e.g. 'travel_concierge')")
+    items: List[RASABatchItem] = Field(..., description="Inputs to run against the persona, in order")
+    max_concurrency: Optional[int] = Field(8, ge=1, description="Maximum number of items in flight at once")
+
 class OutputResponse(BaseModel):
     output: str = Field(..., description="Plain output text from persona")
 
@@ -36,86 +64,131 @@ class OutputJSONResponse(BaseModel):
     output_json: Optional[Any] = Field(None, description="Structured output, if persona supports")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="State metadata after reasoning")
 
+class BatchItemResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    output: Optional[str] = Field(None, description="Plain output text, if the item succeeded")
+    output_json: Optional[Any] = Field(None, description="Structured output, if persona supports")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="State metadata after reasoning")
+    error: Optional[str] = Field(None, description="Error message, if the item failed")
+
+class BatchOutputResponse(BaseModel):
+    results: List[BatchItemResult] = Field(..., description="Per-item results, in input order")
+
 @app.get("/persona", response_model=PersonaListResponse, tags=["Personas"])
 def get_personas():
     """List all available personas based on persona.yaml in apps/."""
     personas = [d for d in os.listdir("apps") if (Path("apps") / d / "persona.yaml").exists()]
     return {"personas": personas}
 
-@app.post("/output", response_model=OutputResponse, tags=["Core"])
-def get_output(req: RASARequest):
-    # Validate persona and input
-    if not req.persona or not req.persona.strip():
+def _validate_input(text: Optional[str]) -> None:
+    if not text or not text.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing or empty 'persona' parameter. Please specify a valid persona name."
+            detail="Missing or empty 'input' parameter. Please provide user input text."
         )
-    if not req.input or not req.input.strip():
+
+def _validate_persona(persona_name: Optional[str]) -> None:
+    if not persona_name or not persona_name.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing or empty 'input' parameter. Please provide user input text."
+            detail="Missing or empty 'persona' parameter. Please specify a valid persona name."
+        )
+
+def _validate_request(persona_name: Optional[str], text: Optional[str]) -> None:
+    """Reject a malformed request (400) before looking the persona up (404)."""
+    _validate_persona(persona_name)
+    _validate_input(text)
+
+def _resolve_runner(persona_name: str) -> Runner:
+    """Validate the persona name and return its (cached) Runner."""
+    _validate_persona(persona_name)
+
+    persona_path = f"apps/{persona_name}/persona.yaml"
+    if not Path(persona_path).exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Persona '{persona_name}' not found. Please check available personas."
         )
+    return get_runner(persona_path)
+
+def _overloaded(e: LLMOverloaded) -> HTTPException:
+    """429 (rate limited) or 503 (queue full) with a Retry-After hint, so clients back off."""
+    return HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def _deadline_exceeded(e: DeadlineExceeded) -> HTTPException:
+    """504, naming the node that ran out of time."""
+    return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
 
+T = TypeVar("T")
+
+class ClientDisconnected(Exception):
+    """The HTTP client went away before its response was ready."""
+
+async def _until_disconnect(request: Request) -> None:
+    # The body has been read, so the next ASGI message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+async def _unless_disconnected(request: Request, work: Awaitable[T]) -> T:
+    """
+    Await `work`, cancelling it (and the LLM calls it is waiting on) if the
+    client disconnects first, so nobody's abandoned request keeps a backend
+    slot generating.
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_until_disconnect(request))
     try:
-        persona_path = f"apps/{req.persona}/persona.yaml"
-        if not Path(persona_path).exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Persona '{req.persona}' not found. Please check available personas."
-            )
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task})
+    if task.cancelled():
+        raise ClientDisconnected()
+    return task.result()
 
-        persona = Persona.from_yaml(persona_path)
-        runner = Runner(persona)
-        state = {
-            "user_input": req.input,
-            "preferences": req.preferences or {},
-            "metadata": {
-                **req.metadata,
-                "tone": persona.metadata.get("tone", "default"),
-                "domain_operators": getattr(persona, "domain_operators", [])
-            }
+def _closed() -> HTTPException:
+    # Nobody is left to read it; this only ends the request cleanly and shows up in logs
+    return HTTPException(status_code=499, detail="Client closed request")
+
+def _initial_state(req: Any, runner: Runner) -> Dict[str, Any]:
+    """Build the initial State from a RASARequest or RASABatchItem."""
+    persona = runner.persona
+    return {
+        "user_input": req.input,
+        "preferences": req.preferences or {},
+        "metadata": {
+            **(req.metadata or {}),
+            "tone": persona.metadata.get("tone", "default"),
+            "domain_operators": getattr(persona, "domain_operators", [])
         }
-        result = runner.run(state)
+    }
+
+@app.post("/output", response_model=OutputResponse, tags=["Core"])
+async def get_output(req: RASARequest, request: Request):
+    try:
+        _validate_request(req.persona, req.input)
+        runner = _resolve_runner(req.persona)
+        result = await _unless_disconnected(request, runner.arun(_initial_state(req, runner)))
         return {"output": result.get("output", "")}
     except HTTPException:
         raise
+    except LLMOverloaded as e:
+        raise _overloaded(e)
+    except DeadlineExceeded as e:
+        raise _deadline_exceeded(e)
+    except ClientDisconnected:
+        raise _closed()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/output/json", response_model=OutputJSONResponse, tags=["Core"])
-def get_output_json(req: RASARequest):
-    # Validate persona and input
-    if not req.persona or not req.persona.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing or empty 'persona' parameter. Please specify a valid persona name."
-        )
-    if not req.input or not req.input.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing or empty 'input' parameter. Please provide user input text."
-        )
-
+async def get_output_json(req: RASARequest, request: Request):
     try:
-        persona_path = f"apps/{req.persona}/persona.yaml"
-        if not Path(persona_path).exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Persona '{req.persona}' not found. Please check available personas."
-            )
-
-        persona = Persona.from_yaml(persona_path)
-        runner = Runner(persona)
-        state = {
-            "user_input": req.input,
-            "preferences": req.preferences or {},
-            "metadata": {
-                **req.metadata,
-                "tone": persona.metadata.get("tone", "default"),
-                "domain_operators": getattr(persona, "domain_operators", [])
-            }
-        }
-        result = runner.run(state)
+        _validate_request(req.persona, req.input)
+        runner = _resolve_runner(req.persona)
+        result = await _unless_disconnected(request, runner.arun(_initial_state(req, runner)))
         return {
             "output": result.get("output", ""),
             "output_json": result.get("output_json", []),
@@ -123,54 +196,86 @@ def get_output_json(req: RASARequest):
         }
     except HTTPException:
         raise
+    except LLMOverloaded as e:
+        raise _overloaded(e)
+    except DeadlineExceeded as e:
+        raise _deadline_exceeded(e)
+    except ClientDisconnected:
+        raise _closed()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/stream", tags=["Core"])
-async def stream_output(req: RASARequest):
-    # Validate persona and input
-    if not req.persona or not req.persona.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing or empty 'persona' parameter. Please specify a valid persona name."
-        )
-    if not req.input or not req.input.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing or empty 'input' parameter. Please provide user input text."
-        )
-
+@app.post("/output/batch", response_model=BatchOutputResponse, tags=["Core"])
+async def get_output_batch(req: RASABatchRequest):
+    """Run many inputs against one persona, sharing its compiled graph."""
     try:
-        persona_path = f"apps/{req.persona}/persona.yaml"
-        if not Path(persona_path).exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Persona '{req.persona}' not found. Please check available personas."
+        runner = _resolve_runner(req.persona)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(req.items))]
+    runnable = []
+    for i, item in enumerate(req.items):
+        if not item.input or not item.input.strip():
+            results[i]["error"] = "Missing or empty 'input' parameter."
+        else:
+            runnable.append(i)
+
+    states = [_initial_state(req.items[i], runner) for i in runnable]
+    outcomes = await runner.arun_batch(states, max_concurrency=req.max_concurrency)
+    for i, outcome in zip(runnable, outcomes):
+        if isinstance(outcome, Exception):
+            results[i]["error"] = str(outcome)
+        else:
+            results[i].update(
+                output=outcome.get("output", ""),
+                output_json=outcome.get("output_json", []),
+                metadata=outcome.get("metadata", {}),
             )
+    return {"results": results}
 
-        persona = Persona.from_yaml(persona_path)
-        runner = Runner(persona)
-        state = {
-            "user_input": req.input,
-            "preferences": req.preferences or {},
-            "metadata": {
-                **req.metadata,
-                "tone": persona.metadata.get("tone", "default"),
-                "domain_operators": getattr(persona, "domain_operators", [])
-            }
-        }
-        result = runner.run(state)
-        output = result.get("output", "")
+@app.post("/stream", tags=["Core"])
+async def stream_output(req: RASARequest, request: Request):
+    try:
+        _validate_request(req.persona, req.input)
+        runner = _resolve_runner(req.persona)
+        # Chunks are sent as the LLM produces them (see Runner.astream). Waiting
+        # for the first one lets errors such as overload still set the status code.
+        chunks = runner.astream(_initial_state(req, runner))
+        try:
+            first = await _unless_disconnected(request, chunks.__anext__())
+        except StopAsyncIteration:
+            first = None
+        except BaseException:
+            await chunks.aclose()
+            raise
+
+        async def body():
+            # StreamingResponse cancels this generator when the client disconnects;
+            # closing `chunks` then cancels the graph and its LLM stream
+            try:
+                if first is not None:
+                    yield first
+                    async for chunk in chunks:
+                        yield chunk
+            finally:
+                await chunks.aclose()
 
-        async def word_stream():
-            for word in output.split():
-                yield word + " "
-        return StreamingResponse(word_stream(), media_type="text/plain")
+        return StreamingResponse(body(), media_type="text/plain")
     except HTTPException:
         raise
+    except LLMOverloaded as e:
+        raise _overloaded(e)
+    except DeadlineExceeded as e:
+        raise _deadline_exceeded(e)
+    except ClientDisconnected:
+        raise _closed()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# Include routers for LLM and status
+# Include routers for LLM, status and metrics
 app.include_router(llm.router)
-app.include_router(status_router.router)
\ No newline at end of file
+app.include_router(status_router.router)
+app.include_router(metrics_router.router)
\ No newline at end of file
@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from rasa.utils.trace import render_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", tags=["system"], summary="Prometheus metrics (node/LLM latency, errors, cache events)")
+def get_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
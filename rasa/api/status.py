@@ -1,8 +1,19 @@
 from fastapi import APIRouter
 from rasa.config import settings
+from rasa.core.runner_cache import get_runner_cache
+from rasa.llm.response_cache import get_response_cache
+from rasa.llm.semantic_cache import get_semantic_cache, semantic_cache_refusal
+from rasa.llm.llm_client import flights
+from rasa.llm.limiter import limiters
 
 router = APIRouter()
 
+def _semantic_cache_status():
+    if not settings.get_semantic_cache_enabled():
+        return None
+    cache = get_semantic_cache()
+    return cache.stats() if cache is not None else {"enabled": False, "error": semantic_cache_refusal()}
+
 @router.get("/status", tags=["system"], summary="Get RASA API server status")
 def get_status():
     return {
@@ -12,6 +23,11 @@ def get_status():
         "llm_mode": settings.get_llm_mode(),
         "db_type": settings.get_default_db_type(),
         "vector_db_type": settings.get_default_vector_db_type(),
+        "runner_cache": get_runner_cache().stats(),
+        "llm_cache": get_response_cache().stats() if settings.get_llm_cache_enabled() else None,
+        "semantic_cache": _semantic_cache_status(),
+        "single_flight": {"coalesced": flights.coalesced, "in_flight": flights.in_flight()},
+        "llm_limits": limiters(),
         # Optionally: add build/version info
         "version": "0.1.2",  # Or import from a version.py
     }
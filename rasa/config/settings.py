@@ -20,6 +20,10 @@ def load_env_from_dir(dirpath=None):
 # Load from default config directory on import
 load_env_from_dir()
 
+# ========== Request Settings ==========
+def get_request_deadline():
+    return float(os.getenv("REQUEST_DEADLINE", 0))
+
 # ========== LLM Settings ==========
 def get_llm_mode():
     return os.getenv("LLM_MODE", "local")
@@ -40,6 +44,87 @@ def get_claude_api_key():
 def get_claude_model():
     return os.getenv("CLAUDE_MODEL", "claude-3-opus")
 
+def get_llm_lb_strategy():
+    return os.getenv("LLM_LB_STRATEGY", "ewma")
+def get_llm_eject_after():
+    return int(os.getenv("LLM_EJECT_AFTER", 3))
+def get_llm_eject_seconds():
+    return float(os.getenv("LLM_EJECT_SECONDS", 10.0))
+
+def get_llm_fallbacks():
+    return os.getenv("LLM_FALLBACKS", "")
+def get_llm_hedge():
+    return os.getenv("LLM_HEDGE", "false").lower() == "true"
+def get_llm_hedge_percentile():
+    return float(os.getenv("LLM_HEDGE_PERCENTILE", 95))
+def get_llm_hedge_delay():
+    return float(os.getenv("LLM_HEDGE_DELAY", 2.0))
+
+def get_llm_keep_alive():
+    return os.getenv("LLM_KEEP_ALIVE", "")
+def get_llm_session_contexts():
+    return int(os.getenv("LLM_SESSION_CONTEXTS", 1024))
+def get_llm_session_ttl():
+    return float(os.getenv("LLM_SESSION_TTL", 1800))
+
+def get_llm_token_budget():
+    return int(os.getenv("LLM_TOKEN_BUDGET", 0))
+
+def get_llm_pool_size():
+    return int(os.getenv("LLM_POOL_SIZE", 16))
+def get_llm_connect_timeout():
+    return float(os.getenv("LLM_CONNECT_TIMEOUT", 5.0))
+def get_llm_read_timeout():
+    return float(os.getenv("LLM_READ_TIMEOUT", 120.0))
+
+def get_llm_cache_enabled():
+    return os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+def get_llm_cache_size():
+    return int(os.getenv("LLM_CACHE_SIZE", 1024))
+def get_llm_cache_ttl():
+    return float(os.getenv("LLM_CACHE_TTL", 3600))
+def get_llm_cache_path():
+    return os.getenv("LLM_CACHE_PATH", "")
+
+def get_llm_single_flight():
+    return os.getenv("LLM_SINGLE_FLIGHT", "true").lower() == "true"
+
+def _per_provider(name, provider, default):
+    # e.g. LLM_MAX_CONCURRENCY_OLLAMA overrides LLM_MAX_CONCURRENCY
+    if provider:
+        value = os.getenv(f"{name}_{provider.upper()}")
+        if value is not None:
+            return value
+    return os.getenv(name, default)
+
+def get_llm_max_concurrency(provider=None):
+    return int(_per_provider("LLM_MAX_CONCURRENCY", provider, 16))
+def get_llm_rate_limit(provider=None):
+    return float(_per_provider("LLM_RATE_LIMIT", provider, 0))
+def get_llm_rate_burst(provider=None):
+    return float(_per_provider("LLM_RATE_BURST", provider, 0))
+def get_llm_queue_size():
+    return int(os.getenv("LLM_QUEUE_SIZE", 64))
+def get_llm_queue_timeout():
+    return float(os.getenv("LLM_QUEUE_TIMEOUT", 30.0))
+def get_llm_target_latency():
+    return float(os.getenv("LLM_TARGET_LATENCY", 0))
+
+def get_semantic_cache_enabled():
+    return os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+def get_semantic_cache_threshold():
+    return float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))
+def get_semantic_cache_size():
+    return int(os.getenv("SEMANTIC_CACHE_SIZE", 2048))
+def get_semantic_cache_scopes():
+    return int(os.getenv("SEMANTIC_CACHE_SCOPES", 1024))
+def get_semantic_cache_ttl():
+    return float(os.getenv("SEMANTIC_CACHE_TTL", 3600))
+def get_embedder():
+    return os.getenv("EMBEDDER", "hash")
+def get_embedding_model():
+    return os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+
 # ========== Database Settings ==========
 def get_default_db_type():
     return os.getenv("DEFAULT_DB_TYPE", "redis")
@@ -51,6 +136,40 @@ def get_default_vector_db_type():
 def get_default_vector_db_url():
     return os.getenv("DEFAULT_VECTOR_DB_URL", "qdrant://localhost:6333")
 
+def get_long_term_path():
+    return os.getenv("LONG_TERM_PATH", "")
+def get_long_term_ivf_threshold():
+    return int(os.getenv("LONG_TERM_IVF_THRESHOLD", 20000))
+def get_long_term_nprobe():
+    return int(os.getenv("LONG_TERM_NPROBE", 8))
+def get_long_term_k():
+    return int(os.getenv("LONG_TERM_K", 3))
+def get_long_term_min_score():
+    return float(os.getenv("LONG_TERM_MIN_SCORE", 0.35))
+def get_long_term_flush_interval():
+    return float(os.getenv("LONG_TERM_FLUSH_INTERVAL", 5.0))
+def get_long_term_max_rows():
+    return int(os.getenv("LONG_TERM_MAX_ROWS", 200000))
+
+def get_memory_backend():
+    return os.getenv("MEMORY_BACKEND", "memory")
+def get_memory_redis_pool_size():
+    return int(os.getenv("MEMORY_REDIS_POOL_SIZE", 16))
+def get_memory_redis_pool_timeout():
+    return float(os.getenv("MEMORY_REDIS_POOL_TIMEOUT", 5.0))
+def get_memory_session_max_entries():
+    return int(os.getenv("MEMORY_SESSION_MAX_ENTRIES", 100000))
+def get_memory_session_max_bytes():
+    return int(os.getenv("MEMORY_SESSION_MAX_BYTES", 268435456))
+def get_memory_session_ttl():
+    return float(os.getenv("MEMORY_SESSION_TTL", 86400))
+def get_memory_short_term_turns():
+    return int(os.getenv("MEMORY_SHORT_TERM_TURNS", 3))
+
+# ========== Runtime Settings ==========
+def get_runner_cache_size():
+    return int(os.getenv("RUNNER_CACHE_SIZE", 32))
+
 # ========== Any Other Global Settings ==========
 def get_api_port():
     return int(os.getenv("API_PORT", 8000))
@@ -2,8 +2,9 @@
 # BaseAgent, FrameAgent, OperatorAgent
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from rasa.core.state import State
+from rasa.core.streaming import ChunkProcessor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,18 +12,62 @@ logger = logging.getLogger(__name__)
 class BaseAgent(ABC):
     """
     Abstract base class for all agents — both frames and operators.
+
+    Agents may declare which State keys they read and write. The Runner uses
+    these declarations to schedule independent agents in parallel. Leaving
+    them as None means "unknown": the agent is treated as touching every key
+    and always runs on its own, in persona order.
+
+    Two further hints feed the graph optimizer (rasa/graph/graph_builder.py):
+    `passthrough` agents never change the State and are pruned from the graph,
+    and adjacent `pure` agents (fast, in-process, no I/O) are fused into one node.
+
+    For streaming (`Runner.stream`), a `streams` agent emits its LLM output as
+    chunks, and later agents that rewrite `output` can provide a
+    `chunk_processor` so the chunks are transformed as they pass through.
     """
 
+    reads: Optional[Tuple[str, ...]] = None
+    writes: Optional[Tuple[str, ...]] = None
+    passthrough: bool = False
+    pure: bool = False
+    streams: bool = False
+
     def __init__(self, name: str):
         self.name = name
 
     @abstractmethod
     def run(self, state: State) -> State:
         """
-        Each agent receives a State object and must return a new updated State.
+        Each agent receives a State object and returns the State keys it changed.
+
+        Returning a partial update (e.g. {"output": text}) is preferred over
+        copying the whole State; dict-valued keys such as `context` and
+        `metadata` are merged by the reducers declared in rasa/core/state.py.
         """
         pass
 
+    async def arun(self, state: State) -> State:
+        """
+        Async counterpart of `run`, used by `Runner.arun`.
+
+        The default simply calls `run` on the event loop, which is right for
+        cheap, CPU-only agents. Agents that block on I/O (LLM calls, databases)
+        should override this with a non-blocking implementation.
+        """
+        return self.run(state)
+
+    def chunk_processor(self, state: State) -> Optional[ChunkProcessor]:
+        """
+        Opt-in chunk-wise processing of streamed output.
+
+        Return a ChunkProcessor that applies this agent's `output` rewrite
+        incrementally, or None (the default) if the agent needs the complete
+        output, in which case a stream falls back to sending the final output
+        once the graph finishes. Agents that never write `output` are skipped.
+        """
+        return None
+
     def log(self, message: str, extra: Dict[str, Any] = {}) -> None:
         """
         Standardized logging format for agents.
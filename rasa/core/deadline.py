@@ -0,0 +1,132 @@
+# rasa/core/deadline.py
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    A request ran past its deadline. `node` names the agent that was running
+    when the budget ran out, or that was about to start with none left.
+    """
+
+    def __init__(self, node: str, budget: float, elapsed: float):
+        super().__init__(f"Deadline of {budget:g}s exceeded in node '{node}' ({elapsed:.2f}s elapsed)")
+        self.node = node
+        self.budget = budget
+        self.elapsed = elapsed
+
+
+class Deadline:
+    """
+    A request's time budget: `budget` seconds from `started_at` (epoch
+    seconds). The Runner stores both in `State["metadata"]` so the deadline
+    travels with the State to every node, including batch items and
+    LangGraph worker threads.
+    """
+
+    __slots__ = ("budget", "started_at")
+
+    def __init__(self, budget: float, started_at: Optional[float] = None):
+        self.budget = float(budget)
+        self.started_at = time.time() if started_at is None else started_at
+
+    @classmethod
+    def of(cls, state: Mapping[str, Any]) -> Optional["Deadline"]:
+        """The deadline recorded in a State's metadata, if any."""
+        metadata = state.get("metadata") or {}
+        if not metadata.get("deadline") or "deadline_started_at" not in metadata:
+            return None
+        return cls(metadata["deadline"], metadata["deadline_started_at"])
+
+    def remaining(self) -> float:
+        return self.started_at + self.budget - time.time()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def exceeded(self, node: str) -> DeadlineExceeded:
+        return DeadlineExceeded(node, self.budget, time.time() - self.started_at)
+
+    def check(self, node: str) -> None:
+        if self.expired:
+            raise self.exceeded(node)
+
+
+# (deadline, node) of the agent running in this context
+_current: ContextVar[Optional[Tuple[Deadline, str]]] = ContextVar("rasa_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the node running in this context, for I/O that should not outlive it."""
+    entry = _current.get()
+    return entry[0] if entry is not None else None
+
+
+def remaining_or(default: float) -> float:
+    """`default` seconds, cut down to what is left of the current deadline (never below 1ms)."""
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    return max(0.001, min(default, deadline.remaining()))
+
+
+def check_deadline() -> None:
+    """Raise DeadlineExceeded if the running node is past its deadline (e.g. between streamed chunks)."""
+    entry = _current.get()
+    if entry is not None:
+        entry[0].check(entry[1])
+
+
+@contextmanager
+def node_deadline(state: Mapping[str, Any], node: str) -> Iterator[Optional[Deadline]]:
+    """
+    Run one agent under the State's deadline: refuse to start once it has
+    passed, expose it to LLM calls through `current_deadline()`, and turn a
+    failure or late finish past the deadline into DeadlineExceeded naming
+    `node`.
+    """
+    deadline = Deadline.of(state)
+    if deadline is None:
+        yield None
+        return
+    deadline.check(node)
+    token = _current.set((deadline, node))
+    try:
+        yield deadline
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        # e.g. an LLM read timeout cut short to the remaining budget
+        if deadline.expired:
+            raise deadline.exceeded(node) from e
+        raise
+    finally:
+        _current.reset(token)
+    deadline.check(node)
+
+
+async def within(deadline: Optional[Deadline], node: str, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable`, cancelling it if `deadline` passes first."""
+    if deadline is None:
+        return await awaitable
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=max(0.0, deadline.remaining()))
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+        raise deadline.exceeded(node)
+    return task.result()
@@ -18,7 +18,8 @@ class Persona:
         prompt_style: str,
         memory_scope: str,
         metadata: Optional[Dict] = None,
-        domain_operators: Optional[List[str]] = None
+        domain_operators: Optional[List[str]] = None,
+        base_dir: Optional[str] = None
     ):
         self.name = name
         self.description = description
@@ -28,6 +29,7 @@ class Persona:
         self.memory_scope = memory_scope
         self.metadata = metadata or {}
         self.domain_operators = domain_operators or []
+        self.base_dir = base_dir  # Folder holding persona.yaml, when loaded from disk
 
     @property
     def frames(self):
@@ -46,7 +48,9 @@ class Persona:
         with path.open("r") as f:
             data = yaml.safe_load(f)
 
-        return cls.build(data)
+        persona = cls.build(data)
+        persona.base_dir = str(path.resolve().parent)
+        return persona
 
     @classmethod
     def build(cls, config: dict) -> "Persona":
@@ -1,24 +1,75 @@
 # rasa/core/runner.py
 
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Union
 from rasa.core.state import State
 from rasa.core.persona import Persona
-from rasa.core.agent import FrameAgent, OperatorAgent
+from rasa.core.agent import BaseAgent, FrameAgent, OperatorAgent
 import importlib
+import logging
+import sys
+import time
+from pathlib import Path
 
-from langgraph.graph import StateGraph
+from rasa.config import settings
+from rasa.core.streaming import OutputStream
+from rasa.graph.graph_builder import GraphBuilder, GraphPlan
+from rasa.memory.in_memory import get_memory_backend
+from rasa.prompts.assembler import PromptAssembler
+from rasa.utils.trace import persona_scope
 
+logger = logging.getLogger(__name__)
 
 class Runner:
     """
     Executes a RASA persona-defined flow using LangGraph.
+
+    The graph itself is compiled by GraphBuilder. With the default "dag"
+    schedule, agents that declare their State reads and writes are wired into
+    a dependency graph so independent agents run in the same LangGraph
+    superstep; "serial" chains every agent in persona order. Pass-through
+    agents are pruned and pure agents fused unless `optimize=False`.
+
+    A request may carry a deadline in seconds, `metadata.deadline`, falling
+    back to the persona's `metadata.deadline` and then REQUEST_DEADLINE.
+    The clock starts when the Runner receives the State; a node running when
+    it passes raises DeadlineExceeded (see rasa/core/deadline.py).
+
+    Memory is keyed by the persona's `memory_scope` and the request's owner
+    id for it (`metadata.user_id` for a "user" scope) in
+    `metadata.memory_key`. Before the run, the records of every agent with a
+    `record_key` are fetched from the memory backend in one round trip into
+    `metadata.memory_records`; after it, every agent's `remember(state)`
+    hook sees the finished turn and the records they return are written
+    back in one round trip. Async runs await an agent's `aremember(state)`
+    instead when it has one.
     """
 
-    def __init__(self, persona: Persona):
+    def __init__(self, persona: Persona, schedule: Optional[str] = None, optimize: bool = True):
         self.persona = persona
+        self.schedule = schedule or persona.metadata.get("schedule", "dag")
         self.frames = self._load_agents(persona.state_stack, FrameAgent)
         self.operators = self._load_agents(persona.operators, OperatorAgent)
-        self.graph = self._build_graph()
+        self.domain_operators = self._load_domain_operators(persona.domain_operators)
+        for agent in self.operators.values():
+            if hasattr(agent, "bind_domain_operators"):
+                agent.bind_domain_operators(self.domain_operators)
+        # Prompt templates are compiled once per persona and shared by its LLM frames
+        self.prompts = PromptAssembler(persona)
+        for agent in self.frames.values():
+            if hasattr(agent, "bind_prompt_assembler"):
+                agent.bind_prompt_assembler(self.prompts)
+        self.rememberers = [self._agent(name) for name in self.node_order if hasattr(self._agent(name), "remember")]
+        # Agents with a `record_key` keep their records in the session memory backend
+        self.recallers = [agent for agent in self.rememberers if hasattr(agent, "record_key")]
+        self.memory = get_memory_backend() if self.recallers else None
+        builder = GraphBuilder(
+            persona.name,
+            [(name, self._agent(name)) for name in self.node_order],
+            schedule=self.schedule,
+            optimize=optimize,
+        )
+        self.plan: GraphPlan = builder.plan
+        self.graph = builder.compile()
 
     def _load_agents(self, agent_names: list, base_cls: type) -> Dict[str, Any]:
         agents = {}
@@ -38,37 +89,262 @@ class Runner:
 
         return agents
 
-    def _build_graph(self):
-        sg = StateGraph(State)
+    def _load_domain_operators(self, names: list) -> Dict[str, OperatorAgent]:
+        """
+        Resolve the persona's domain operators once, at build time.
 
-        # Add frames in sequence
-        last_node = None
-        for frame_name in self.persona.state_stack:
-            agent = self.frames[frame_name]
-            sg.add_node(frame_name, agent.run)
-            if last_node:
-                sg.add_edge(last_node, frame_name)
-            last_node = frame_name
+        Domain operators live in `apps/<persona>/operators/` (or anywhere on
+        sys.path). Any import or type error is raised here so a broken persona
+        fails when it is loaded instead of on every request.
+        """
+        if not names:
+            return {}
 
-        # Add operators in sequence
-        for operator_name in self.persona.operators:
-            agent = self.operators[operator_name]
-            sg.add_node(operator_name, agent.run)
-            sg.add_edge(last_node, operator_name)
-            last_node = operator_name
+        if self.persona.base_dir:
+            operators_dir = str(Path(self.persona.base_dir) / "operators")
+            if Path(operators_dir).is_dir() and operators_dir not in sys.path:
+                sys.path.append(operators_dir)
 
-        sg.set_entry_point(self.persona.state_stack[0])
-        sg.set_finish_point(last_node)
+        table = {}
+        for name in names:
+            class_name = "".join(word.capitalize() for word in name.split("_"))
+            try:
+                module = importlib.import_module(name)
+                cls = getattr(module, class_name)
+            except (ImportError, AttributeError) as e:
+                raise ImportError(
+                    f"Cannot resolve domain operator '{name}' for persona '{self.persona.name}': {e}"
+                ) from e
+            if not isinstance(cls, type) or not issubclass(cls, OperatorAgent):
+                raise TypeError(f"{class_name} is not a subclass of OperatorAgent")
+            table[name] = cls(name=name)
+        return table
 
-        return sg.compile()
+    @property
+    def node_order(self) -> List[str]:
+        """Frames then operators, in persona order."""
+        return list(self.persona.state_stack) + list(self.persona.operators)
 
-    def run(self, state: State) -> State:
+    def _agent(self, name: str) -> BaseAgent:
+        return self.frames[name] if name in self.frames else self.operators[name]
+
+    @property
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Graph node -> the nodes it waits for, after optimization."""
+        return self.plan.dependencies
+
+    def critical_path(self) -> List[str]:
+        return self.plan.critical_path()
+
+    def _cache_scope(self, metadata: Dict[str, Any]) -> Optional[str]:
         """
-        Executes the full cognitive flow and returns the final state.
+        Scope of semantic cache hits: the persona and its memory scope. For a
+        "user" or "session" scope, the request's `user_id` / `session_id` is
+        included so answers are never shared across users or sessions, and
+        requests without one get no scope (no semantic cache).
         """
+        memory_scope = self.persona.memory_scope or "global"
+        owner = metadata.get(f"{memory_scope}_id", "")
+        if not owner and memory_scope != "global":
+            return None
+        return f"{self.persona.name}/{memory_scope}/{owner}"
+
+    def _prepare(self, state: State) -> State:
         # Inject persona domain_operators into metadata
         metadata = state.get("metadata", {})
         metadata["domain_operators"] = getattr(self.persona, "domain_operators", [])
+        # Personas opt out of the LLM response cache with `metadata.llm_cache: false`
+        metadata["llm_cache"] = bool(self.persona.metadata.get("llm_cache", True)) and metadata.get("llm_cache", True)
+        metadata["cache_scope"] = self._cache_scope(metadata)
+        memory_scope = self.persona.memory_scope or "global"
+        if metadata.get(f"{memory_scope}_id"):
+            metadata["memory_key"] = metadata["cache_scope"]
+        deadline = metadata.get("deadline") or self.persona.metadata.get("deadline") or settings.get_request_deadline()
+        if deadline:
+            metadata["deadline"] = float(deadline)
+            metadata["deadline_started_at"] = time.time()
         state["metadata"] = metadata
+        return state
+
+    def _record_keys(self, state: State) -> List[str]:
+        memory_key = state["metadata"].get("memory_key")
+        return [agent.record_key(memory_key) for agent in self.recallers] if memory_key else []
+
+    def _with_records(self, states: List[State], records: Dict[str, Any]) -> List[State]:
+        for state in states:
+            state["metadata"]["memory_records"] = {k: records[k] for k in self._record_keys(state) if k in records}
+        return states
+
+    # A memory backend failing must not fail the request: it runs without memory
+    def _recall(self, states: List[State]) -> List[State]:
+        keys = [key for state in states for key in self._record_keys(state)]
+        records = {}
+        if keys:
+            try:
+                records = self.memory.get_many(keys)
+            except Exception as e:
+                logger.warning(f"[{self.persona.name}] Could not recall memory: {e}")
+        return self._with_records(states, records)
+
+    async def _arecall(self, states: List[State]) -> List[State]:
+        keys = [key for state in states for key in self._record_keys(state)]
+        records = {}
+        if keys:
+            try:
+                records = await self.memory.aget_many(keys)
+            except Exception as e:
+                logger.warning(f"[{self.persona.name}] Could not recall memory: {e}")
+        return self._with_records(states, records)
+
+    def _turns(self, results: List[Union[State, Exception]], records: Dict[str, Any]) -> Iterator[State]:
+        # Turns are applied in batch order, each on top of the records the earlier
+        # ones wrote, so several turns of one user in a batch are all kept
+        for state in results:
+            if not isinstance(state, Exception) and state.get("metadata", {}).get("memory_key"):
+                written = {k: records[k] for k in self._record_keys(state) if k in records}
+                if written:
+                    metadata = state["metadata"]
+                    state = {**state, "metadata": {**metadata, "memory_records": {**metadata.get("memory_records", {}), **written}}}
+                yield state
+
+    def _turn_records(self, results: List[Union[State, Exception]]) -> Dict[str, Any]:
+        records: Dict[str, Any] = {}
+        for state in self._turns(results, records):
+            for agent in self.rememberers:
+                try:
+                    records.update(agent.remember(state))
+                except Exception as e:
+                    logger.warning(f"[{agent.name}] Could not remember the turn: {e}")
+        return records
+
+    async def _aturn_records(self, results: List[Union[State, Exception]]) -> Dict[str, Any]:
+        # Agents whose `remember` blocks provide an `aremember` coroutine
+        records: Dict[str, Any] = {}
+        for state in self._turns(results, records):
+            for agent in self.rememberers:
+                try:
+                    aremember = getattr(agent, "aremember", None)
+                    records.update(await aremember(state) if aremember is not None else agent.remember(state))
+                except Exception as e:
+                    logger.warning(f"[{agent.name}] Could not remember the turn: {e}")
+        return records
+
+    def _remember(self, results: List[Union[State, Exception]]) -> List[Union[State, Exception]]:
+        records = self._turn_records(results)
+        if records and self.memory is not None:
+            try:
+                self.memory.put_many(records)
+            except Exception as e:
+                logger.warning(f"[{self.persona.name}] Could not remember the turn: {e}")
+        return results
+
+    async def _aremember(self, results: List[Union[State, Exception]]) -> List[Union[State, Exception]]:
+        records = await self._aturn_records(results)
+        if records and self.memory is not None:
+            try:
+                await self.memory.aput_many(records)
+            except Exception as e:
+                logger.warning(f"[{self.persona.name}] Could not remember the turn: {e}")
+        return results
+
+    def run(self, state: State) -> State:
+        """
+        Executes the full cognitive flow and returns the final state.
+        """
+        with persona_scope(self.persona.name):
+            state = self._recall([self._prepare(state)])[0]
+            return self._remember([self.graph.invoke(state)])[0]
+
+    async def arun(self, state: State) -> State:
+        """
+        Async variant of `run`. Agents execute through their `arun` methods,
+        so I/O-bound nodes yield the event loop instead of blocking it.
+        """
+        with persona_scope(self.persona.name):
+            state = (await self._arecall([self._prepare(state)]))[0]
+            return (await self._aremember([await self.graph.ainvoke(state)]))[0]
+
+    def _output_stream(self) -> OutputStream:
+        # The first streaming agent generates; everything after it may rewrite its output
+        order = self.node_order
+        for i, name in enumerate(order):
+            if self._agent(name).streams:
+                return OutputStream(name, [self._agent(n) for n in order[i + 1:]])
+        return OutputStream(None, [])
+
+    def _prepare_stream(self, state: State) -> State:
+        state = self._prepare(state)
+        state["metadata"] = {**state["metadata"], "stream": True}
+        return state
+
+    def stream(self, state: State) -> Iterator[str]:
+        """
+        Executes the flow and yields the output text as it is generated.
+
+        LLM chunks are forwarded while the model is still producing them, run
+        through the `chunk_processor` of every later agent that rewrites
+        `output`. If any of those agents can only handle the complete text,
+        the final output is yielded in one piece when the graph finishes.
+        """
+        output = self._output_stream()
+        # No scope may span a yield: the consumer resumes the generator from other
+        # contexts (a new one per chunk under StreamingResponse). Graph nodes label
+        # their own metrics.
+        with persona_scope(self.persona.name):
+            state = self._recall([self._prepare_stream(state)])[0]
+        for mode, event in self.graph.stream(state, stream_mode=["custom", "values"]):
+            yield from output.handle(mode, event)
+        yield from output.finish()
+        with persona_scope(self.persona.name):
+            self._remember([output.state])
+
+    async def astream(self, state: State) -> AsyncIterator[str]:
+        """
+        Async variant of `stream`, built on `graph.astream`.
+        """
+        output = self._output_stream()
+        # As in `stream`, no persona scope spans a yield
+        with persona_scope(self.persona.name):
+            state = (await self._arecall([self._prepare_stream(state)]))[0]
+        async for mode, event in self.graph.astream(state, stream_mode=["custom", "values"]):
+            for text in output.handle(mode, event):
+                yield text
+        for text in output.finish():
+            yield text
+        with persona_scope(self.persona.name):
+            await self._aremember([output.state])
+
+    def _batch_config(self, max_concurrency: Optional[int]) -> Dict[str, Any]:
+        return {"max_concurrency": max_concurrency} if max_concurrency else {}
 
-        return self.graph.invoke(state)
\ No newline at end of file
+    def run_batch(self, states: List[State], max_concurrency: Optional[int] = None) -> List[Union[State, Exception]]:
+        """
+        Executes the flow for many input states on the same compiled graph.
+
+        Results are returned in input order. A failing item does not abort the
+        batch: its slot holds the raised exception instead of a final state.
+        `max_concurrency` bounds how many items are in flight at once.
+        """
+        if not states:
+            return []
+        with persona_scope(self.persona.name):
+            results = self.graph.batch(
+                self._recall([self._prepare(state) for state in states]),
+                config=self._batch_config(max_concurrency),
+                return_exceptions=True,
+            )
+            return self._remember(results)
+
+    async def arun_batch(self, states: List[State], max_concurrency: Optional[int] = None) -> List[Union[State, Exception]]:
+        """
+        Async variant of `run_batch`, built on `graph.abatch`.
+        """
+        if not states:
+            return []
+        with persona_scope(self.persona.name):
+            results = await self.graph.abatch(
+                await self._arecall([self._prepare(state) for state in states]),
+                config=self._batch_config(max_concurrency),
+                return_exceptions=True,
+            )
+            return await self._aremember(results)
@@ -0,0 +1,146 @@
+# rasa/core/runner_cache.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.utils.trace import record_cache_event
+
+
+class _CacheEntry:
+    __slots__ = ("runner", "mtime_ns", "size", "digest")
+
+    def __init__(self, runner: Runner, mtime_ns: int, size: int, digest: str):
+        self.runner = runner
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+
+
+class RunnerCache:
+    """
+    Process-wide cache of compiled Runners, keyed on the persona YAML path.
+
+    Each entry remembers the file's mtime, size and content hash. A lookup only
+    stats the file; when the mtime or size changed, the content is re-hashed and
+    the Runner is rebuilt only if the YAML actually differs. The cache is bounded
+    and evicts the least recently used persona once `max_size` is exceeded.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(persona_path: str) -> str:
+        return str(Path(persona_path).resolve())
+
+    @staticmethod
+    def _digest(raw: bytes) -> str:
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, persona_path: str) -> Runner:
+        """
+        Return a compiled Runner for the given persona YAML, building it on a miss.
+        """
+        key = self._key(persona_path)
+        st = os.stat(key)  # Raises FileNotFoundError for unknown personas
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache_event("runner", "hit")
+                return entry.runner
+
+        raw = Path(key).read_bytes()
+        digest = self._digest(raw)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.digest == digest:
+                # File was touched but not changed: refresh the stat fingerprint only
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache_event("runner", "hit")
+                return entry.runner
+            if entry is not None:
+                self.invalidations += 1
+                record_cache_event("runner", "invalidation")
+            self.misses += 1
+            record_cache_event("runner", "miss")
+
+        # Build outside the lock so a slow compile does not block other personas
+        runner = Runner(Persona.from_yaml(key))
+
+        with self._lock:
+            self._entries[key] = _CacheEntry(runner, st.st_mtime_ns, st.st_size, digest)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+                record_cache_event("runner", "eviction")
+        return runner
+
+    def invalidate(self, persona_path: Optional[str] = None) -> None:
+        """
+        Drop one persona (or all of them when no path is given) from the cache.
+        """
+        with self._lock:
+            if persona_path is None:
+                self.invalidations += len(self._entries)
+                record_cache_event("runner", "invalidation", len(self._entries))
+                self._entries.clear()
+            elif self._entries.pop(self._key(persona_path), None) is not None:
+                self.invalidations += 1
+                record_cache_event("runner", "invalidation")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[RunnerCache] = None
+_default_lock = threading.Lock()
+
+
+def get_runner_cache() -> RunnerCache:
+    """
+    Return the process-wide RunnerCache, sized from settings on first use.
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                from rasa.config import settings
+                _default_cache = RunnerCache(max_size=settings.get_runner_cache_size())
+    return _default_cache
+
+
+def get_runner(persona_path: str) -> Runner:
+    """
+    Shortcut for `get_runner_cache().get(persona_path)`.
+    """
+    return get_runner_cache().get(persona_path)
@@ -1,6 +1,25 @@
 # rasa/core/state.py
 
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import Annotated, TypedDict, Optional, List, Dict, Any, Mapping
+
+
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    LangGraph channel reducer for dict-valued State keys.
+
+    Agents return only the entries they add or change (e.g. {"context": {"intent": ...}})
+    and the reducer folds them into the current value with a single shallow merge.
+    """
+    if not right:
+        return left if left is not None else {}
+    if not left:
+        return right
+    return {**left, **right}
+
+
+# State keys whose updates are merged by `merge_dicts` rather than replaced
+MERGED_KEYS = ("context", "memory", "metadata")
+
 
 class State(TypedDict, total=False):
     # The original user input string (e.g., "suggest a weekend getaway" or "optimize my EC2 instances")
@@ -10,10 +29,10 @@ class State(TypedDict, total=False):
     preferences: Dict[str, Any]
 
     # Session-specific context such as interaction history, timestamps, etc.
-    context: Dict[str, Any]
+    context: Annotated[Dict[str, Any], merge_dicts]
 
     # Memory recall output — short-term (Redis) and/or long-term (VectorDB) memory content
-    memory: Dict[str, Any]
+    memory: Annotated[Dict[str, Any], merge_dicts]
 
     # Final output generated by the LLM or agent pipeline (e.g., plain text advice, summary, narrative)
     output: Optional[str]
@@ -25,4 +44,21 @@ class State(TypedDict, total=False):
     prompt: Optional[str]
 
     # Additional metadata such as tone, domain, persona info, or trace/debug information
-    metadata: Dict[str, Any]
+    metadata: Annotated[Dict[str, Any], merge_dicts]
+
+
+def apply_delta(state: Mapping[str, Any], delta: Optional[Mapping[str, Any]]) -> State:
+    """
+    Apply an agent's partial update to a state outside of LangGraph, using the
+    same semantics as the graph's channel reducers. Used when one agent runs
+    others directly (e.g. HeuristicAgent delegating to domain operators).
+    """
+    if not delta:
+        return state
+    merged = {**state}
+    for key, value in delta.items():
+        if key in MERGED_KEYS:
+            merged[key] = merge_dicts(state.get(key), value)
+        else:
+            merged[key] = value
+    return merged
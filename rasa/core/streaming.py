@@ -0,0 +1,147 @@
+# rasa/core/streaming.py
+# Chunk processors and the output stream assembled by Runner.stream
+
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from rasa.core.state import State
+
+_SENTENCE_ENDS = (".", "!", "?", "\n")
+
+
+class ChunkProcessor:
+    """
+    Incremental version of an agent's output transformation.
+
+    `feed` receives the next chunk of upstream output and returns the text
+    that can already be emitted; `flush` is called once at the end and
+    returns whatever was held back. The base class passes chunks through.
+    """
+
+    def feed(self, chunk: str) -> str:
+        return chunk
+
+    def flush(self) -> str:
+        return ""
+
+
+class SentenceProcessor(ChunkProcessor):
+    """
+    Buffers output up to the last sentence boundary and applies `transform`
+    to complete sentences only, so rewrites that stay within a sentence give
+    the same result as on the full text. `tail` is appended on flush.
+
+    With `strip=True` the output is stripped at both ends, like `str.strip()`
+    on the full text.
+    """
+
+    def __init__(self, transform: Callable[[str], str], tail: str = "", strip: bool = False):
+        self.transform = transform
+        self.tail = tail
+        self.strip = strip
+        self._buffer = ""
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        cut = max(self._buffer.rfind(end) for end in _SENTENCE_ENDS) + 1
+        if cut <= 0:
+            return ""
+        ready, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._emit(self.transform(ready))
+
+    def flush(self) -> str:
+        rest = self.transform(self._buffer)
+        self._buffer = ""
+        if self.strip:
+            rest = rest.rstrip()
+        return self._emit(rest) + self.tail
+
+    def _emit(self, text: str) -> str:
+        if self.strip and not self._started:
+            text = text.lstrip()
+        self._started = self._started or bool(text)
+        return text
+
+
+class ChunkPipeline(ChunkProcessor):
+    """Chains processors: each one's output is fed to the next."""
+
+    def __init__(self, processors: Sequence[ChunkProcessor]):
+        self.processors = list(processors)
+
+    def feed(self, chunk: str) -> str:
+        for processor in self.processors:
+            if not chunk:
+                break
+            chunk = processor.feed(chunk)
+        return chunk
+
+    def flush(self) -> str:
+        text = ""
+        for processor in self.processors:
+            text = (processor.feed(text) if text else "") + processor.flush()
+        return text
+
+
+def may_write_output(agent) -> bool:
+    return agent.writes is None or "output" in agent.writes
+
+
+class OutputStream:
+    """
+    Turns the (mode, event) pairs of `graph.stream(stream_mode=["custom", "values"])`
+    into output text chunks.
+
+    Chunks emitted by `source` are forwarded live, passed through the chunk
+    processors of every later agent that may write `output`. If one of them
+    has no processor for this state, or nothing was streamed (e.g. the source
+    short-circuited), the final `output` is sent in one piece instead.
+    """
+
+    def __init__(self, source: Optional[str], downstream: List):
+        self.source = source
+        self.downstream = downstream
+        self.state: State = {}
+        self.live: Optional[bool] = None  # Undecided until the first chunk
+        self.pipeline: Optional[ChunkPipeline] = None
+        self.flushed = False
+
+    def _open(self) -> None:
+        processors = []
+        for agent in self.downstream:
+            if not may_write_output(agent):
+                continue
+            processor = agent.chunk_processor(self.state)
+            if processor is None:
+                self.live = False
+                return
+            processors.append(processor)
+        self.pipeline = ChunkPipeline(processors)
+        self.live = True
+
+    def handle(self, mode: str, event) -> Iterator[str]:
+        if mode == "values":
+            # A new superstep finished: the source node is done generating
+            if self.live and not self.flushed:
+                self.flushed = True
+                tail = self.pipeline.flush()
+                if tail:
+                    yield tail
+            self.state = event
+        elif mode == "custom" and isinstance(event, dict) and event.get("node") == self.source:
+            if self.live is None:
+                self._open()
+            if self.live and not self.flushed:
+                text = self.pipeline.feed(event.get("chunk", ""))
+                if text:
+                    yield text
+
+    def finish(self) -> Iterator[str]:
+        if self.live:
+            if not self.flushed:
+                self.flushed = True
+                tail = self.pipeline.flush()
+                if tail:
+                    yield tail
+        elif self.state.get("output"):
+            yield self.state["output"]
@@ -1,11 +1,66 @@
 # Long-Term Frame
+# rasa/frames/long_term_frame.py
+
+import asyncio
+from typing import Any, Dict
+
+from rasa.config import settings
 from rasa.core.state import State
 from rasa.core.agent import FrameAgent
+from rasa.frames.short_term_frame import _clip
+from rasa.memory.vector_memory import get_embedder, get_long_term_store
+
 
 class LongTermFrame(FrameAgent):
     """
-    Placeholder for long-term memory logic.
+    Recalls past turns related to the current input.
+
+    Every finished turn of a `metadata.memory_key` owner (see SessionFrame)
+    is embedded and added to the built-in LocalVectorStore; on later
+    requests the turns most similar to the input, at least
+    LONG_TERM_MIN_SCORE, are recalled into `memory["related_1"]`, ... as
+    "input -> output". Only active with DEFAULT_VECTOR_DB_TYPE=local;
+    otherwise the frame is a passthrough and pruned from the graph.
+
+    Embedding and the store block (a model embedder calls out, a flush
+    writes files), so the async variants run them on a worker thread.
     """
+
+    reads = ("user_input", "metadata")
+    writes = ("memory",)
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.store = get_long_term_store()
+        self.passthrough = self.store is None
+        self.embedder = get_embedder() if self.store is not None else None
+        self.k = settings.get_long_term_k()
+        self.min_score = settings.get_long_term_min_score()
+
     def run(self, state: State) -> State:
-        self.log("Simulating long-term memory (no-op)")
-        return state
+        memory_key = state.get("metadata", {}).get("memory_key")
+        user_input = (state.get("user_input") or "").strip()
+        if self.store is None or not memory_key or not user_input:
+            return {}
+        vector = self.embedder.embed([user_input])[0]
+        hits = [p for score, p in self.store.search(vector, k=self.k, owner=memory_key) if score >= self.min_score]
+        if not hits:
+            self.log("No related past turns")
+            return {}
+        self.log(f"Recalled {len(hits)} related past turns")
+        return {"memory": {f"related_{i}": f"{p['input']} -> {p['output']}" for i, p in enumerate(hits, 1)}}
+
+    async def arun(self, state: State) -> State:
+        return await asyncio.to_thread(self.run, state)
+
+    def remember(self, state: State) -> Dict[str, Any]:
+        memory_key = state.get("metadata", {}).get("memory_key")
+        user_input = (state.get("user_input") or "").strip()
+        if self.store is not None and memory_key and user_input and state.get("output"):
+            vector = self.embedder.embed([user_input])[0]
+            self.store.add(vector, {"input": _clip(user_input), "output": _clip(state["output"])}, owner=memory_key)
+        # Nothing for the session memory backend: the vector store keeps its own rows
+        return {}
+
+    async def aremember(self, state: State) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.remember, state)
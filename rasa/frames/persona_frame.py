@@ -6,6 +6,11 @@ class PersonaFrame(FrameAgent):
     """
     Placeholder for persona-level tone or identity logic.
     """
+
+    reads = ()
+    writes = ()
+    passthrough = True
+
     def run(self, state: State) -> State:
         self.log("Simulating persona tone (no-op)")
-        return state
+        return {}
@@ -1,14 +1,53 @@
 # Session Frame
 # rasa/frames/session_frame.py
 
+from typing import Any, Dict
+
 from rasa.core.state import State
 from rasa.core.agent import FrameAgent
 
+
 class SessionFrame(FrameAgent):
     """
-    Placeholder frame to simulate session context.
+    Carries preferences across the turns of a session.
+
+    The Runner keys memory by the persona's `memory_scope` owner (e.g.
+    `metadata.user_id`) in `metadata.memory_key`, and fetches this frame's
+    record before the run into `metadata.memory_records`; requests without
+    an owner have no session memory. Preferences given on earlier turns, and
+    not restated now, are recalled into `memory["session_preferences"]`.
+    After the run, `remember` returns the session record with this turn's
+    preferences merged in, for the Runner to write back.
     """
 
+    reads = ("preferences", "metadata")
+    writes = ("memory",)
+
+    def record_key(self, memory_key: str) -> str:
+        return f"session:{memory_key}"
+
+    def _record(self, state: State) -> Dict[str, Any]:
+        metadata = state.get("metadata", {})
+        memory_key = metadata.get("memory_key")
+        return metadata.get("memory_records", {}).get(self.record_key(memory_key), {}) if memory_key else {}
+
     def run(self, state: State) -> State:
-        self.log("Simulating session memory (no-op)")
-        return state
+        record = self._record(state)
+        if not record:
+            self.log("No session memory")
+            return {}
+        current = state.get("preferences") or {}
+        earlier = {k: v for k, v in record.get("preferences", {}).items() if k not in current}
+        self.log(f"Recalled session after {record.get('turns', 0)} turns")
+        if not earlier:
+            return {}
+        # Only what changes the answer goes into the prompt, so repeat questions still hit the caches
+        return {"memory": {"session_preferences": ", ".join(f"{k}: {v}" for k, v in sorted(earlier.items()))}}
+
+    def remember(self, state: State) -> Dict[str, Any]:
+        memory_key = state.get("metadata", {}).get("memory_key")
+        if not memory_key:
+            return {}
+        record = self._record(state)
+        preferences = {**record.get("preferences", {}), **(state.get("preferences") or {})}
+        return {self.record_key(memory_key): {"preferences": preferences, "turns": record.get("turns", 0) + 1}}
@@ -1,15 +1,65 @@
 # Short-Term Frame
 # rasa/frames/short_term_frame.py
 
+from typing import Any, Dict
+
+from rasa.config import settings
 from rasa.core.state import State
 from rasa.core.agent import FrameAgent
 
+# Each side of a recalled turn is cut to this many characters
+MAX_TURN_CHARS = 200
+# Memory entries holding recalled turns: recent_1, recent_2, ...
+RECENT_PREFIX = "recent_"
+
+
+def _clip(text: str) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= MAX_TURN_CHARS else text[:MAX_TURN_CHARS - 3] + "..."
+
+
 class ShortTermFrame(FrameAgent):
     """
-    Placeholder for short-term memory enrichment.
-    In the future, this might pull from Redis or summarize recent inputs.
+    Recalls the last few turns of the conversation.
+
+    Turns are kept per `metadata.memory_key` (see SessionFrame), at most
+    MEMORY_SHORT_TERM_TURNS of them, and recalled oldest first into
+    `memory["recent_1"]`, `memory["recent_2"]`, ... as "input -> output".
+    `remember` returns the record with the finished turn appended.
+
+    Follow-up turns of an LLM session leave them out of the prompt (see
+    PromptAssembler.render_turn): the backend's context already holds them.
     """
 
+    reads = ("metadata",)
+    writes = ("memory",)
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.turns = settings.get_memory_short_term_turns()
+
+    def record_key(self, memory_key: str) -> str:
+        return f"short_term:{memory_key}"
+
+    def _turns(self, state: State) -> list:
+        metadata = state.get("metadata", {})
+        memory_key = metadata.get("memory_key")
+        if not memory_key or self.turns <= 0:
+            return []
+        return metadata.get("memory_records", {}).get(self.record_key(memory_key), {}).get("turns", [])
+
     def run(self, state: State) -> State:
-        self.log("Simulating short-term memory enrichment (no-op)")
-        return state
+        turns = self._turns(state)[-self.turns:]
+        if not turns:
+            self.log("No recent turns")
+            return {}
+        self.log(f"Recalled {len(turns)} recent turns")
+        return {"memory": {f"{RECENT_PREFIX}{i}": f"{t['input']} -> {t['output']}" for i, t in enumerate(turns, 1)}}
+
+    def remember(self, state: State) -> Dict[str, Any]:
+        memory_key = state.get("metadata", {}).get("memory_key")
+        user_input = (state.get("user_input") or "").strip()
+        if not memory_key or self.turns <= 0 or not user_input or not state.get("output"):
+            return {}
+        turns = self._turns(state) + [{"input": _clip(user_input), "output": _clip(state["output"])}]
+        return {self.record_key(memory_key): {"turns": turns[-self.turns:]}}
@@ -1,33 +1,117 @@
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 from rasa.core.state import State
 from rasa.core.agent import FrameAgent
-from rasa.llm.llm_client import call_llm  # <--- Add this import
+from langgraph.config import get_stream_writer
+from rasa.llm.llm_client import acall_llm, astream_llm, call_llm, stream_llm
+from rasa.llm.tokens import TokenUsage, track_usage
+from rasa.prompts.assembler import PromptAssembler
 
 class StatelessFrame(FrameAgent):
     """
     The entry frame that processes raw user input.
     Stateless — does not use memory or session context.
+
+    When the Runner binds the persona's PromptAssembler, the LLM receives the
+    assembled prompt (persona prefix, preferences, memory, then the input)
+    and the prompt is recorded in `State["prompt"]`; otherwise the raw input
+    is sent as is.
+
+    Requests carrying `metadata.session_id` continue that conversation on
+    backends that keep session context (Ollama): follow-up turns send only
+    the prompt body, not the persona prefix again. Sessions are keyed by
+    persona and memory owner as well, so another persona or user sending
+    the same `session_id` starts its own conversation.
+
+    Prompts over the persona's token budget are trimmed before the call
+    (see PromptAssembler.fit). The tokens used, and anything trimmed, are
+    recorded in `State["metadata"]["tokens"]` / `["trimmed"]`.
     """
 
-    def run(self, state: State) -> State:
-        self.log("Received user input")
+    reads = ("user_input", "context", "preferences", "memory", "metadata")
+    writes = ("context", "output", "prompt", "metadata")
+    streams = True
 
-        user_input = state.get("user_input", "").strip()
-        if not user_input:
-            self.log("No input provided.")
-            return {**state, "output": "I'm not sure what you're asking for."}
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.prompts: Optional[PromptAssembler] = None
 
-        # Optionally normalize input, tag, etc.
+    def bind_prompt_assembler(self, assembler: PromptAssembler) -> None:
+        self.prompts = assembler
 
-        # NEW: Call the LLM!
-        llm_response = call_llm(user_input)
+    def _request(self, state: State) -> Tuple[str, Dict[str, Any], bool, Dict[str, Any]]:
+        self.log("Received user input")
+        user_input = state.get("user_input", "").strip()
+        metadata = state.get("metadata", {})
+        stream = bool(metadata.get("stream"))
+        options = {"use_cache": metadata.get("llm_cache", True), "cache_scope": metadata.get("cache_scope")}
+        if metadata.get("session_id"):
+            # Adapters are shared by every persona and user: key the session by its owner too
+            persona = self.prompts.persona_vars["name"] if self.prompts is not None else ""
+            options["session_id"] = f"{persona}/{metadata.get('memory_key', '')}/{metadata['session_id']}"
+        if not user_input or self.prompts is None:
+            return user_input, options, stream, {}
+        state, trimmed = self.prompts.fit(state)
+        if trimmed:
+            self.log(f"Trimmed prompt to the token budget: {trimmed}")
+        if "session_id" in options:
+            options["followup_prompt"] = self.prompts.render_turn(state)
+        # Near-duplicate questions only match under the same template context
+        if options["cache_scope"]:
+            options["cache_scope"] = f"{options['cache_scope']}|{self.prompts.context_key(state)}"
+        options["semantic_text"] = user_input
+        return self.prompts.render(state), options, stream, trimmed
 
-        # Optionally enrich context, or just return output directly
+    def _result(
+        self,
+        prompt: str,
+        llm_response: Optional[str],
+        usage: Optional[TokenUsage] = None,
+        trimmed: Optional[Dict[str, Any]] = None,
+    ) -> State:
+        if llm_response is None:
+            self.log("No input provided.")
+            return {"output": "I'm not sure what you're asking for."}
+        metadata = {"tokens": usage.as_dict()} if usage is not None else {}
+        if trimmed:
+            metadata["trimmed"] = trimmed
+        # Return only what changed; the context and metadata reducers merge it into the State
         return {
-            **state,
-            "context": {
-                **state.get("context", {}),
-                "intent": "travel_request"
-            },
-            "output": llm_response  # Add the LLM's response to the output field!
+            "context": {"intent": "travel_request"},
+            "output": llm_response,  # Add the LLM's response to the output field!
+            "prompt": prompt,
+            "metadata": metadata,
         }
+
+    def run(self, state: State) -> State:
+        prompt, options, stream, trimmed = self._request(state)
+        if not prompt:
+            return self._result(prompt, None)
+        with track_usage() as usage:
+            response = self._stream(prompt, options) if stream else call_llm(prompt, **options)
+        return self._result(prompt, response, usage, trimmed)
+
+    def _stream(self, prompt: str, options: dict) -> str:
+        # Forward each chunk to Runner.stream as it arrives, keep the full text for the State
+        writer = get_stream_writer()
+        chunks = []
+        for chunk in stream_llm(prompt, **options):
+            writer({"node": self.name, "chunk": chunk})
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    async def arun(self, state: State) -> State:
+        # Awaits the LLM on the event loop instead of parking a thread per request
+        prompt, options, stream, trimmed = self._request(state)
+        if not prompt:
+            return self._result(prompt, None)
+        with track_usage() as usage:
+            response = await (self._astream(prompt, options) if stream else acall_llm(prompt, **options))
+        return self._result(prompt, response, usage, trimmed)
+
+    async def _astream(self, prompt: str, options: dict) -> str:
+        writer = get_stream_writer()
+        chunks = []
+        async for chunk in astream_llm(prompt, **options):
+            writer({"node": self.name, "chunk": chunk})
+            chunks.append(chunk)
+        return "".join(chunks)
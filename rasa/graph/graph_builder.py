@@ -1 +1,299 @@
+# rasa/graph/graph_builder.py
 # LangGraph Builder
+
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, START, END
+
+from rasa.core.agent import BaseAgent, FrameAgent
+from rasa.core.deadline import node_deadline, within
+from rasa.core.state import MERGED_KEYS, State, apply_delta
+from rasa.utils.trace import persona_scope, timed_node
+
+SCHEDULES = ("serial", "dag")
+
+
+class PlanNode:
+    """
+    One LangGraph node of an execution plan: a single agent, or several pure
+    agents fused into one node and run back to back.
+    """
+
+    def __init__(self, agents: List[Tuple[str, BaseAgent]], deps: List[str]):
+        self.agents = agents
+        self.deps = deps
+
+    @property
+    def name(self) -> str:
+        return "+".join(name for name, _ in self.agents)
+
+    @property
+    def members(self) -> List[str]:
+        return [name for name, _ in self.agents]
+
+    @property
+    def reads(self) -> Optional[Tuple[str, ...]]:
+        return _union(agent.reads for _, agent in self.agents)
+
+    @property
+    def writes(self) -> Optional[Tuple[str, ...]]:
+        return _union(agent.writes for _, agent in self.agents)
+
+
+def _union(declarations) -> Optional[Tuple[str, ...]]:
+    keys: List[str] = []
+    for declared in declarations:
+        if declared is None:
+            return None
+        keys.extend(k for k in declared if k not in keys)
+    return tuple(keys)
+
+
+class GraphPlan:
+    """
+    The optimized execution plan a persona compiles to.
+    """
+
+    def __init__(self, persona_name: str, schedule: str, nodes: List[PlanNode], pruned: List[str]):
+        self.persona_name = persona_name
+        self.schedule = schedule
+        self.nodes = nodes
+        self.pruned = pruned
+
+    @property
+    def dependencies(self) -> Dict[str, List[str]]:
+        return {node.name: list(node.deps) for node in self.nodes}
+
+    @property
+    def fused(self) -> List[List[str]]:
+        return [node.members for node in self.nodes if len(node.agents) > 1]
+
+    def critical_path(self) -> List[str]:
+        """
+        Longest dependency chain through the plan, i.e. the number of
+        supersteps a run takes regardless of how many nodes there are.
+        """
+        longest: Dict[str, List[str]] = {}
+        for node in self.nodes:
+            chains = [longest[d] for d in node.deps]
+            longest[node.name] = max(chains, key=len, default=[]) + [node.name]
+        return max(longest.values(), key=len, default=[])
+
+    def describe(self) -> str:
+        lines = [
+            f"Execution plan for {self.persona_name} "
+            f"({self.schedule}, {len(self.nodes)} nodes, {len(self.critical_path())} steps)"
+        ]
+        if self.pruned:
+            lines.append(f"  pruned: {', '.join(self.pruned)}")
+        for node in self.nodes:
+            after = f"  <- {', '.join(node.deps)}" if node.deps else ""
+            lines.append(f"  {node.name}{after}")
+        return "\n".join(lines)
+
+
+class GraphBuilder:
+    """
+    Compiles a persona's ordered list of agents into a LangGraph graph.
+
+    Personas stay simple lists; the builder runs optimization passes over them:
+
+    1. prune   – drop agents that declare `passthrough = True`
+    2. schedule – derive dependencies from declared reads/writes ("dag") or
+                 chain agents in persona order ("serial")
+    3. fuse    – merge chains of `pure` agents into a single node, saving the
+                 per-node scheduling and state-merge overhead
+    """
+
+    def __init__(self, persona_name: str, agents: List[Tuple[str, BaseAgent]], schedule: str = "dag", optimize: bool = True):
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule '{schedule}', expected one of {SCHEDULES}")
+        self.persona_name = persona_name
+        self.agents = agents
+        self.schedule = schedule
+        self.optimize = optimize
+        self.plan = self._plan()
+
+    # ----- passes -----
+
+    def _prune(self) -> Tuple[List[Tuple[str, BaseAgent]], List[str]]:
+        if not self.optimize:
+            return list(self.agents), []
+        kept = [(name, agent) for name, agent in self.agents if not agent.passthrough]
+        if not kept and self.agents:
+            kept = [self.agents[0]]  # A graph needs at least one node
+        pruned = [name for name, _ in self.agents if all(name != k for k, _ in kept)]
+        return kept, pruned
+
+    @staticmethod
+    def _conflicts(earlier: BaseAgent, later: BaseAgent) -> bool:
+        if None in (earlier.reads, earlier.writes, later.reads, later.writes):
+            return True
+        earlier_writes, later_writes = set(earlier.writes), set(later.writes)
+        return bool(
+            earlier_writes & set(later.reads)
+            # Updates of reducer-merged keys (memory, context, ...) combine rather than overwrite
+            or (earlier_writes & later_writes) - set(MERGED_KEYS)
+            or set(earlier.reads) & later_writes
+        )
+
+    def _schedule(self, agents: List[Tuple[str, BaseAgent]]) -> List[PlanNode]:
+        """
+        In "serial" mode every node waits for its predecessor. In "dag" mode a
+        node waits for every earlier node it conflicts with (read-after-write,
+        write-after-write, write-after-read), reduced to the minimal edge set.
+        Two writes of a reducer-merged key (State.MERGED_KEYS) do not conflict:
+        `restrict()` limits each node to its own keys and the reducer merges
+        their entries.
+        """
+        if self.schedule == "serial":
+            return [PlanNode([entry], [agents[i - 1][0]] if i else []) for i, entry in enumerate(agents)]
+
+        ancestors: Dict[str, set] = {}
+        nodes = []
+        for i, (name, agent) in enumerate(agents):
+            direct = [prev for prev, other in agents[:i] if self._conflicts(other, agent)]
+            # Drop edges already implied through another dependency
+            implied = set().union(*(ancestors[d] for d in direct)) if direct else set()
+            nodes.append(PlanNode([(name, agent)], [d for d in direct if d not in implied]))
+            ancestors[name] = set(direct) | implied
+        return nodes
+
+    def _fuse(self, nodes: List[PlanNode]) -> List[PlanNode]:
+        """
+        Fuse a node into its predecessor when both are pure, the predecessor is
+        its only dependency and nothing else waits on the predecessor.
+        """
+        if not self.optimize:
+            return nodes
+
+        children: Dict[str, List[str]] = {node.name: [] for node in nodes}
+        for node in nodes:
+            for dep in node.deps:
+                children[dep].append(node.name)
+
+        owner: Dict[str, PlanNode] = {}  # original node name -> (possibly fused) node
+        dep_owners: Dict[int, List[PlanNode]] = {}
+        fused: List[PlanNode] = []
+        for node in nodes:
+            owners: List[PlanNode] = []
+            for dep in node.deps:
+                if owner[dep] not in owners:
+                    owners.append(owner[dep])
+
+            tail = owners[0] if len(owners) == 1 else None
+            if (
+                tail is not None
+                and all(agent.pure for _, agent in tail.agents + node.agents)
+                and all(
+                    child in tail.members or child == node.name
+                    for member in tail.members
+                    for child in children[member]
+                )
+            ):
+                tail.agents = tail.agents + node.agents
+                owner[node.name] = tail
+                continue
+
+            merged = PlanNode(list(node.agents), [])
+            dep_owners[id(merged)] = owners
+            owner[node.name] = merged
+            fused.append(merged)
+
+        for node in fused:
+            node.deps = [dep.name for dep in dep_owners[id(node)]]
+        return fused
+
+    def _plan(self) -> GraphPlan:
+        agents, pruned = self._prune()
+        nodes = self._fuse(self._schedule(agents))
+        return GraphPlan(self.persona_name, self.schedule, nodes, pruned)
+
+    # ----- compilation -----
+
+    @staticmethod
+    def _kind(agent: BaseAgent) -> str:
+        return "frame" if isinstance(agent, FrameAgent) else "operator"
+
+    def _runnable(self, node: PlanNode) -> RunnableLambda:
+        """
+        Wrap a plan node as a LangGraph node usable from both `invoke` and `ainvoke`.
+        Every agent call is timed, including each member of a fused node, and
+        runs under the request's deadline (rasa/core/deadline.py): async
+        agents are cancelled when it passes, sync ones fail once they return.
+
+        In "dag" mode, declared nodes only report the keys they own; parallel
+        branches would otherwise produce conflicting writes of untouched keys.
+
+        Each node labels its metrics with the persona itself: a streamed run
+        is resumed from other contexts, which do not carry the Runner's scope.
+        """
+        agents = [(name, agent, self._kind(agent)) for name, agent in node.agents]
+        persona = self.persona_name
+        writes = node.writes if self.schedule == "dag" else None
+
+        def restrict(update: State) -> State:
+            if writes is None or update is None:
+                return update
+            return {k: update[k] for k in writes if k in update}
+
+        if len(agents) == 1:
+            name, agent, kind = agents[0]
+
+            def run(state: State) -> State:
+                with persona_scope(persona), timed_node(name, kind), node_deadline(state, name):
+                    update = agent.run(state)
+                return restrict(update)
+
+            async def arun(state: State) -> State:
+                with persona_scope(persona), timed_node(name, kind), node_deadline(state, name) as deadline:
+                    update = await within(deadline, name, agent.arun(state))
+                return restrict(update)
+
+            return RunnableLambda(run, afunc=arun, name=node.name)
+
+        def run_fused(state: State) -> State:
+            delta: State = {}
+            with persona_scope(persona):
+                for name, agent, kind in agents:
+                    with timed_node(name, kind), node_deadline(state, name):
+                        update = agent.run(state)
+                    state = apply_delta(state, update)
+                    delta = apply_delta(delta, update)
+            return restrict(delta)
+
+        async def arun_fused(state: State) -> State:
+            delta: State = {}
+            with persona_scope(persona):
+                for name, agent, kind in agents:
+                    with timed_node(name, kind), node_deadline(state, name) as deadline:
+                        update = await within(deadline, name, agent.arun(state))
+                    state = apply_delta(state, update)
+                    delta = apply_delta(delta, update)
+            return restrict(delta)
+
+        return RunnableLambda(run_fused, afunc=arun_fused, name=node.name)
+
+    def compile(self):
+        sg = StateGraph(State)
+
+        for node in self.plan.nodes:
+            sg.add_node(node.name, self._runnable(node))
+
+        has_children = set()
+        for node in self.plan.nodes:
+            if not node.deps:
+                sg.add_edge(START, node.name)
+            elif len(node.deps) == 1:
+                sg.add_edge(node.deps[0], node.name)
+            else:
+                # Fan-in: wait for every parallel branch before continuing
+                sg.add_edge(node.deps, node.name)
+            has_children.update(node.deps)
+
+        for node in self.plan.nodes:
+            if node.name not in has_children:
+                sg.add_edge(node.name, END)
+
+        return sg.compile()
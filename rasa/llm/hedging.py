@@ -0,0 +1,185 @@
+# rasa/llm/hedging.py
+
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from rasa.utils.trace import record_hedge
+
+# Runs the attempts of hedged sync calls; a losing attempt finishes here in the background
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    The process-wide attempt pool, sized so it never caps what the limiters
+    admit: each hedged call holds up to two attempts, and each attempt holds
+    a worker while it waits in its limiter's queue or runs. Threads are
+    started on demand, so the bound costs nothing while idle.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from rasa.config import settings
+                workers = 2 * (settings.get_llm_max_concurrency() + settings.get_llm_queue_size())
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rasa-hedge")
+    return _executor
+
+
+def parse_targets(spec: str) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    `"ollama:llama3@http://gpu2:11434, openai:gpt-4o-mini"` ->
+    [("ollama", "llama3", "http://gpu2:11434"), ("openai", "gpt-4o-mini", None)].
+    Model names may contain colons (`ollama:llama3:8b`).
+    """
+    targets = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        target, _, host = item.partition("@")
+        provider, _, model = target.partition(":")
+        if not model:
+            raise ValueError(f"LLM target must look like provider:model[@host], got {item!r}")
+        targets.append((provider.strip().lower(), model.strip(), host.strip() or None))
+    return targets
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies, for percentile-based hedge delays."""
+
+    def __init__(self, window: int = 256, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """The p-th percentile (0-100), or None until `min_samples` are in."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+_trackers: Dict[Any, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def latency_tracker(key: Any) -> LatencyTracker:
+    """Process-wide tracker for one target, e.g. (provider, host, model)."""
+    tracker = _trackers.get(key)
+    if tracker is None:
+        with _trackers_lock:
+            tracker = _trackers.setdefault(key, LatencyTracker())
+    return tracker
+
+
+def run_hedged(calls: Sequence[Callable[[], Any]], delay: Optional[float]) -> Tuple[int, Any]:
+    """
+    Run `calls[0]`, falling back down the list on errors; returns
+    (index of the call that answered, its result).
+
+    With a `delay`, a primary that has not answered after `delay` seconds is
+    hedged: the next call starts alongside it and the first success wins.
+    Threads cannot be cancelled, so the losing attempt is left to finish in
+    the background and its result is dropped. Without a delay the calls run
+    one after another on the caller's thread.
+    """
+    if delay is None:
+        error: Optional[BaseException] = None
+        for i, call in enumerate(calls):
+            if i:
+                record_hedge("fallback")
+            try:
+                return i, call()
+            except Exception as e:
+                error = e
+        raise error
+
+    futures: Dict[Any, int] = {}
+    launched = 0
+    hedged = False
+
+    def launch() -> None:
+        nonlocal launched
+        # Keep the caller's context (persona for metrics) in the worker thread
+        futures[_get_executor().submit(contextvars.copy_context().run, calls[launched])] = launched
+        launched += 1
+
+    launch()
+    while True:
+        can_hedge = not hedged and launched < len(calls)
+        done, _ = wait(list(futures), timeout=delay if can_hedge else None, return_when=FIRST_COMPLETED)
+        if not done:
+            hedged = True
+            record_hedge("hedge")
+            launch()
+            continue
+        for future in done:
+            i = futures.pop(future)
+            if future.exception() is None:
+                for loser in futures:
+                    loser.cancel()  # Only prevents attempts that have not started yet
+                if i:
+                    record_hedge("secondary_won")
+                return i, future.result()
+            error = future.exception()
+        if not futures:
+            if launched >= len(calls):
+                raise error
+            record_hedge("fallback")
+            launch()
+
+
+async def arun_hedged(calls: Sequence[Callable[[], Awaitable[Any]]], delay: Optional[float]) -> Tuple[int, Any]:
+    """
+    asyncio counterpart of `run_hedged`. The losing attempt is cancelled, and
+    cancelling the caller cancels every attempt still running.
+    """
+    tasks: Dict[asyncio.Future, int] = {}
+    launched = 0
+    hedged = False
+
+    def launch() -> None:
+        nonlocal launched
+        tasks[asyncio.ensure_future(calls[launched]())] = launched
+        launched += 1
+
+    launch()
+    try:
+        while True:
+            can_hedge = delay is not None and not hedged and launched < len(calls)
+            done, _ = await asyncio.wait(list(tasks), timeout=delay if can_hedge else None, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                record_hedge("hedge")
+                launch()
+                continue
+            for task in done:
+                i = tasks.pop(task)
+                if task.exception() is None:
+                    if i:
+                        record_hedge("secondary_won")
+                    return i, task.result()
+                error = task.exception()
+            if not tasks:
+                if launched >= len(calls):
+                    raise error
+                record_hedge("fallback")
+                launch()
+    finally:
+        for task in tasks:
+            task.cancel()
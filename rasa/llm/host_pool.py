@@ -0,0 +1,160 @@
+# rasa/llm/host_pool.py
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+
+def parse_hosts(hosts: Union[str, Sequence[str], None]) -> List[str]:
+    """`"http://a:11434, http://b:11434"` or a list -> normalized host URLs."""
+    if hosts is None:
+        return []
+    if isinstance(hosts, str):
+        hosts = hosts.split(",")
+    return [h.strip().rstrip("/") for h in hosts if h and h.strip()]
+
+
+def is_host_failure(error: BaseException) -> bool:
+    """
+    Whether an error says something about the host rather than the request:
+    connection problems, timeouts and 5xx responses count, 4xx (bad model
+    name, bad payload) would fail on every host and do not.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is None or status >= 500
+
+
+class _Host:
+    __slots__ = ("url", "outstanding", "latency", "requests", "failures", "ejected_until", "ejections", "probing")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.latency = 0.0  # EWMA (s); 0 until the first success, so new hosts get tried
+        self.requests = 0
+        self.failures = 0  # Consecutive
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.probing = False
+
+
+class HostPool:
+    """
+    Client-side load balancing over several hosts serving the same model.
+
+    `route()` picks a host per request:
+    - "ewma" (default): lowest EWMA latency weighted by requests in flight,
+      so slow hosts get less traffic and busy ones are skipped;
+    - "least_outstanding": fewest requests in flight.
+
+    A host failing `eject_after` requests in a row is ejected for
+    `eject_seconds`; after that a single probe request is let through and
+    its outcome decides whether the host is back in or ejected again. If
+    every host is ejected, the one due back first is used anyway.
+    """
+
+    def __init__(
+        self,
+        hosts: Union[str, Sequence[str]],
+        strategy: str = "ewma",
+        eject_after: int = 3,
+        eject_seconds: float = 10.0,
+        decay: float = 0.3,
+    ):
+        urls = parse_hosts(hosts)
+        if not urls:
+            raise ValueError("HostPool needs at least one host")
+        if strategy not in ("ewma", "least_outstanding"):
+            raise ValueError(f"Unsupported load-balancing strategy: {strategy}")
+        self.hosts = [_Host(url) for url in urls]
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.decay = decay
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    @property
+    def urls(self) -> List[str]:
+        return [h.url for h in self.hosts]
+
+    def _score(self, host: _Host) -> tuple:
+        if self.strategy == "least_outstanding":
+            return (host.outstanding, host.latency, random.random())
+        return ((host.outstanding + 1) * host.latency, host.outstanding, random.random())
+
+    def _pick(self, now: float, prefer: Optional[str]) -> _Host:
+        # Caller holds the lock
+        if len(self.hosts) == 1:
+            return self.hosts[0]
+        healthy = [h for h in self.hosts if h.ejected_until <= now and not h.probing]
+        for host in healthy:
+            if host.url == prefer and host.failures < self.eject_after:
+                return host
+        for host in healthy:
+            if host.ejections and host.failures >= self.eject_after:
+                # Ejection just expired: this request is the probe
+                host.probing = True
+                return host
+        if healthy:
+            return min(healthy, key=self._score)
+        return min(self.hosts, key=lambda h: h.ejected_until)
+
+    @contextmanager
+    def route(self, prefer: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the URL to use for one request and record how it went. A
+        healthy `prefer` host is used regardless of load, e.g. the host that
+        holds a session's cached state.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            host = self._pick(time.monotonic(), prefer)
+            host.outstanding += 1
+            host.requests += 1
+        try:
+            yield host.url
+        except Exception as e:
+            self._done(host, failed=is_host_failure(e))
+            raise
+        except BaseException:
+            # Cancelled or abandoned by the caller: says nothing about the host
+            with self._lock:
+                host.outstanding -= 1
+                host.probing = False
+            raise
+        self._done(host, latency=time.perf_counter() - start)
+
+    def _done(self, host: _Host, latency: Optional[float] = None, failed: bool = False) -> None:
+        with self._lock:
+            host.outstanding -= 1
+            host.probing = False
+            if not failed:
+                host.failures = 0
+                if latency is not None:
+                    host.latency = latency if host.latency == 0 else (1 - self.decay) * host.latency + self.decay * latency
+                return
+            host.failures += 1
+            if host.failures >= self.eject_after:
+                host.ejected_until = time.monotonic() + self.eject_seconds
+                host.ejections += 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": h.url,
+                    "healthy": h.ejected_until <= now,
+                    "outstanding": h.outstanding,
+                    "latency_ewma_s": round(h.latency, 4),
+                    "requests": h.requests,
+                    "ejections": h.ejections,
+                }
+                for h in self.hosts
+            ]
@@ -0,0 +1,327 @@
+# rasa/llm/limiter.py
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+from rasa.core.deadline import remaining_or
+from rasa.llm.host_pool import parse_hosts
+from rasa.utils.trace import record_llm_rejected, record_queue_wait
+
+
+class LLMOverloaded(RuntimeError):
+    """
+    An LLM call was refused instead of queued: the backend is at its limit
+    and waiting would exceed the queue bounds. `status_code` is 429 for rate
+    limits and 503 for a full or stalled queue; `retry_after` is a hint in
+    whole seconds.
+    """
+
+    def __init__(self, name: str, reason: str, retry_after: float):
+        self.name = name
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.status_code = 429 if reason == "rate" else 503
+        super().__init__(f"LLM backend {name} is overloaded ({reason}); retry after {self.retry_after}s")
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` calls per second with bursts of `burst`.
+    `reserve()` takes a token and returns how long to wait before using it,
+    so callers queue in arrival order without polling.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Tuple[bool, float]:
+        """
+        (True, seconds to wait) with a token taken, or (False, seconds until
+        a token would be free) without taking one when that exceeds `max_wait`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return False, wait
+            self._tokens -= 1
+            return True, wait
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.granted = False
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMLimiter:
+    """
+    Admission control for one LLM backend (provider + host).
+
+    At most `limit` calls run at once; further callers wait in a FIFO queue
+    of at most `max_queue` entries for up to `queue_timeout` seconds. With a
+    `rate`, calls also draw from a token bucket. A caller that cannot be
+    admitted within those bounds gets LLMOverloaded right away instead of
+    piling onto a saturated backend. Threads and coroutines share the same
+    slots.
+
+    With a `target_latency`, the limit adapts (AIMD): a call slower than the
+    target shrinks it by a quarter, a full window of faster calls grows it by
+    one, never above `max_concurrency`. Slow calls admitted before the last
+    decrease do not shrink it again, so one burst of slow calls in flight
+    counts as a single congestion signal.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 16,
+        rate: float = 0.0,
+        burst: Optional[float] = None,
+        max_queue: int = 64,
+        queue_timeout: float = 30.0,
+        target_latency: float = 0.0,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.active = 0
+        self.rejected = 0
+        self.latency = 1.0  # EWMA of call latency (s), used for Retry-After
+        self._good = 0
+        self._decreased_at = float("-inf")  # perf_counter() of the last decrease
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    # ---- admission ----
+
+    def _reject(self, reason: str, retry_after: float) -> LLMOverloaded:
+        with self._lock:
+            self.rejected += 1
+        record_llm_rejected(self.name, reason)
+        return LLMOverloaded(self.name, reason, retry_after)
+
+    def _retry_after(self) -> float:
+        # Caller holds the lock: time for the queue ahead to drain
+        return self.latency * (len(self._waiters) + 1) / max(1, self.limit)
+
+    def _enter(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[_Waiter]:
+        """Take a slot (returns None) or join the queue (returns the waiter)."""
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                return None
+            if len(self._waiters) >= self.max_queue:
+                retry_after = self._retry_after()
+            else:
+                waiter = _Waiter(loop)
+                self._waiters.append(waiter)
+                return waiter
+        raise self._reject("queue_full", retry_after)
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Leave the queue; True when a slot was granted meanwhile and must be released."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    def _timed_out(self) -> LLMOverloaded:
+        with self._lock:
+            retry_after = self._retry_after()
+        return self._reject("timeout", retry_after)
+
+    def _rate_wait(self) -> float:
+        if self.bucket is None:
+            return 0.0
+        ok, wait = self.bucket.reserve(remaining_or(self.queue_timeout))
+        if not ok:
+            raise self._reject("rate", wait)
+        return wait
+
+    def acquire(self) -> None:
+        start = time.perf_counter()
+        wait = self._rate_wait()
+        if wait:
+            time.sleep(wait)
+        waiter = self._enter()
+        # Never queue past the request's deadline
+        if waiter is not None and not waiter.event.wait(remaining_or(self.queue_timeout)):
+            if not self._abandon(waiter):
+                raise self._timed_out()
+        record_queue_wait(self.name, time.perf_counter() - start)
+
+    async def aacquire(self) -> None:
+        start = time.perf_counter()
+        wait = self._rate_wait()
+        if wait:
+            await asyncio.sleep(wait)
+        waiter = self._enter(asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter.future, remaining_or(self.queue_timeout))
+            except asyncio.TimeoutError:
+                if not self._abandon(waiter):
+                    raise self._timed_out() from None
+            except asyncio.CancelledError:
+                if self._abandon(waiter):
+                    self.release()
+                raise
+        record_queue_wait(self.name, time.perf_counter() - start)
+
+    def release(self) -> None:
+        with self._lock:
+            # Hand the slot straight to the next waiter unless the limit shrank
+            if self._waiters and self.active <= self.limit:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+            else:
+                self.active -= 1
+                return
+        try:
+            waiter.wake()
+        except RuntimeError:
+            # Its event loop is closed, nobody is waiting any more: pass the slot on
+            self.release()
+
+    # ---- feedback ----
+
+    def observe(self, latency: float, started: Optional[float] = None) -> None:
+        """
+        Feed one completed call's latency into Retry-After and the adaptive
+        limit. `started` is the call's `time.perf_counter()` at admission.
+        """
+        with self._lock:
+            self.latency = 0.8 * self.latency + 0.2 * latency
+            if self.target_latency <= 0:
+                return
+            if latency > self.target_latency:
+                if started is not None and started < self._decreased_at:
+                    return  # Already counted by the decrease its cohort triggered
+                self.limit = max(1, int(self.limit * 0.75))
+                self._decreased_at = time.perf_counter()
+                self._good = 0
+            else:
+                self._good += 1
+                if self._good >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._good = 0
+                    # The new slot goes to the head of the queue, if any
+                    if self._waiters and self.active < self.limit:
+                        waiter = self._waiters.popleft()
+                        waiter.granted = True
+                        self.active += 1
+                        waiter.wake()
+
+    @contextmanager
+    def slot(self, observe: bool = True) -> Iterator[None]:
+        """Hold one slot for the duration of a call (blocking)."""
+        self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if observe:
+                self.observe(time.perf_counter() - start, start)
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, observe: bool = True) -> AsyncIterator[None]:
+        """Hold one slot for the duration of a call (awaiting)."""
+        await self.aacquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if observe:
+                self.observe(time.perf_counter() - start, start)
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "max_concurrency": self.max_concurrency,
+                "active": self.active,
+                "queued": len(self._waiters),
+                "rejected": self.rejected,
+                "latency_ewma_s": round(self.latency, 3),
+            }
+
+
+_limiters: Dict[Tuple[str, str], LLMLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, host: Optional[str] = None) -> LLMLimiter:
+    """
+    Return the process-wide limiter for (provider, host), configured from
+    settings on first use (`LLM_MAX_CONCURRENCY`, `LLM_RATE_LIMIT`, ...,
+    each overridable per provider, e.g. `LLM_MAX_CONCURRENCY_OLLAMA`).
+
+    `host` may be a comma-separated pool (see rasa/llm/host_pool.py). The
+    concurrency limit is per host, so a pool's limiter admits that many calls
+    per host in it; the pool balances them across its hosts.
+    """
+    key = ((provider or "").lower(), host or "")
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                from rasa.config import settings
+                provider = key[0]
+                limiter = _limiters[key] = LLMLimiter(
+                    f"{provider}@{host}" if host else provider,
+                    max_concurrency=settings.get_llm_max_concurrency(provider) * max(1, len(parse_hosts(host))),
+                    rate=settings.get_llm_rate_limit(provider),
+                    burst=settings.get_llm_rate_burst(provider) or None,
+                    max_queue=settings.get_llm_queue_size(),
+                    queue_timeout=settings.get_llm_queue_timeout(),
+                    target_latency=settings.get_llm_target_latency(),
+                )
+    return limiter
+
+
+def limiters() -> Dict[str, Dict[str, Any]]:
+    """Stats of every limiter created so far, by backend name."""
+    with _limiters_lock:
+        current = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in current}
+
+
+def reset_limiters() -> None:
+    """Forget every limiter, e.g. after changing the limit settings."""
+    with _limiters_lock:
+        _limiters.clear()
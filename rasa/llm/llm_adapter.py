@@ -1,6 +1,18 @@
+import asyncio
+import json
+import logging
 import os
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Iterator, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+
+from rasa.core.deadline import current_deadline, remaining_or
+from rasa.llm.host_pool import HostPool
+from rasa.llm.session_context import SessionContexts
+from rasa.llm.tokens import record_usage
+
+logger = logging.getLogger(__name__)
 
 
 # Assumes all LLM config loaded via rasa/config/settings.py
@@ -9,10 +21,63 @@ try:
 except ImportError:
     settings = None  # For isolated test/debugging
 
+async def _aclose_client(client: Any) -> None:
+    # httpx clients have `aclose`, the async SDK clients an async `close`
+    try:
+        await (client.aclose() if hasattr(client, "aclose") else client.close())
+    except Exception as e:
+        logger.warning(f"Could not close an async LLM client: {e}")
+
+
+def _discard_async_client(loop: asyncio.AbstractEventLoop, client: Any) -> None:
+    """
+    Close an async client made by `loop` from outside it, so its sockets do
+    not leak: on that loop while it still runs, otherwise on the caller's
+    running loop or, with none, a private one. A closed loop (e.g. after
+    `asyncio.run`) took its client's connections down with it, and closing
+    them again could only fail: the client is just dropped.
+    """
+    if loop.is_closed():
+        logger.debug("Dropping an async LLM client of a closed event loop")
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_client(client), loop)
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_aclose_client(client))
+    else:
+        running.create_task(_aclose_client(client))
+
+
 class LLMAdapter:
     """
     Unified interface for LLMs in RASA.
     Supports: Ollama (local), OpenAI, Claude (Anthropic)
+
+    An adapter owns its HTTP connections: Ollama calls go through a keep-alive
+    `requests.Session` and cloud SDK clients are built once, on first use.
+    Share adapters through `get_adapter()` so repeated calls reuse sockets.
+
+    `host` may list several Ollama hosts serving the same model, separated by
+    commas; each request is then routed by a HostPool (EWMA latency or least
+    outstanding requests, with passive ejection of failing hosts).
+
+    `agenerate` / `astream` are the non-blocking counterparts of `generate` /
+    `stream`. They use a pooled `httpx.AsyncClient` (and the async SDK
+    clients), created once per event loop, so a single loop can drive many
+    concurrent generations without a thread per call.
+
+    Ollama calls given a `session_id` continue that session: the `context`
+    tokens returned by its previous turn are sent back (see SessionContexts)
+    along with `followup_prompt`, the new text only, instead of the full
+    prompt, and the request goes to the host that served the previous turn.
+    `keep_alive` (LLM_KEEP_ALIVE) keeps the model loaded between turns.
+
+    Every completed call reports its prompt and completion tokens (see
+    rasa/llm/tokens.py): the provider's own counts where the response has
+    them, a local estimate otherwise.
     """
 
     def __init__(
@@ -21,6 +86,9 @@ class LLMAdapter:
         model: Optional[str] = None,
         api_key: Optional[str] = None,
         host: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
         **kwargs
     ):
         # Load from settings or env if not provided directly
@@ -29,7 +97,26 @@ class LLMAdapter:
         self.host = host or (getattr(settings, "LLM_HOST", None) if settings else os.getenv("LLM_HOST", "http://localhost:11434"))
         self.api_key = api_key or self._get_api_key(self.provider)
         self.mode = getattr(settings, "LLM_MODE", os.getenv("LLM_MODE", "local"))
+        self.pool_size = pool_size or (settings.get_llm_pool_size() if settings else int(os.getenv("LLM_POOL_SIZE", 16)))
+        self.connect_timeout = connect_timeout or (settings.get_llm_connect_timeout() if settings else float(os.getenv("LLM_CONNECT_TIMEOUT", 5.0)))
+        self.read_timeout = read_timeout or (settings.get_llm_read_timeout() if settings else float(os.getenv("LLM_READ_TIMEOUT", 120.0)))
+        self.hosts = HostPool(
+            self.host,
+            strategy=settings.get_llm_lb_strategy() if settings else os.getenv("LLM_LB_STRATEGY", "ewma"),
+            eject_after=settings.get_llm_eject_after() if settings else int(os.getenv("LLM_EJECT_AFTER", 3)),
+            eject_seconds=settings.get_llm_eject_seconds() if settings else float(os.getenv("LLM_EJECT_SECONDS", 10.0)),
+        ) if self.host else None
+        self.keep_alive = self._keep_alive(settings.get_llm_keep_alive() if settings else os.getenv("LLM_KEEP_ALIVE", ""))
+        max_sessions = settings.get_llm_session_contexts() if settings else int(os.getenv("LLM_SESSION_CONTEXTS", 1024))
+        self.sessions = SessionContexts(
+            max_sessions, settings.get_llm_session_ttl() if settings else float(os.getenv("LLM_SESSION_TTL", 1800))
+        ) if max_sessions > 0 and (self.provider or "").lower() == "ollama" else None
         self.config = kwargs
+        self._session: Optional[requests.Session] = None
+        self._client: Any = None  # Cloud SDK client (openai / anthropic)
+        # Async clients by name ("http", "sdk"), each bound to the loop that created it
+        self._async_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._lock = threading.Lock()
 
     @staticmethod
     def _get_api_key(provider):
@@ -39,6 +126,25 @@ class LLMAdapter:
             return getattr(settings, "CLAUDE_API_KEY", None) if settings else os.getenv("CLAUDE_API_KEY")
         return None  # Ollama/local does not require API key
 
+    @staticmethod
+    def _keep_alive(value):
+        # Ollama reads a number as seconds and a string as a duration ("30m", "1h")
+        value = (value or "").strip()
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    def _usage(self, prompt: str, completion: str, prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None) -> None:
+        record_usage(self.provider, self.model, prompt, completion, prompt_tokens, completion_tokens)
+
+    @staticmethod
+    def _sdk_usage(usage: Any, prompt_field: str, completion_field: str) -> Tuple[Optional[int], Optional[int]]:
+        # OpenAI: prompt_tokens / completion_tokens, Anthropic: input_tokens / output_tokens
+        return getattr(usage, prompt_field, None), getattr(usage, completion_field, None)
+
     @classmethod
     def from_config(cls, **overrides):
         """
@@ -46,6 +152,104 @@ class LLMAdapter:
         """
         return cls(**overrides)
 
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def _request_timeout(self) -> Tuple[float, float]:
+        """`timeout`, cut down to what is left of the running request's deadline."""
+        return (remaining_or(self.connect_timeout), remaining_or(self.read_timeout))
+
+    @staticmethod
+    def _sdk_timeout() -> Dict[str, float]:
+        # Per-request timeout for the SDK clients, only when a deadline applies
+        deadline = current_deadline()
+        return {"timeout": max(0.001, deadline.remaining())} if deadline is not None else {}
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Keep-alive session with a connection pool of `pool_size` sockets.
+        Calls beyond the pool size still succeed, their extra sockets are
+        just not kept for reuse.
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    pool = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("http://", pool)
+                    session.mount("https://", pool)
+                    self._session = session
+        return self._session
+
+    def _http_client(self):
+        # Shared by the SDK clients, which are both built on httpx
+        import httpx
+        return httpx.Client(
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+        )
+
+    def _async_http_client(self):
+        import httpx
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+        )
+
+    def _async_client(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Async client `name` for the running loop. httpx connections cannot be
+        shared between event loops, so a client made by another (possibly
+        closed) loop is replaced rather than reused.
+        """
+        loop = asyncio.get_running_loop()
+        stale = None
+        with self._lock:
+            entry = self._async_clients.get(name)
+            if entry is None or entry[0] is not loop:
+                stale = entry
+                entry = self._async_clients[name] = (loop, factory())
+        if stale is not None:
+            _discard_async_client(*stale)
+        return entry[1]
+
+    @property
+    def async_http(self):
+        """Pooled `httpx.AsyncClient` for the running event loop (Ollama calls)."""
+        return self._async_client("http", self._async_http_client)
+
+    def _sdk_client(self, factory):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = factory()
+        return self._client
+
+    def close(self) -> None:
+        """Release pooled connections; the adapter reconnects on next use."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._client is not None and hasattr(self._client, "close"):
+                self._client.close()
+            self._client = None
+            stale = list(self._async_clients.values())
+            self._async_clients.clear()
+        for loop, client in stale:
+            _discard_async_client(loop, client)
+
+    async def aclose(self) -> None:
+        """Close the async clients created by the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owned = [name for name, entry in self._async_clients.items() if entry[0] is loop]
+            clients = [self._async_clients.pop(name)[1] for name in owned]
+        for client in clients:
+            await _aclose_client(client)
+
     def generate(self, prompt: str, **kwargs) -> str:
         """
         Calls the configured LLM and returns generated text.
@@ -61,42 +265,291 @@ class LLMAdapter:
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
 
-    def _ollama_generate(self, prompt: str, **kwargs) -> str:
+    def _ollama_request(self, prompt: str, kwargs: Dict[str, Any], stream: bool) -> Tuple[Dict[str, Any], Optional[str]]:
+        """The /api/generate payload, and the host to prefer for it."""
         payload = {
             "model": self.model,
             "prompt": prompt,
             "options": kwargs.get("options", {}),
-            "stream": False
+            "stream": stream
         }
-        url = f"{self.host.rstrip('/')}/api/generate"
-        resp = requests.post(url, json=payload)
-        resp.raise_for_status()
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        session_id = kwargs.get("session_id")
+        turn = self.sessions.get(session_id) if session_id and self.sessions is not None else None
+        if turn is None:
+            return payload, None
+        # The context already holds everything up to the last answer
+        payload["context"] = turn.context.tolist()
+        payload["prompt"] = kwargs.get("followup_prompt") or prompt
+        return payload, turn.host
+
+    def _ollama_remember(self, kwargs: Dict[str, Any], host: str, data: Dict[str, Any]) -> None:
+        session_id = kwargs.get("session_id")
+        if session_id and self.sessions is not None and data.get("context"):
+            self.sessions.put(session_id, data["context"], host)
+
+    def _ollama_generate(self, prompt: str, **kwargs) -> str:
+        payload, prefer = self._ollama_request(prompt, kwargs, stream=False)
+        with self.hosts.route(prefer) as host:
+            resp = self.session.post(f"{host}/api/generate", json=payload, timeout=self._request_timeout())
+            resp.raise_for_status()
         data = resp.json()
+        self._ollama_remember(kwargs, host, data)
+        self._ollama_usage(payload, data.get("response", ""), data)
         return data.get("response", "")
 
+    def _ollama_usage(self, payload: Dict[str, Any], completion: str, data: Dict[str, Any]) -> None:
+        # prompt_eval_count only covers what was prefilled: it is left out when Ollama reused its cache
+        self._usage(payload["prompt"], completion, data.get("prompt_eval_count"), data.get("eval_count"))
+
     def _openai_generate(self, prompt: str, **kwargs) -> str:
         import openai
-        openai.api_key = self.api_key
-        model = self.model
-        response = openai.ChatCompletion.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
+        messages = [{"role": "user", "content": prompt}]
+        if not hasattr(openai, "OpenAI"):
+            # openai<1.0 only offers the module-level API
+            openai.api_key = self.api_key
+            response = openai.ChatCompletion.create(
+                model=self.model,
+                messages=messages,
+                temperature=kwargs.get("temperature", 0.7),
+                max_tokens=kwargs.get("max_tokens", 512),
+                request_timeout=self._request_timeout(),
+            )
+            text = response.choices[0].message.content.strip()
+            self._usage(prompt, text, *self._sdk_usage(getattr(response, "usage", None), "prompt_tokens", "completion_tokens"))
+            return text
+
+        response = self._openai_client().chat.completions.create(
+            model=self.model,
+            **self._sdk_timeout(),
+            messages=messages,
             temperature=kwargs.get("temperature", 0.7),
             max_tokens=kwargs.get("max_tokens", 512)
         )
-        return response.choices[0].message.content.strip()
+        text = response.choices[0].message.content.strip()
+        self._usage(prompt, text, *self._sdk_usage(response.usage, "prompt_tokens", "completion_tokens"))
+        return text
 
-    def _claude_generate(self, prompt: str, **kwargs) -> str:
+    def _openai_client(self):
+        import openai
+        return self._sdk_client(lambda: openai.OpenAI(api_key=self.api_key, http_client=self._http_client()))
+
+    def _claude_client(self):
         # Requires: pip install anthropic
         import anthropic
-        client = anthropic.Anthropic(api_key=self.api_key)
-        response = client.messages.create(
+        return self._sdk_client(lambda: anthropic.Anthropic(api_key=self.api_key, http_client=self._http_client()))
+
+    def _claude_generate(self, prompt: str, **kwargs) -> str:
+        response = self._claude_client().messages.create(
+            model=self.model,
+            **self._sdk_timeout(),
+            max_tokens=kwargs.get("max_tokens", 512),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=kwargs.get("temperature", 0.7)
+        )
+        text = response.content[0].text.strip()
+        self._usage(prompt, text, *self._sdk_usage(response.usage, "input_tokens", "output_tokens"))
+        return text
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Calls the configured LLM in streaming mode and yields text chunks as
+        the provider produces them. Joining the chunks gives the full response.
+        """
+        provider = (self.provider or "").lower()
+        if provider == "ollama":
+            return self._ollama_stream(prompt, **kwargs)
+        elif provider == "openai":
+            return self._openai_stream(prompt, **kwargs)
+        elif provider == "claude":
+            return self._claude_stream(prompt, **kwargs)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    def _ollama_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        payload, prefer = self._ollama_request(prompt, kwargs, stream=True)
+        with self.hosts.route(prefer) as host, \
+                self.session.post(f"{host}/api/generate", json=payload, timeout=self._request_timeout(), stream=True) as resp:
+            resp.raise_for_status()
+            chunks = []
+            # Ollama streams one JSON object per line, the last one has "done": true
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("response"):
+                    chunks.append(data["response"])
+                    yield data["response"]
+                if data.get("done"):
+                    self._ollama_remember(kwargs, host, data)
+                    self._ollama_usage(payload, "".join(chunks), data)
+                    break
+
+    def _openai_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        import openai
+        if not hasattr(openai, "OpenAI"):
+            # Streaming is only wired up for the openai>=1.0 client
+            yield self._openai_generate(prompt, **kwargs)
+            return
+        response = self._openai_client().chat.completions.create(
+            model=self.model,
+            **self._sdk_timeout(),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=kwargs.get("temperature", 0.7),
+            max_tokens=kwargs.get("max_tokens", 512),
+            stream=True
+        )
+        chunks = []
+        for event in response:
+            if event.choices and event.choices[0].delta.content:
+                chunks.append(event.choices[0].delta.content)
+                yield event.choices[0].delta.content
+        # Streamed chat completions carry no usage unless asked for; estimate it
+        self._usage(prompt, "".join(chunks))
+
+    def _claude_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        with self._claude_client().messages.stream(
+            model=self.model,
+            **self._sdk_timeout(),
+            max_tokens=kwargs.get("max_tokens", 512),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=kwargs.get("temperature", 0.7)
+        ) as response:
+            yield from response.text_stream
+            message = response.get_final_message()
+        self._usage(
+            prompt, "".join(block.text for block in message.content if hasattr(block, "text")),
+            *self._sdk_usage(message.usage, "input_tokens", "output_tokens")
+        )
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """
+        Non-blocking `generate`: awaits the LLM without occupying a thread.
+        """
+        provider = (self.provider or "").lower()
+        if provider == "ollama":
+            return await self._ollama_agenerate(prompt, **kwargs)
+        elif provider == "openai":
+            return await self._openai_agenerate(prompt, **kwargs)
+        elif provider == "claude":
+            return await self._claude_agenerate(prompt, **kwargs)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    async def _ollama_agenerate(self, prompt: str, **kwargs) -> str:
+        payload, prefer = self._ollama_request(prompt, kwargs, stream=False)
+        with self.hosts.route(prefer) as host:
+            resp = await self.async_http.post(f"{host}/api/generate", json=payload)
+            resp.raise_for_status()
+        data = resp.json()
+        self._ollama_remember(kwargs, host, data)
+        self._ollama_usage(payload, data.get("response", ""), data)
+        return data.get("response", "")
+
+    def _async_openai_client(self):
+        import openai
+        return self._async_client(
+            "sdk", lambda: openai.AsyncOpenAI(api_key=self.api_key, http_client=self._async_http_client())
+        )
+
+    def _async_claude_client(self):
+        import anthropic
+        return self._async_client(
+            "sdk", lambda: anthropic.AsyncAnthropic(api_key=self.api_key, http_client=self._async_http_client())
+        )
+
+    async def _openai_agenerate(self, prompt: str, **kwargs) -> str:
+        import openai
+        if not hasattr(openai, "AsyncOpenAI"):
+            # openai<1.0 has no async client
+            return await asyncio.to_thread(self._openai_generate, prompt, **kwargs)
+        response = await self._async_openai_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=kwargs.get("temperature", 0.7),
+            max_tokens=kwargs.get("max_tokens", 512)
+        )
+        text = response.choices[0].message.content.strip()
+        self._usage(prompt, text, *self._sdk_usage(response.usage, "prompt_tokens", "completion_tokens"))
+        return text
+
+    async def _claude_agenerate(self, prompt: str, **kwargs) -> str:
+        response = await self._async_claude_client().messages.create(
             model=self.model,
             max_tokens=kwargs.get("max_tokens", 512),
             messages=[{"role": "user", "content": prompt}],
             temperature=kwargs.get("temperature", 0.7)
         )
-        return response.content[0].text.strip()
+        text = response.content[0].text.strip()
+        self._usage(prompt, text, *self._sdk_usage(response.usage, "input_tokens", "output_tokens"))
+        return text
+
+    def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Non-blocking `stream`: an async iterator of text chunks.
+        """
+        provider = (self.provider or "").lower()
+        if provider == "ollama":
+            return self._ollama_astream(prompt, **kwargs)
+        elif provider == "openai":
+            return self._openai_astream(prompt, **kwargs)
+        elif provider == "claude":
+            return self._claude_astream(prompt, **kwargs)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    async def _ollama_astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        payload, prefer = self._ollama_request(prompt, kwargs, stream=True)
+        with self.hosts.route(prefer) as host:
+            async with self.async_http.stream("POST", f"{host}/api/generate", json=payload) as resp:
+                resp.raise_for_status()
+                chunks = []
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("response"):
+                        chunks.append(data["response"])
+                        yield data["response"]
+                    if data.get("done"):
+                        self._ollama_remember(kwargs, host, data)
+                        self._ollama_usage(payload, "".join(chunks), data)
+                        break
+
+    async def _openai_astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        import openai
+        if not hasattr(openai, "AsyncOpenAI"):
+            yield await self._openai_agenerate(prompt, **kwargs)
+            return
+        response = await self._async_openai_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=kwargs.get("temperature", 0.7),
+            max_tokens=kwargs.get("max_tokens", 512),
+            stream=True
+        )
+        chunks = []
+        async for event in response:
+            if event.choices and event.choices[0].delta.content:
+                chunks.append(event.choices[0].delta.content)
+                yield event.choices[0].delta.content
+        self._usage(prompt, "".join(chunks))
+
+    async def _claude_astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        async with self._async_claude_client().messages.stream(
+            model=self.model,
+            max_tokens=kwargs.get("max_tokens", 512),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=kwargs.get("temperature", 0.7)
+        ) as response:
+            async for text in response.text_stream:
+                yield text
+            message = await response.get_final_message()
+        self._usage(
+            prompt, "".join(block.text for block in message.content if hasattr(block, "text")),
+            *self._sdk_usage(message.usage, "input_tokens", "output_tokens")
+        )
 
     def info(self) -> Dict[str, Any]:
         return {
@@ -105,5 +558,44 @@ class LLMAdapter:
             "host": self.host,
             "mode": self.mode,
             "api_key_present": bool(self.api_key),
+            "hosts": self.hosts.stats() if self.hosts else [],
+            "keep_alive": self.keep_alive,
+            "sessions": self.sessions.stats() if self.sessions is not None else None,
+            "pool_size": self.pool_size,
+            "timeout": {"connect": self.connect_timeout, "read": self.read_timeout},
             "config": self.config
         }
+
+
+_adapters: Dict[Tuple[str, str, str, Optional[str]], LLMAdapter] = {}
+_adapters_lock = threading.Lock()
+
+
+def get_adapter(
+    provider: str,
+    model: str,
+    host: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> LLMAdapter:
+    """
+    Return the process-wide adapter for (provider, host, model), creating it on
+    first use. The API key is part of the key so callers with different
+    credentials never share a client.
+    """
+    key = ((provider or "").lower(), host or "", model or "", api_key)
+    adapter = _adapters.get(key)
+    if adapter is None:
+        with _adapters_lock:
+            adapter = _adapters.get(key)
+            if adapter is None:
+                adapter = _adapters[key] = LLMAdapter(provider=provider, model=model, api_key=api_key, host=host)
+    return adapter
+
+
+def close_adapters() -> None:
+    """Close and forget every registered adapter (tests, shutdown, config reload)."""
+    with _adapters_lock:
+        adapters = list(_adapters.values())
+        _adapters.clear()
+    for adapter in adapters:
+        adapter.close()
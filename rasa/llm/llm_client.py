@@ -1,6 +1,137 @@
 # rasa/llm/llm_client.py
-from rasa.llm.llm_adapter import LLMAdapter
+import asyncio
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from rasa.core.deadline import check_deadline
+from rasa.llm.hedging import arun_hedged, latency_tracker, parse_targets, run_hedged
+from rasa.llm.limiter import get_limiter
+from rasa.llm.llm_adapter import LLMAdapter, get_adapter
+from rasa.llm.response_cache import cache_key, get_response_cache
+from rasa.llm.semantic_cache import get_semantic_cache
+from rasa.llm.single_flight import AsyncSingleFlight, SingleFlight
 from rasa.config import settings
+from rasa.utils.trace import timed_llm
+
+# Identical concurrent generations (same cache key) run once
+flights = SingleFlight("llm")
+async_flights = AsyncSingleFlight("llm")
+
+
+class _CacheLookup:
+    """
+    The cache tiers consulted for one call: the exact-match response cache,
+    then the semantic cache when the caller passed a `cache_scope`. The
+    semantic cache compares `semantic_text` (default: the prompt); callers
+    that wrap the user's question in a template pass the question itself and
+    put the rest of the prompt into the scope.
+    `use_cache=False` opts a single call out of caching and request coalescing
+    (e.g. a persona with `llm_cache: false`).
+    """
+
+    def __init__(
+        self,
+        llm: LLMAdapter,
+        prompt: str,
+        params: Dict[str, Any],
+        use_cache: Optional[bool],
+        cache_scope: Optional[str],
+        semantic_text: Optional[str] = None,
+    ):
+        self.prompt = prompt
+        self.semantic_text = semantic_text or prompt
+        self.key = cache_key(llm.provider, llm.model, prompt, params)
+        self.exact = self.semantic = None
+        self.vector = None
+        self.enabled = use_cache is not False
+        if not self.enabled:
+            return
+        if settings.get_llm_cache_enabled():
+            self.exact = get_response_cache()
+        if cache_scope and settings.get_semantic_cache_enabled():
+            self.semantic = get_semantic_cache()
+            # Answers are only reused for the same model and generation parameters
+            self.scope = f"{cache_scope}|{cache_key(llm.provider, llm.model, '', params)}"
+
+    def get(self) -> Optional[str]:
+        if self.exact is not None:
+            cached = self.exact.get(self.key)
+            if cached is not None:
+                return cached
+        if self.semantic is not None:
+            self.vector = self.semantic.embed(self.semantic_text)
+            match = self.semantic.lookup(self.scope, self.vector)
+            if match is not None:
+                # Not copied into the exact cache, which is not scoped
+                return match[1]
+        return None
+
+    def store(self, response: str, latency_s: float) -> None:
+        if not response:
+            return
+        if self.exact is not None:
+            self.exact.set(self.key, response)
+        if self.semantic is not None:
+            self.semantic.store(self.scope, self.vector, self.semantic_text, response, latency_s)
+
+
+def _adapter(provider: str, model: str, api_key: str, host: str) -> LLMAdapter:
+    return get_adapter(
+        provider=provider or settings.get_llm_provider(),
+        model=model or settings.get_llm_model(),
+        api_key=api_key or settings.get_openai_api_key(),
+        host=host or settings.get_llm_host(),
+    )
+
+
+def _targets(llm: LLMAdapter) -> List[LLMAdapter]:
+    """The primary adapter followed by the fallbacks configured in LLM_FALLBACKS."""
+    targets = [llm]
+    for provider, model, host in parse_targets(settings.get_llm_fallbacks()):
+        api_key = settings.get_claude_api_key() if provider == "claude" else settings.get_openai_api_key()
+        targets.append(get_adapter(provider, model, host=host or settings.get_llm_host(), api_key=api_key))
+    return targets
+
+
+def _hedge_delay(llm: LLMAdapter, targets: List[LLMAdapter]) -> Optional[float]:
+    # Hedge once the primary is slower than usual: a percentile of its recent latencies
+    if len(targets) < 2 or not settings.get_llm_hedge():
+        return None
+    observed = latency_tracker((llm.provider, llm.host, llm.model)).percentile(settings.get_llm_hedge_percentile())
+    return observed if observed is not None else settings.get_llm_hedge_delay()
+
+
+def _session(llm: LLMAdapter, session_id: Optional[str], followup_prompt: Optional[str]) -> Dict[str, Any]:
+    """Extra adapter arguments continuing a backend session, if the adapter keeps sessions."""
+    if not session_id or llm.sessions is None:
+        return {}
+    return {"session_id": session_id, "followup_prompt": followup_prompt}
+
+
+def _same_model(a: LLMAdapter, b: LLMAdapter) -> bool:
+    return (a.provider or "").lower() == (b.provider or "").lower() and a.model == b.model
+
+
+def _attempt(target: LLMAdapter, primary: LLMAdapter, prompt: str, kwargs: Dict[str, Any]) -> str:
+    with get_limiter(target.provider, target.host).slot():
+        start = time.perf_counter()
+        with timed_llm(target.provider, target.model):
+            response = target.generate(prompt, **kwargs)
+    if target is primary:
+        latency_tracker((target.provider, target.host, target.model)).add(time.perf_counter() - start)
+    return response
+
+
+async def _aattempt(target: LLMAdapter, primary: LLMAdapter, prompt: str, kwargs: Dict[str, Any]) -> str:
+    async with get_limiter(target.provider, target.host).aslot():
+        start = time.perf_counter()
+        with timed_llm(target.provider, target.model):
+            response = await target.agenerate(prompt, **kwargs)
+    if target is primary:
+        latency_tracker((target.provider, target.host, target.model)).add(time.perf_counter() - start)
+    return response
+
 
 def call_llm(
     prompt: str,
@@ -8,16 +139,173 @@ def call_llm(
     model: str = None,
     api_key: str = None,
     host: str = None,
+    use_cache: Optional[bool] = None,
+    cache_scope: Optional[str] = None,
+    semantic_text: Optional[str] = None,
+    session_id: Optional[str] = None,
+    followup_prompt: Optional[str] = None,
     **kwargs
 ):
     """
     Calls the configured (or specified) LLM and returns the result.
-    Parameters can override defaults from settings.
+    Parameters can override defaults from settings. The adapter (and its
+    connection pool) is shared across calls with the same provider, host and model.
+
+    Identical calls (provider, model, prompt and generation parameters) are
+    answered from the response cache unless `use_cache=False`. With a
+    `cache_scope` (see Runner), near-duplicate prompts in that scope can be
+    answered by the semantic cache, comparing `semantic_text` if given
+    rather than the whole prompt. Identical calls that arrive while one is
+    still generating wait for it and share its result (or error).
+
+    Generations go through the backend's limiter (see rasa/llm/limiter.py):
+    when it cannot admit the call in time, LLMOverloaded is raised.
+
+    When the primary fails, the targets in LLM_FALLBACKS are tried in turn.
+    With LLM_HEDGE, a primary slower than its usual latency percentile is
+    raced against the first fallback (see rasa/llm/hedging.py). Answers
+    from a different model are not cached under the primary's key.
+
+    With a `session_id`, an Ollama adapter continues that conversation (see
+    LLMAdapter), sending only `followup_prompt` once the session has a
+    context. The answer then depends on the conversation so far: session
+    calls are neither cached, coalesced nor hedged.
     """
-    llm = LLMAdapter(
-        provider=provider or settings.get_llm_provider(),
-        model=model or settings.get_llm_model(),
-        api_key=api_key or settings.get_openai_api_key(),
-        host=host or settings.get_llm_host(),
-    )
-    return llm.generate(prompt, **kwargs)
+    llm = _adapter(provider, model, api_key, host)
+    session = _session(llm, session_id, followup_prompt)
+    caches = _CacheLookup(llm, prompt, kwargs, False if session else use_cache, cache_scope, semantic_text)
+    cached = caches.get()
+    if cached is not None:
+        return cached
+
+    def generate() -> str:
+        targets = _targets(llm)
+        start = time.perf_counter()
+        winner, response = run_hedged(
+            [partial(_attempt, target, llm, prompt, {**kwargs, **session}) for target in targets],
+            None if session else _hedge_delay(llm, targets),
+        )
+        if _same_model(targets[winner], llm):
+            caches.store(response, time.perf_counter() - start)
+        return response
+
+    if caches.enabled and settings.get_llm_single_flight():
+        return flights.do(caches.key, generate)
+    return generate()
+
+
+def stream_llm(
+    prompt: str,
+    provider: str = None,
+    model: str = None,
+    api_key: str = None,
+    host: str = None,
+    use_cache: Optional[bool] = None,
+    cache_scope: Optional[str] = None,
+    semantic_text: Optional[str] = None,
+    session_id: Optional[str] = None,
+    followup_prompt: Optional[str] = None,
+    **kwargs
+) -> Iterator[str]:
+    """
+    Streaming variant of `call_llm`: yields text chunks as the LLM produces them.
+    The latency metric covers the whole stream, from request to last chunk.
+    A cached response is yielded as a single chunk; a completed stream is cached.
+    Streams are not coalesced: each caller consumes its own chunks. Nor are
+    they hedged or failed over, as chunks may already have been forwarded.
+    """
+    llm = _adapter(provider, model, api_key, host)
+    session = _session(llm, session_id, followup_prompt)
+    caches = _CacheLookup(llm, prompt, kwargs, False if session else use_cache, cache_scope, semantic_text)
+    cached = caches.get()
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    # A stream's duration depends on its reader, so it does not drive the adaptive limit
+    with get_limiter(llm.provider, llm.host).slot(observe=False):
+        start = time.perf_counter()
+        with timed_llm(llm.provider, llm.model):
+            for chunk in llm.stream(prompt, **kwargs, **session):
+                chunks.append(chunk)
+                yield chunk
+                # A slow stream is only cut short here; async streams are cancelled
+                check_deadline()
+    caches.store("".join(chunks), time.perf_counter() - start)
+
+
+async def acall_llm(
+    prompt: str,
+    provider: str = None,
+    model: str = None,
+    api_key: str = None,
+    host: str = None,
+    use_cache: Optional[bool] = None,
+    cache_scope: Optional[str] = None,
+    semantic_text: Optional[str] = None,
+    session_id: Optional[str] = None,
+    followup_prompt: Optional[str] = None,
+    **kwargs
+) -> str:
+    """
+    Async variant of `call_llm` built on `LLMAdapter.agenerate`: same caching,
+    coalescing, fallbacks and hedging (the losing attempt is cancelled),
+    without a thread per call.
+    """
+    llm = _adapter(provider, model, api_key, host)
+    session = _session(llm, session_id, followup_prompt)
+    caches = _CacheLookup(llm, prompt, kwargs, False if session else use_cache, cache_scope, semantic_text)
+    # Semantic lookups embed the prompt, which may be a blocking HTTP call
+    cached = await asyncio.to_thread(caches.get) if caches.semantic is not None else caches.get()
+    if cached is not None:
+        return cached
+
+    async def generate() -> str:
+        targets = _targets(llm)
+        start = time.perf_counter()
+        winner, response = await arun_hedged(
+            [partial(_aattempt, target, llm, prompt, {**kwargs, **session}) for target in targets],
+            None if session else _hedge_delay(llm, targets),
+        )
+        if _same_model(targets[winner], llm):
+            caches.store(response, time.perf_counter() - start)
+        return response
+
+    if caches.enabled and settings.get_llm_single_flight():
+        return await async_flights.do(caches.key, generate)
+    return await generate()
+
+
+async def astream_llm(
+    prompt: str,
+    provider: str = None,
+    model: str = None,
+    api_key: str = None,
+    host: str = None,
+    use_cache: Optional[bool] = None,
+    cache_scope: Optional[str] = None,
+    semantic_text: Optional[str] = None,
+    session_id: Optional[str] = None,
+    followup_prompt: Optional[str] = None,
+    **kwargs
+) -> AsyncIterator[str]:
+    """
+    Async variant of `stream_llm` built on `LLMAdapter.astream`.
+    """
+    llm = _adapter(provider, model, api_key, host)
+    session = _session(llm, session_id, followup_prompt)
+    caches = _CacheLookup(llm, prompt, kwargs, False if session else use_cache, cache_scope, semantic_text)
+    cached = await asyncio.to_thread(caches.get) if caches.semantic is not None else caches.get()
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    async with get_limiter(llm.provider, llm.host).aslot(observe=False):
+        start = time.perf_counter()
+        with timed_llm(llm.provider, llm.model):
+            async for chunk in llm.astream(prompt, **kwargs, **session):
+                chunks.append(chunk)
+                yield chunk
+    caches.store("".join(chunks), time.perf_counter() - start)
@@ -0,0 +1,207 @@
+# rasa/llm/response_cache.py
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from rasa.utils.trace import record_cache_event
+
+
+def cache_key(provider: str, model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Stable key for one generation: provider, model, prompt and every
+    generation parameter (temperature, max_tokens, options, ...).
+    """
+    payload = {
+        "provider": (provider or "").lower(),
+        "model": model or "",
+        "prompt": prompt,
+        "params": params or {},
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _CacheEntry:
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: str, expires_at: Optional[float]):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class _SqliteTier:
+    """
+    Persistent second tier: one table, one row per key. Shared across threads
+    behind a lock; WAL mode keeps readers from blocking the writer.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str, now: float) -> Optional[_CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return _CacheEntry(row[0], row[1])
+
+    def set(self, key: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, entry.value, entry.expires_at),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Exact-match cache of LLM responses.
+
+    The first tier is an in-memory LRU of at most `max_size` entries. When
+    `sqlite_path` is set, every response is also written to SQLite, so the
+    cache survives restarts; a memory miss that hits SQLite is promoted back
+    into memory. Entries expire `ttl` seconds after they were stored
+    (`ttl <= 0` keeps them until evicted).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0, sqlite_path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _SqliteTier(sqlite_path) if sqlite_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _event(self, event: str) -> None:
+        record_cache_event("llm_response", event)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at is None or entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._event("hit")
+                    return entry.value
+                del self._entries[key]
+                self.expirations += 1
+                self._event("expiration")
+
+        entry = self._disk.get(key, now) if self._disk is not None else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                self._event("miss")
+                return None
+            self.disk_hits += 1
+            self._event("disk_hit")
+            self._store(key, entry)
+        return entry.value
+
+    def set(self, key: str, value: str) -> None:
+        entry = _CacheEntry(value, time.time() + self.ttl if self.ttl > 0 else None)
+        with self._lock:
+            self._store(key, entry)
+        if self._disk is not None:
+            self._disk.set(key, entry)
+
+    def _store(self, key: str, entry: _CacheEntry) -> None:
+        # Caller holds the lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            self._event("eviction")
+
+    def clear(self) -> None:
+        """Drop every entry, including the persistent tier."""
+        with self._lock:
+            self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+        if self._disk is not None:
+            stats["disk_size"] = len(self._disk)
+            stats["disk_path"] = self._disk.path
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide ResponseCache, configured from settings on first use.
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                from rasa.config import settings
+                _default_cache = ResponseCache(
+                    max_size=settings.get_llm_cache_size(),
+                    ttl=settings.get_llm_cache_ttl(),
+                    sqlite_path=settings.get_llm_cache_path() or None,
+                )
+    return _default_cache
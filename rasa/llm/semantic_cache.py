@@ -0,0 +1,162 @@
+# rasa/llm/semantic_cache.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from rasa.memory.vector_memory import VectorMemory
+from rasa.utils.trace import record_cache_event, record_latency_saved
+
+logger = logging.getLogger(__name__)
+
+
+class _Answer:
+    __slots__ = ("prompt", "response", "latency_s")
+
+    def __init__(self, prompt: str, response: str, latency_s: float):
+        self.prompt = prompt
+        self.response = response
+        self.latency_s = latency_s
+
+
+class SemanticCache:
+    """
+    Answers near-duplicate prompts with an earlier response.
+
+    Each scope (persona / memory scope / model and parameters) has its own
+    VectorMemory of past prompt embeddings. A lookup returns the stored
+    response of the most similar past prompt when its cosine similarity is at
+    least `threshold`. Hit rate and the generation time saved are tracked.
+
+    At most `max_scopes` scopes are kept, least recently used evicted first,
+    and a scope is dropped `ttl` seconds after its first answer (`ttl <= 0`
+    keeps it until evicted), so no answer is replayed for longer than that.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        threshold: float = 0.92,
+        max_entries: int = 2048,
+        max_scopes: int = 1024,
+        ttl: float = 3600.0,
+    ):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_scopes = max_scopes
+        self.ttl = ttl
+        self._indexes: "OrderedDict[str, Tuple[VectorMemory, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.saved_s = 0.0
+
+    def embed(self, prompt: str) -> np.ndarray:
+        return self.embedder.embed([prompt])[0]
+
+    def _index(self, scope: str, dim: Optional[int] = None) -> Optional[VectorMemory]:
+        """The live index of `scope`, created with `dim` if given."""
+        now = time.time()
+        with self._lock:
+            entry = self._indexes.get(scope)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                del self._indexes[scope]
+                record_cache_event("llm_semantic", "expiration")
+                entry = None
+            if entry is None:
+                if dim is None:
+                    return None
+                entry = self._indexes[scope] = (
+                    VectorMemory(dim, max_size=self.max_entries),
+                    now + self.ttl if self.ttl > 0 else None,
+                )
+                while len(self._indexes) > self.max_scopes:
+                    self._indexes.popitem(last=False)
+                    record_cache_event("llm_semantic", "eviction")
+            self._indexes.move_to_end(scope)
+            return entry[0]
+
+    def lookup(self, scope: str, vector: np.ndarray) -> Optional[Tuple[float, str]]:
+        """(similarity, response) of the closest past prompt above the threshold."""
+        start = time.perf_counter()
+        index = self._index(scope)
+        matches = index.search(vector, k=1) if index is not None else []
+        with self._lock:
+            self.lookups += 1
+            if not matches or matches[0][0] < self.threshold:
+                record_cache_event("llm_semantic", "miss")
+                return None
+            score, answer = matches[0]
+            self.hits += 1
+            saved = max(0.0, answer.latency_s - (time.perf_counter() - start))
+            self.saved_s += saved
+        record_cache_event("llm_semantic", "hit")
+        record_latency_saved("llm_semantic", saved)
+        return score, answer.response
+
+    def store(self, scope: str, vector: np.ndarray, prompt: str, response: str, latency_s: float) -> None:
+        self._index(scope, len(vector)).add(vector, _Answer(prompt, response, latency_s))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "scopes": len(self._indexes),
+                "entries": sum(len(index) for index, _ in self._indexes.values()),
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "latency_saved_s": round(self.saved_s, 3),
+            }
+
+
+_default_cache: Optional[SemanticCache] = None
+_refused: Optional[str] = None  # Why the configured semantic cache was turned off
+_default_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Return the process-wide SemanticCache, configured from settings on first use.
+
+    Refuses the hash embedder: it measures shared spelling, not meaning, and
+    scores opposite questions ("buy" / "sell", "spring" / "winter") above any
+    usable threshold, so it would answer them with each other's responses.
+    Then the semantic cache stays off (None), a warning is logged once and
+    `semantic_cache_refusal()` says why.
+    """
+    global _default_cache, _refused
+    if _default_cache is None and _refused is None:
+        with _default_lock:
+            if _default_cache is None and _refused is None:
+                from rasa.config import settings
+                from rasa.memory.vector_memory import get_embedder
+                if settings.get_embedder().lower() == "hash":
+                    _refused = (
+                        "The semantic cache needs a model embedder (EMBEDDER=ollama); "
+                        "the hash embedder matches unrelated prompts that share words"
+                    )
+                    logger.warning(f"{_refused}. SEMANTIC_CACHE_ENABLED is ignored.")
+                else:
+                    _default_cache = SemanticCache(
+                        get_embedder(),
+                        threshold=settings.get_semantic_cache_threshold(),
+                        max_entries=settings.get_semantic_cache_size(),
+                        max_scopes=settings.get_semantic_cache_scopes(),
+                        ttl=settings.get_semantic_cache_ttl(),
+                    )
+    return _default_cache
+
+
+def semantic_cache_refusal() -> Optional[str]:
+    """Why the semantic cache was turned off despite SEMANTIC_CACHE_ENABLED, if it was."""
+    return _refused
@@ -0,0 +1,92 @@
+# rasa/llm/session_context.py
+
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+class SessionTurn:
+    """What the backend returned after a session's latest turn."""
+
+    __slots__ = ("context", "host", "expires_at")
+
+    def __init__(self, context: array, host: Optional[str], expires_at: Optional[float]):
+        self.context = context
+        self.host = host
+        self.expires_at = expires_at
+
+
+class SessionContexts:
+    """
+    Per-session conversation state kept by an LLMAdapter: the `context`
+    tokens Ollama returns after each turn, and the host that produced them.
+    Sending them back with the next turn lets the backend continue the
+    conversation without re-prefilling it, and routing to the same host lets
+    it reuse the model's cached state.
+
+    An LRU of at most `max_sessions` entries; a session expires `ttl`
+    seconds after its last turn (`ttl <= 0` keeps it until evicted). Tokens
+    are stored as a compact int array, a long conversation is tens of
+    thousands of them.
+    """
+
+    def __init__(self, max_sessions: int = 1024, ttl: float = 1800.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._turns: "OrderedDict[str, SessionTurn]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id: str) -> Optional[SessionTurn]:
+        with self._lock:
+            turn = self._turns.get(session_id)
+            if turn is None:
+                self.misses += 1
+                return None
+            if turn.expires_at is not None and turn.expires_at <= time.time():
+                del self._turns[session_id]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._turns.move_to_end(session_id)
+            self.hits += 1
+            return turn
+
+    def put(self, session_id: str, context: Iterable[int], host: Optional[str] = None) -> None:
+        turn = SessionTurn(array("i", context), host, time.time() + self.ttl if self.ttl > 0 else None)
+        with self._lock:
+            self._turns[session_id] = turn
+            self._turns.move_to_end(session_id)
+            while len(self._turns) > self.max_sessions:
+                self._turns.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session, e.g. when the user starts over."""
+        with self._lock:
+            self._turns.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._turns),
+                "max_sessions": self.max_sessions,
+                "ttl": self.ttl,
+                "tokens": sum(len(t.context) for t in self._turns.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._turns)
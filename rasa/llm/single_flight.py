@@ -0,0 +1,110 @@
+# rasa/llm/single_flight.py
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from rasa.core.deadline import check_deadline, current_deadline
+from rasa.utils.trace import record_coalesced
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical work across threads.
+
+    The first caller of `do(key, fn)` runs `fn`; callers arriving with the
+    same key while it is in flight block until it finishes and receive the
+    same result, or the same exception. Nothing is remembered afterwards:
+    the next call with that key runs `fn` again. A waiting caller gives up
+    with DeadlineExceeded when its own request deadline passes.
+    """
+
+    def __init__(self, name: str = "llm"):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            record_coalesced(self.name, "sync")
+            deadline = current_deadline()
+            while not call.done.wait(None if deadline is None else max(0.0, deadline.remaining())):
+                check_deadline()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight.
+
+    The work runs in its own task that every caller awaits through
+    `asyncio.shield`, so one caller being cancelled does not cancel the
+    generation for the others; it is only cancelled once every caller is gone.
+    """
+
+    def __init__(self, name: str = "llm"):
+        self.name = name
+        # Keyed per event loop: a task can only be awaited from its own loop
+        self._calls: Dict[Tuple[int, Hashable], Tuple[asyncio.Task, list]] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        entry = self._calls.get(loop_key)
+        if entry is None:
+            task = asyncio.ensure_future(fn())
+            entry = self._calls[loop_key] = (task, [0])
+            task.add_done_callback(lambda _: self._calls.pop(loop_key, None))
+        else:
+            self.coalesced += 1
+            record_coalesced(self.name, "async")
+
+        task, waiters = entry
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and waiters[0] == 1:
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+
+    def in_flight(self) -> int:
+        return len(self._calls)
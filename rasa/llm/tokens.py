@@ -0,0 +1,86 @@
+# rasa/llm/tokens.py
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from rasa.utils.trace import record_tokens
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Fast local token estimate for when the provider reports no usage:
+    about four characters per token for English text with common tokenizers.
+    """
+    return (len(text) + 3) // 4 if text else 0
+
+
+class TokenUsage:
+    """Prompt and completion tokens of the LLM calls made within one `track_usage()` block."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.estimated = False  # True if any count came from `estimate_tokens`
+        self._lock = threading.Lock()  # Hedged attempts may report from several threads
+
+    def add(self, prompt_tokens: int, completion_tokens: int, estimated: bool) -> None:
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.calls += 1
+            self.estimated = self.estimated or estimated
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt": self.prompt_tokens,
+            "completion": self.completion_tokens,
+            "total": self.prompt_tokens + self.completion_tokens,
+            "calls": self.calls,
+            "estimated": self.estimated,
+        }
+
+
+_usage: ContextVar[Optional[TokenUsage]] = ContextVar("rasa_token_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[TokenUsage]:
+    """
+    Collect the token usage of every LLM call made inside the block,
+    including calls running in worker threads or tasks started from it.
+    """
+    usage = TokenUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def record_usage(
+    provider: str,
+    model: str,
+    prompt: str,
+    completion: str,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+) -> None:
+    """
+    Account for one finished LLM call: counts reported by the provider are
+    used as is, missing ones are estimated from the text. Exported as
+    `rasa_llm_tokens_total` and added to the enclosing `track_usage()`.
+    """
+    estimated = prompt_tokens is None or completion_tokens is None
+    if prompt_tokens is None:
+        prompt_tokens = estimate_tokens(prompt)
+    if completion_tokens is None:
+        completion_tokens = estimate_tokens(completion)
+    source = "estimated" if estimated else "reported"
+    record_tokens(provider, model, "prompt", prompt_tokens, source)
+    record_tokens(provider, model, "completion", completion_tokens, source)
+    usage = _usage.get()
+    if usage is not None:
+        usage.add(prompt_tokens, completion_tokens, estimated)
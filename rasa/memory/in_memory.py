@@ -1 +1,177 @@
+# rasa/memory/in_memory.py
 # In-Memory Store
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from rasa.utils.trace import record_cache_event
+
+# Rough per-entry cost besides the encoded record: the entry object, the key
+# string and the OrderedDict slot. Only used for the `max_bytes` bound.
+ENTRY_OVERHEAD = 200
+
+
+class _SessionEntry:
+    __slots__ = ("data", "expires_at")
+
+    def __init__(self, data: bytes, expires_at: Optional[float]):
+        self.data = data
+        self.expires_at = expires_at
+
+
+class SessionStore:
+    """
+    Bounded in-process store of per-session memory records.
+
+    Records are JSON-serializable dicts stored encoded, one per key (e.g.
+    "travel/user/alice"), so every `get` returns a private copy and the
+    store knows the exact size of what it holds. It keeps at most
+    `max_entries` records and about `max_bytes` bytes (records plus
+    ENTRY_OVERHEAD each), evicting the least recently used first. Records
+    expire `ttl` seconds after they were last written (`ttl <= 0` keeps them
+    until evicted). Lookups and writes are O(1).
+    """
+
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 256 * 1024 * 1024, ttl: float = 86400.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _event(self, event: str) -> None:
+        record_cache_event("session_memory", event)
+
+    @staticmethod
+    def _size(key: str, entry: _SessionEntry) -> int:
+        return len(key) + len(entry.data) + ENTRY_OVERHEAD
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+                self._drop(key)
+                self.expirations += 1
+                self._event("expiration")
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self._event("miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._event("hit")
+            data = entry.data
+        return json.loads(data)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        data = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+        entry = _SessionEntry(data, time.time() + self.ttl if self.ttl > 0 else None)
+        if self._size(key, entry) > self.max_bytes:
+            raise ValueError(f"Session record '{key}' is {len(data)} bytes, over the store's {self.max_bytes} byte bound")
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += self._size(key, entry)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+                self._event("eviction")
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """The records found for `keys`; missing and expired keys are left out."""
+        found = {}
+        for key in keys:
+            record = self.get(key)
+            if record is not None:
+                found[key] = record
+        return found
+
+    def put_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        for key, record in records.items():
+            self.put(key, record)
+
+    # In-process lookups never block, so the async variants run inline
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return self.get_many(keys)
+
+    async def aput_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        self.put_many(records)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        # Caller holds the lock
+        self._bytes -= self._size(key, self._entries.pop(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_store: Optional[SessionStore] = None
+_default_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Return the process-wide SessionStore, configured from settings on first use.
+    """
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                from rasa.config import settings
+                _default_store = SessionStore(
+                    max_entries=settings.get_memory_session_max_entries(),
+                    max_bytes=settings.get_memory_session_max_bytes(),
+                    ttl=settings.get_memory_session_ttl(),
+                )
+    return _default_store
+
+
+def get_memory_backend():
+    """
+    The memory backend selected by MEMORY_BACKEND: "memory" (default, this
+    process's SessionStore) or "redis" (RedisMemory at DEFAULT_DB_URL,
+    shared by every worker).
+    """
+    from rasa.config import settings
+    kind = settings.get_memory_backend().lower()
+    if kind == "redis":
+        from rasa.memory.redis_memory import get_redis_memory
+        return get_redis_memory()
+    if kind == "memory":
+        return get_session_store()
+    raise ValueError(f"Unsupported memory backend: {kind}")
@@ -1 +1,110 @@
+# rasa/memory/redis_memory.py
 # Redis Memory Adapter
+
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+import ormsgpack
+
+
+class RedisMemory:
+    """
+    Memory records in Redis, shared by every worker and process.
+
+    Same interface as the in-process SessionStore's `get_many` / `put_many`:
+    the Runner fetches every record a request needs in one pipelined round
+    trip before the run and writes the turn back in one pipeline after it.
+    Records are msgpack-encoded and expire `ttl` seconds after their last
+    write (`ttl <= 0` keeps them); bound the total size with Redis's own
+    `maxmemory` policy.
+
+    Clients share one connection pool per URL. The async variants run the
+    same pipelines on a worker thread, so the event loop never blocks on
+    Redis and async callers use the same pool. There are more worker threads
+    than connections: a call finding the pool empty waits up to
+    `pool_timeout` seconds for a connection rather than failing at once.
+    """
+
+    def __init__(self, client: Any, ttl: float = 86400.0, prefix: str = "rasa:memory:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.round_trips = 0
+
+    @classmethod
+    def from_url(cls, url: str, pool_size: int = 16, pool_timeout: float = 5.0, **kwargs) -> "RedisMemory":
+        import redis
+        return cls(redis.Redis(connection_pool=_pool(url, pool_size, pool_timeout)), **kwargs)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """The records found for `keys`; missing and expired keys are left out."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(self.prefix + key)
+        values = pipe.execute()
+        self.round_trips += 1
+        return {key: ormsgpack.unpackb(value) for key, value in zip(keys, values) if value is not None}
+
+    def put_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        if not records:
+            return
+        expire = int(self.ttl) if self.ttl > 0 else None
+        pipe = self.client.pipeline(transaction=False)
+        for key, record in records.items():
+            pipe.set(self.prefix + key, ormsgpack.packb(record, option=ormsgpack.OPT_NON_STR_KEYS), ex=expire)
+        pipe.execute()
+        self.round_trips += 1
+
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_many, list(keys))
+
+    async def aput_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self.put_many, records)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        """Delete every record under this store's prefix."""
+        keys = list(self.client.scan_iter(match=self.prefix + "*", count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "ttl": self.ttl, "prefix": self.prefix, "round_trips": self.round_trips}
+
+
+_pools: Dict[str, Any] = {}
+_default_memory: Optional[RedisMemory] = None
+_default_lock = threading.Lock()
+
+
+def _pool(url: str, pool_size: int, timeout: float):
+    import redis
+    with _default_lock:
+        if url not in _pools:
+            _pools[url] = redis.BlockingConnectionPool.from_url(url, max_connections=pool_size, timeout=timeout)
+        return _pools[url]
+
+
+def get_redis_memory() -> RedisMemory:
+    """
+    Return the process-wide RedisMemory at DEFAULT_DB_URL, configured from settings on first use.
+    """
+    global _default_memory
+    if _default_memory is None:
+        from rasa.config import settings
+        memory = RedisMemory.from_url(
+            settings.get_default_db_url(),
+            pool_size=settings.get_memory_redis_pool_size(),
+            pool_timeout=settings.get_memory_redis_pool_timeout(),
+            ttl=settings.get_memory_session_ttl(),
+        )
+        with _default_lock:
+            if _default_memory is None:
+                _default_memory = memory
+    return _default_memory
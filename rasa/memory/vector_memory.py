@@ -1 +1,558 @@
+# rasa/memory/vector_memory.py
 # Vector DB Memory
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: the single-writer lock is not enforced
+    fcntl = None
+
+_WORD = re.compile(r"\w+")
+
+
+class HashEmbedder:
+    """
+    Dependency-free text embedder using the hashing trick.
+
+    Words and character trigrams are hashed into `dim` signed buckets and the
+    vector is L2-normalized, so the cosine similarity of two texts reflects
+    their shared vocabulary and spelling. Good enough to recognize rephrasings
+    and typos of the same prompt; use a model embedder for real semantics.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        features = list(words)
+        for word in words:
+            padded = f" {word} "
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                out[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        return _normalize(out)
+
+
+class OllamaEmbedder:
+    """
+    Embeds through Ollama's `/api/embed`, reusing the pooled LLM adapter session.
+    """
+
+    def __init__(self, model: str, host: str):
+        from rasa.llm.llm_adapter import get_adapter
+        self.model = model
+        self.adapter = get_adapter("ollama", model, host=host)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        with self.adapter.hosts.route() as host:
+            resp = self.adapter.session.post(
+                f"{host}/api/embed", json={"model": self.model, "input": list(texts)}, timeout=self.adapter.timeout
+            )
+            resp.raise_for_status()
+        return _normalize(np.asarray(resp.json()["embeddings"], dtype=np.float32))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorMemory:
+    """
+    In-process vector index with exact cosine search.
+
+    Vectors are stored normalized in one contiguous float32 matrix that grows
+    by doubling up to `max_size` rows; after that the oldest entry is
+    overwritten. Each vector carries an arbitrary payload.
+    """
+
+    def __init__(self, dim: int, max_size: int = 10_000):
+        self.dim = dim
+        self.max_size = max_size
+        self._vectors = np.zeros((min(64, max_size), dim), dtype=np.float32)
+        self._payloads: List[Any] = []
+        self._next = 0  # Slot written by the next add once the index is full
+        self._lock = threading.Lock()
+
+    def add(self, vector: np.ndarray, payload: Any) -> None:
+        vector = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, self.dim))[0]
+        with self._lock:
+            size = len(self._payloads)
+            if size < self.max_size:
+                if size == len(self._vectors):
+                    grown = np.zeros((min(size * 2, self.max_size), self.dim), dtype=np.float32)
+                    grown[:size] = self._vectors
+                    self._vectors = grown
+                self._vectors[size] = vector
+                self._payloads.append(payload)
+            else:
+                self._vectors[self._next] = vector
+                self._payloads[self._next] = payload
+                self._next = (self._next + 1) % self.max_size
+
+    def search(self, vector: np.ndarray, k: int = 1) -> List[Tuple[float, Any]]:
+        """Top-k (cosine similarity, payload) pairs, best first."""
+        query = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, self.dim))[0]
+        with self._lock:
+            size = len(self._payloads)
+            if size == 0:
+                return []
+            scores = self._vectors[:size] @ query
+            k = min(k, size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self._payloads[i]) for i in top]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._payloads.clear()
+            self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+def _owner_id(owner: Optional[str]) -> int:
+    """Stable int64 id of an owner (a memory key); 0 means "no owner"."""
+    if owner is None:
+        return 0
+    return int.from_bytes(hashlib.blake2b(owner.encode("utf-8"), digest_size=8).digest(), "little", signed=True) or 1
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    cells = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        cells[start:start + chunk] = np.argmax(np.asarray(vectors[start:start + chunk]) @ centroids.T, axis=1)
+    return cells
+
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int = 8, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: `k` unit centroids of the (normalized) `vectors`."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iterations):
+        cells = _nearest(vectors, centroids)
+        order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=k)
+        filled = np.flatnonzero(counts)
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[order], np.concatenate(([0], np.cumsum(counts[filled])[:-1])))
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index over unit vectors. k-means splits the rows into
+    `len(centroids)` cells; a query scores the centroids and only the rows of
+    its `nprobe` closest cells are searched. `order` lists the rows cell by
+    cell and `offsets[c]:offsets[c + 1]` is cell `c`'s part of it.
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @classmethod
+    def from_cells(cls, centroids: np.ndarray, cells: np.ndarray) -> "IVFIndex":
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(cells, minlength=len(centroids)))
+        return cls(centroids, np.argsort(cells, kind="stable").astype(np.int64), offsets)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        nprobe = min(nprobe, len(self.centroids))
+        cells = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in cells])
+
+
+class _Column:
+    """
+    One append-only column of LocalVectorStore. In memory it grows by
+    doubling; with a `path` new rows are appended to a raw file, which is
+    memory-mapped read-only, so processes share its pages.
+    """
+
+    def __init__(self, dtype, width: int = 0, path: Optional[Path] = None, size: int = 0):
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.path = path
+        self.size = size
+        self._buffer = np.zeros((0, width) if width else 0, dtype=self.dtype)
+        if path is not None:
+            self._map()
+
+    def _map(self) -> None:
+        shape = (self.size, self.width) if self.width else (self.size,)
+        if self.size and self.path.exists():
+            self._buffer = np.memmap(self.path, dtype=self.dtype, mode="r", shape=shape)
+        else:
+            self._buffer = np.zeros(shape, dtype=self.dtype)
+
+    def append(self, rows: np.ndarray) -> None:
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        if self.path is not None:
+            with open(self.path, "r+b" if self.path.exists() else "wb") as f:
+                f.seek(self.size * self.dtype.itemsize * max(self.width, 1))
+                f.write(rows.tobytes())
+            self.size += len(rows)
+            self._map()
+            return
+        needed = self.size + len(rows)
+        if needed > len(self._buffer):
+            grown = np.zeros((max(needed, 2 * len(self._buffer), 64),) + self._buffer.shape[1:], dtype=self.dtype)
+            grown[:self.size] = self._buffer[:self.size]
+            self._buffer = grown
+        self._buffer[self.size:needed] = rows
+        self.size = needed
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._buffer[:self.size]
+
+
+def _lock_writer(path: Path):
+    """Take the exclusive writer lock of a store directory; held until the returned file is closed."""
+    lock = open(path / "writer.lock", "a+")
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            raise RuntimeError(
+                f"Long-term store {path} is already open for writing by another process; "
+                "run one worker, give each worker its own LONG_TERM_PATH, or open it read_only"
+            )
+    return lock
+
+
+class LocalVectorStore:
+    """
+    Built-in long-term vector store: unit float32 vectors, each with an
+    owner (e.g. a memory key) and a JSON payload.
+
+    Search is exact, one matrix-vector product, until the store holds
+    `ivf_threshold` rows; from then on an IVFIndex narrows unscoped searches
+    to `nprobe` cells. Searches scoped to an owner read only that owner's
+    rows (found by binary search over the rows sorted by owner), falling
+    back to the IVF cells when the owner alone has more than `ivf_threshold`.
+
+    New rows are buffered and merged every `flush_every` adds, at most
+    `flush_interval` seconds after the first buffered one, and on `flush()`
+    or `close()`. With a `path`, columns are appended to raw files that are
+    memory-mapped read-only, and the derived indexes are rewritten under a
+    new generation named in `meta.json`; readers opening the store map only
+    the rows `meta.json` lists, so a store opens instantly and its pages are
+    shared by every worker.
+
+    One process writes to a path: it holds `writer.lock`, and a second
+    writer fails when it opens the store. `read_only` stores take no lock
+    and pick up the writer's new generations as `meta.json` changes.
+    Without a path the store keeps at most `max_rows` rows (0: no bound),
+    dropping the oldest.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dim: Optional[int] = None,
+        ivf_threshold: int = 20_000,
+        nprobe: int = 8,
+        flush_every: int = 256,
+        flush_interval: float = 5.0,
+        max_rows: int = 0,
+        read_only: bool = False,
+    ):
+        self.path = Path(path) if path else None
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[np.ndarray, int, bytes]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._writer_lock = None
+        self._meta: Dict[str, Any] = {"rows": 0, "payload_bytes": 0, "generation": 0, "trained_rows": 0}
+        self._meta_mtime = 0
+        self._by_owner = np.zeros(0, dtype=np.int64)  # Row ids sorted by owner
+        self._owner_keys = np.zeros(0, dtype=np.int64)  # Their owners, for binary search
+        self._ivf: Optional[IVFIndex] = None
+        self._columns: Optional[Dict[str, _Column]] = None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if not read_only:
+                self._writer_lock = _lock_writer(self.path)
+            meta = self._read_meta()
+            if meta is not None:
+                self._meta, self.dim = meta, meta["dim"]
+        if self.dim is not None:
+            self._open()
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        """`meta.json`, if it changed since last read and names a new generation."""
+        meta_path = self.path / "meta.json"
+        try:
+            mtime = meta_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime == self._meta_mtime:
+            return None
+        self._meta_mtime = mtime
+        meta = json.loads(meta_path.read_text())
+        return meta if meta["generation"] != self._meta["generation"] else None
+
+    def _refresh(self) -> None:
+        # Caller holds the lock. The writer may unlink a generation between
+        # our reading meta.json and mapping its files: read meta.json again.
+        for _ in range(3):
+            meta = self._read_meta()
+            if meta is None:
+                return
+            previous, self._meta, self.dim = self._meta, meta, meta["dim"]
+            try:
+                self._ivf = None
+                self._open()
+                return
+            except FileNotFoundError:
+                self._meta, self._meta_mtime = previous, 0
+
+    def _file(self, name: str) -> Optional[Path]:
+        return self.path / name if self.path is not None else None
+
+    def _open(self) -> None:
+        rows = self._meta["rows"]
+        self._columns = {
+            "vectors": _Column(np.float32, self.dim, self._file("vectors.f32"), rows),
+            "owners": _Column(np.int64, 0, self._file("owners.i64"), rows),
+            "cells": _Column(np.int32, 0, self._file(self._meta.get("cells", "cells.i32")), rows if self._meta.get("nlist") else 0),
+            "offsets": _Column(np.int64, 0, self._file("offsets.i64"), rows),  # End of each payload
+            "payloads": _Column(np.uint8, 0, self._file("payloads.bin"), self._meta["payload_bytes"]),
+        }
+        if self.path is not None and rows:
+            generation = self._meta["generation"]
+            self._by_owner = np.load(self.path / f"by_owner-{generation}.npy", mmap_mode="r")
+            self._owner_keys = np.load(self.path / f"owner_keys-{generation}.npy", mmap_mode="r")
+            if self._meta.get("nlist"):
+                centroids = np.load(self.path / f"centroids-{generation}.npy", mmap_mode="r")
+                self._ivf = IVFIndex.from_cells(np.asarray(centroids), self._columns["cells"].values)
+
+    def add(self, vector: np.ndarray, payload: Any, owner: Optional[str] = None) -> None:
+        if self.read_only:
+            raise RuntimeError(f"Long-term store {self.path} is open read-only")
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if self.dim is None:
+                self.dim = len(vector)
+                self._open()
+            vector = _normalize(vector.reshape(1, self.dim))[0]
+            data = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+            self._pending.append((vector, _owner_id(owner), data))
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Merge buffered rows into the columns and rebuild the indexes (and persist them, with a `path`)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            columns = self._columns
+            ends = self._meta["payload_bytes"] + np.cumsum([len(data) for _, _, data in pending])
+            columns["vectors"].append(np.stack([vector for vector, _, _ in pending]))
+            columns["owners"].append(np.array([owner for _, owner, _ in pending], dtype=np.int64))
+            columns["offsets"].append(ends)
+            columns["payloads"].append(np.frombuffer(b"".join(data for _, _, data in pending), dtype=np.uint8))
+            rows = columns["vectors"].size
+            self._meta.update(dim=self.dim, rows=rows, payload_bytes=int(ends[-1]), generation=self._meta["generation"] + 1)
+            if self.path is None and self.max_rows and rows > self.max_rows:
+                self._trim(rows - self.max_rows)
+                rows = self.max_rows
+            self._index(rows)
+            if self.path is not None:
+                self._persist()
+
+    def close(self) -> None:
+        """Flush buffered rows and release the writer lock."""
+        with self._lock:
+            self.flush()
+            if self._writer_lock is not None:
+                self._writer_lock.close()
+                self._writer_lock = None
+
+    def _trim(self, drop: int) -> None:
+        # Caller holds the lock. Drop the oldest rows of an in-memory store;
+        # O(rows), like the owner sort every flush already does.
+        columns = self._columns
+        start = int(columns["offsets"].values[drop - 1])
+        kept = {
+            "vectors": columns["vectors"].values[drop:],
+            "owners": columns["owners"].values[drop:],
+            "cells": columns["cells"].values[drop:],
+            "offsets": columns["offsets"].values[drop:] - start,
+            "payloads": columns["payloads"].values[start:],
+        }
+        for name, values in kept.items():
+            column = _Column(columns[name].dtype, columns[name].width)
+            column.append(values)
+            columns[name] = column
+        self._meta.update(rows=columns["vectors"].size, payload_bytes=self._meta["payload_bytes"] - start)
+
+    def _index(self, rows: int) -> None:
+        # Caller holds the lock
+        owners = self._columns["owners"].values
+        self._by_owner = np.argsort(owners, kind="stable").astype(np.int64)
+        self._owner_keys = np.asarray(owners[self._by_owner])
+        if rows < self.ivf_threshold and not self._meta.get("nlist"):
+            return  # Once built, the IVF index is kept up to date whatever the threshold
+        vectors = self._columns["vectors"].values
+        cells = self._columns["cells"]
+        if rows >= 2 * self._meta["trained_rows"]:
+            # Retrain as the store doubles; otherwise only the new rows are assigned to cells
+            nlist = int(min(4096, max(16, np.sqrt(rows)), rows))
+            sample = np.random.default_rng(rows).choice(rows, min(rows, 64 * nlist), replace=False)
+            centroids = _kmeans(np.asarray(vectors[np.sort(sample)]), nlist)
+            # New centroids, new cells file: readers of the previous generation keep theirs
+            name = f"cells-{self._meta['generation']}.i32"
+            cells = self._columns["cells"] = _Column(np.int32, 0, self._file(name))
+            self._meta.update(nlist=nlist, trained_rows=rows, cells=name)
+        else:
+            centroids = self._ivf.centroids
+        cells.append(_nearest(vectors[cells.size:], centroids))
+        self._ivf = IVFIndex.from_cells(np.asarray(centroids), cells.values)
+
+    def _persist(self) -> None:
+        # Caller holds the lock. Columns are already appended; write the derived indexes, then switch meta.json.
+        generation = self._meta["generation"]
+        np.save(self.path / f"by_owner-{generation}.npy", self._by_owner)
+        np.save(self.path / f"owner_keys-{generation}.npy", self._owner_keys)
+        if self._ivf is not None:
+            np.save(self.path / f"centroids-{generation}.npy", np.asarray(self._ivf.centroids))
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(self._meta))
+        os.replace(tmp, self.path / "meta.json")
+        current = {f"{name}-{generation}.npy" for name in ("by_owner", "owner_keys", "centroids")}
+        current.add(self._meta.get("cells", ""))
+        for old in [*self.path.glob("*-*.npy"), *self.path.glob("cells-*.i32")]:
+            if old.name not in current:
+                old.unlink()  # Readers that still map it keep their pages
+        self._by_owner = np.load(self.path / f"by_owner-{generation}.npy", mmap_mode="r")
+        self._owner_keys = np.load(self.path / f"owner_keys-{generation}.npy", mmap_mode="r")
+
+    def _payload(self, row: int) -> Any:
+        offsets = self._columns["offsets"].values
+        start = int(offsets[row - 1]) if row else 0
+        return json.loads(self._columns["payloads"].values[start:int(offsets[row])].tobytes())
+
+    def _rows(self, query: np.ndarray, owner: Optional[str]) -> Optional[np.ndarray]:
+        # None means every row, scored in place without gathering a copy
+        if owner is None:
+            return self._ivf.candidates(query, self.nprobe) if self._ivf is not None else None
+        owner_id = _owner_id(owner)
+        lo, hi = np.searchsorted(self._owner_keys, owner_id, "left"), np.searchsorted(self._owner_keys, owner_id, "right")
+        if hi - lo > self.ivf_threshold and self._ivf is not None:
+            candidates = self._ivf.candidates(query, self.nprobe)
+            return candidates[self._columns["owners"].values[candidates] == owner_id]
+        return np.asarray(self._by_owner[lo:hi])
+
+    def search(self, vector: np.ndarray, k: int = 1, owner: Optional[str] = None) -> List[Tuple[float, Any]]:
+        """Top-k (cosine similarity, payload) pairs, best first; only `owner`'s rows when it is given."""
+        with self._lock:
+            if self.read_only and self.path is not None:
+                self._refresh()
+            if self.dim is None:
+                return []
+            query = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, self.dim))[0]
+            hits: List[Tuple[float, Any]] = []
+            if self._columns["vectors"].size:
+                rows = self._rows(query, owner)
+                vectors = self._columns["vectors"].values
+                scores = np.asarray(vectors if rows is None else vectors[rows]) @ query
+                if len(scores):
+                    top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+                    hits = [(float(scores[i]), self._payload(int(i if rows is None else rows[i]))) for i in top]
+            owner_id = _owner_id(owner)
+            for pending, pending_owner, data in self._pending:
+                if owner is None or pending_owner == owner_id:
+                    hits.append((float(pending @ query), json.loads(data)))
+            return sorted(hits, key=lambda hit: -hit[0])[:k]
+
+    def __len__(self) -> int:
+        return (self._columns["vectors"].size if self._columns else 0) + len(self._pending)
+
+
+_default_store: Optional[LocalVectorStore] = None
+_default_lock = threading.Lock()
+
+
+def get_long_term_store() -> Optional[LocalVectorStore]:
+    """
+    The process-wide long-term store when DEFAULT_VECTOR_DB_TYPE is "local"
+    (persisted under LONG_TERM_PATH, if set), else None: no other vector DB
+    has a built-in client. It is closed, flushing buffered rows, at exit.
+    """
+    global _default_store
+    from rasa.config import settings
+    if settings.get_default_vector_db_type().lower() != "local":
+        return None
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = LocalVectorStore(
+                    path=settings.get_long_term_path() or None,
+                    ivf_threshold=settings.get_long_term_ivf_threshold(),
+                    nprobe=settings.get_long_term_nprobe(),
+                    flush_interval=settings.get_long_term_flush_interval(),
+                    max_rows=settings.get_long_term_max_rows(),
+                )
+                atexit.register(_default_store.close)
+    return _default_store
+
+
+def close_long_term_store() -> None:
+    """Flush and close the process-wide long-term store, if one was opened."""
+    if _default_store is not None:
+        _default_store.close()
+
+
+def get_embedder(kind: Optional[str] = None):
+    """
+    Embedder selected by settings: "hash" (default, local) or "ollama".
+    """
+    from rasa.config import settings
+    kind = (kind or settings.get_embedder()).lower()
+    if kind == "ollama":
+        return OllamaEmbedder(settings.get_embedding_model(), settings.get_llm_host())
+    if kind == "hash":
+        return HashEmbedder()
+    raise ValueError(f"Unsupported embedder: {kind}")
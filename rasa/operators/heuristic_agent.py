@@ -1,7 +1,11 @@
 # rasa/operators/heuristic_agent.py
 
-from rasa.core.state import State
+import time
+from typing import Dict, Optional
+from rasa.core.state import State, apply_delta
 from rasa.core.agent import OperatorAgent
+from rasa.core.streaming import ChunkPipeline, ChunkProcessor, may_write_output
+from rasa.utils.trace import timed_node
 import importlib
 
 
@@ -9,24 +13,64 @@ class HeuristicAgent(OperatorAgent):
     """
     A general-purpose heuristic agent that delegates to domain-specific heuristics
     defined in the persona under 'domain_operators'.
+
+    The Runner resolves those operators once and binds them as a dispatch table.
+    An unbound agent (e.g. used standalone) falls back to importing the names
+    listed in `metadata.domain_operators` on each call.
     """
 
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.domain_operators: Optional[Dict[str, OperatorAgent]] = None
+
+    def bind_domain_operators(self, domain_operators: Dict[str, OperatorAgent]) -> None:
+        self.domain_operators = domain_operators
+
+    @property
+    def pure(self) -> bool:
+        # Only as pure as the bound domain operators it delegates to
+        return bool(self.domain_operators) and all(op.pure for op in self.domain_operators.values())
+
+    def chunk_processor(self, state: State) -> Optional[ChunkProcessor]:
+        # Streamable only if every bound operator that may touch `output` is
+        if self.domain_operators is None:
+            return None
+        processors = []
+        for agent in self.domain_operators.values():
+            if not may_write_output(agent):
+                continue
+            processor = agent.chunk_processor(state)
+            if processor is None:
+                return None
+            processors.append(processor)
+        return ChunkPipeline(processors)
+
     def run(self, state: State) -> State:
         self.log("Running general heuristic agent")
 
-        domain_operators = state.get("metadata", {}).get("domain_operators", [])
+        if self.domain_operators is not None:
+            dispatch = self.domain_operators
+        else:
+            names = state.get("metadata", {}).get("domain_operators", [])
+            dispatch = {op_name: self._resolve(op_name) for op_name in names}
 
-        for op_name in domain_operators:
-            try:
-                # Try dynamic import from sys.path (e.g., apps/<domain>/operators)
-                mod = importlib.import_module(op_name)
-                class_name = "".join(word.capitalize() for word in op_name.split("_"))
-                cls = getattr(mod, class_name)
-                agent = cls(name=op_name)
+        # Each operator sees the previous ones' updates; only the combined delta is returned
+        delta: State = {}
+        for op_name, agent in dispatch.items():
+            start = time.perf_counter()
+            with timed_node(op_name, "domain_operator"):
+                update = agent.run(state)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.log(f"Delegated to domain-specific operator: {op_name} ({elapsed_ms:.2f} ms)")
+            state = apply_delta(state, update)
+            delta = apply_delta(delta, update)
 
-                self.log(f"Delegating to domain-specific operator: {op_name}")
-                state = agent.run(state)
-            except Exception as e:
-                self.log(f"Failed to run domain operator '{op_name}': {e}")
+        return delta
 
-        return state
\ No newline at end of file
+    @staticmethod
+    def _resolve(op_name: str) -> OperatorAgent:
+        # Dynamic import from sys.path (e.g., apps/<domain>/operators)
+        mod = importlib.import_module(op_name)
+        class_name = "".join(word.capitalize() for word in op_name.split("_"))
+        cls = getattr(mod, class_name)
+        return cls(name=op_name)
@@ -10,20 +10,21 @@ class PreferenceAgent(OperatorAgent):
     Injects and validates user preferences into the shared context.
     """
 
+    reads = ("preferences", "context")
+    writes = ("context",)
+    pure = True
+
     def run(self, state: State) -> State:
         self.log("Applying user preferences")
 
         prefs = state.get("preferences", {})
-        context = state.get("context", {})
 
         if not prefs:
             self.log("No preferences found in state.")
-            return {**state, "context": {**context}}
+            return {}
 
         validated = self._validate_preferences(prefs)
-        context["preferences"] = validated
-
-        return {**state, "context": context}
+        return {"context": {"preferences": validated}}
 
     def _validate_preferences(self, prefs: dict) -> dict:
         """
@@ -1,8 +1,13 @@
 # rasa/operators/tone_formatter.py (updated)
 
 import re
+from typing import Optional
 from rasa.core.state import State
 from rasa.core.agent import OperatorAgent
+from rasa.core.streaming import ChunkProcessor, SentenceProcessor
+
+FRIENDLY_TAIL = " 😊 Let me know if you need more ideas."
+POETIC_TAIL = "\n\nLet your soul drift with the wind of new places."
 
 
 class ToneFormatter(OperatorAgent):
@@ -10,6 +15,10 @@ class ToneFormatter(OperatorAgent):
     Adjusts the tone of the output using rule-based text transformations.
     """
 
+    reads = ("output", "metadata")
+    writes = ("output",)
+    pure = True
+
     def run(self, state: State) -> State:
         self.log("Formatting output tone")
 
@@ -17,10 +26,21 @@ class ToneFormatter(OperatorAgent):
         tone = state.get("metadata", {}).get("tone", "default")
 
         if not output:
-            return {**state, "output": "No response to format."}
+            return {"output": "No response to format."}
 
         formatted = self._apply_tone(output, tone)
-        return {**state, "output": formatted}
+        return {"output": formatted}
+
+    def chunk_processor(self, state: State) -> Optional[ChunkProcessor]:
+        tone = state.get("metadata", {}).get("tone", "default")
+        if tone == "friendly":
+            return SentenceProcessor(self._soften, tail=FRIENDLY_TAIL, strip=True)
+        elif tone == "poetic":
+            return SentenceProcessor(self._poeticize, tail=POETIC_TAIL)
+        elif tone == "concise":
+            return _FirstSentence()
+        else:
+            return ChunkProcessor()
 
     def _apply_tone(self, text: str, tone: str) -> str:
         if tone == "friendly":
@@ -32,19 +52,47 @@ class ToneFormatter(OperatorAgent):
         else:
             return text
 
-    def _make_friendly(self, text: str) -> str:
-        softened = text.replace("You should", "You might want to") \
-                       .replace("must", "could") \
-                       .replace("!", ".")
-        return softened.strip() + " 😊 Let me know if you need more ideas."
+    @staticmethod
+    def _soften(text: str) -> str:
+        return text.replace("You should", "You might want to") \
+                   .replace("must", "could") \
+                   .replace("!", ".")
 
-    def _make_poetic(self, text: str) -> str:
+    @staticmethod
+    def _poeticize(text: str) -> str:
         poeticized = text
         poeticized = poeticized.replace("visit", "wander through")
         poeticized = poeticized.replace("peaceful", "serene")
         poeticized = poeticized.replace("city", "landscape")
-        poeticized += "\n\nLet your soul drift with the wind of new places."
         return poeticized
 
+    def _make_friendly(self, text: str) -> str:
+        return self._soften(text).strip() + FRIENDLY_TAIL
+
+    def _make_poetic(self, text: str) -> str:
+        return self._poeticize(text) + POETIC_TAIL
+
     def _make_concise(self, text: str) -> str:
         return text.strip().split(".")[0].strip() + "."
+
+
+class _FirstSentence(ChunkProcessor):
+    """Streaming `_make_concise`: emits the first sentence and drops the rest."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        if self._done:
+            return ""
+        self._buffer += chunk
+        if "." not in self._buffer:
+            return ""
+        self._done = True
+        return self._buffer.split(".")[0].strip() + "."
+
+    def flush(self) -> str:
+        if self._done:
+            return ""
+        return self._buffer.strip() + "."
@@ -0,0 +1,144 @@
+# rasa/prompts/assembler.py
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+
+from rasa.core.persona import Persona
+from rasa.core.state import State
+from rasa.config import settings
+from rasa.frames.short_term_frame import RECENT_PREFIX
+from rasa.llm.tokens import estimate_tokens
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+DEFAULT_TEMPLATE = "stateless_prompt.j2"
+ELLIPSIS = " [...] "
+
+
+class PromptAssembler:
+    """
+    Builds a persona's LLM prompts from Jinja templates compiled once, when
+    the Runner is built.
+
+    A prompt is laid out most-stable-first so backends that reuse a prompt
+    prefix (Ollama `context` / `keep_alive`, provider prompt caching) skip
+    re-processing it:
+
+    1. the persona prefix, `styles/<prompt_style>.j2`, rendered once with the
+       persona and identical for every request (none for the "default" style);
+    2. the body, `metadata.prompt_template` or `stateless_prompt.j2`,
+       rendered per request with the preferences, memory and context, and the
+       user input last.
+
+    Templates are looked up in the persona's own `prompts/` folder first, so
+    an app can override any of them, then in rasa/prompts/templates.
+
+    `metadata.token_budget` (or LLM_TOKEN_BUDGET) caps the estimated prompt
+    tokens; `fit()` trims a State to it before the prompt is rendered.
+    """
+
+    def __init__(self, persona: Persona):
+        search_path: List[str] = []
+        if persona.base_dir:
+            app_prompts = Path(persona.base_dir) / "prompts"
+            if app_prompts.is_dir():
+                search_path.append(str(app_prompts))
+        search_path.append(str(TEMPLATES_DIR))
+        self.env = Environment(
+            loader=FileSystemLoader(search_path),
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        self.persona_vars = {
+            "name": persona.name,
+            "description": persona.description,
+            "prompt_style": persona.prompt_style,
+            "memory_scope": persona.memory_scope,
+            "metadata": persona.metadata,
+        }
+        self.body = self.env.get_template(persona.metadata.get("prompt_template", DEFAULT_TEMPLATE))
+        try:
+            style = self.env.get_template(f"styles/{persona.prompt_style}.j2")
+        except TemplateNotFound:
+            self.prefix = ""
+        else:
+            self.prefix = style.render(persona=self.persona_vars).strip()
+        self.budget = int(persona.metadata.get("token_budget") or settings.get_llm_token_budget())
+        # Render once with an empty State so broken templates fail the build, not a request
+        floor = estimate_tokens(self.render({}))
+        if self.budget and floor >= self.budget:
+            raise ValueError(f"token_budget {self.budget} leaves no room next to the {floor}-token persona prompt")
+
+    def _variables(self, state: State, user_input: str) -> Dict[str, Any]:
+        return {
+            "persona": self.persona_vars,
+            "input": user_input,
+            "preferences": state.get("preferences") or {},
+            "memory": state.get("memory") or {},
+            "context": state.get("context") or {},
+            "metadata": state.get("metadata") or {},
+        }
+
+    def _body(self, state: State) -> str:
+        return self.body.render(self._variables(state, state.get("user_input", "").strip())).strip()
+
+    def render(self, state: State) -> str:
+        """The full prompt for this State: persona prefix, then the body."""
+        body = self._body(state)
+        return f"{self.prefix}\n\n{body}" if self.prefix else body
+
+    def fit(self, state: State) -> Tuple[State, Dict[str, Any]]:
+        """
+        Trim `state` until its prompt fits the token budget: memory entries
+        first, then preferences (largest first), then the middle of the user
+        input. Returns the State to render and what was trimmed ({} when the
+        prompt already fit).
+        """
+        if not self.budget:
+            return state, {}
+        excess = estimate_tokens(self.render(state)) - self.budget
+        trimmed: Dict[str, Any] = {}
+        for key in ("memory", "preferences"):
+            if excess <= 0:
+                break
+            entries = dict(state.get(key) or {})
+            dropped = []
+            for name in sorted(entries, key=lambda k: len(str(entries[k])), reverse=True):
+                if excess <= 0:
+                    break
+                excess -= estimate_tokens(f"- {name}: {entries.pop(name)}\n")
+                dropped.append(name)
+            if dropped:
+                state = {**state, key: entries}
+                trimmed[key] = dropped
+                excess = estimate_tokens(self.render(state)) - self.budget
+        if excess > 0:
+            # Keep both ends of the input: the question is usually at the start or the end
+            user_input = state.get("user_input", "").strip()
+            keep = max(0, len(user_input) - 4 * excess - len(ELLIPSIS))
+            head = keep // 2
+            state = {**state, "user_input": user_input[:head] + ELLIPSIS + user_input[len(user_input) - (keep - head):]}
+            trimmed["input_chars"] = len(user_input) - keep
+        return state, trimmed
+
+    def render_turn(self, state: State) -> str:
+        """
+        The body alone, for a follow-up turn of a session whose backend
+        context already holds the persona prefix and the earlier turns. The
+        recalled recent turns (ShortTermFrame) are left out for the same
+        reason.
+        """
+        memory = {k: v for k, v in (state.get("memory") or {}).items() if not k.startswith(RECENT_PREFIX)}
+        return self._body({**state, "memory": memory})
+
+    def context_key(self, state: State) -> str:
+        """
+        Digest of everything in the prompt except the user input. Prompts with
+        the same key differ only in the question, which is what the semantic
+        cache should compare.
+        """
+        rendered = self.body.render(self._variables(state, ""))
+        return hashlib.sha256(f"{self.prefix}\x00{rendered}".encode("utf-8")).hexdigest()[:16]
@@ -1 +1,155 @@
 # Trace helpers
+# rasa/utils/trace.py
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+# Latency buckets (seconds) spanning sub-millisecond Python nodes to multi-second LLM calls
+_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+NODE_LATENCY = Histogram(
+    "rasa_node_latency_seconds",
+    "Time spent in a frame, operator or domain operator",
+    ["persona", "node", "kind"],
+    buckets=_BUCKETS,
+)
+NODE_ERRORS = Counter(
+    "rasa_node_errors_total",
+    "Exceptions raised by a frame, operator or domain operator",
+    ["persona", "node", "kind"],
+)
+LLM_LATENCY = Histogram(
+    "rasa_llm_latency_seconds",
+    "Time spent waiting on an LLM generation",
+    ["persona", "provider", "model"],
+    buckets=_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "rasa_llm_errors_total",
+    "Failed LLM generations",
+    ["persona", "provider", "model"],
+)
+CACHE_EVENTS = Counter(
+    "rasa_cache_events_total",
+    "Cache lookups and maintenance events (hit, miss, eviction, ...)",
+    ["cache", "event"],
+)
+LATENCY_SAVED = Counter(
+    "rasa_llm_latency_saved_seconds_total",
+    "LLM generation time avoided by answering from a cache",
+    ["cache"],
+)
+COALESCED = Counter(
+    "rasa_llm_coalesced_requests_total",
+    "Calls that joined an identical in-flight LLM generation instead of starting one",
+    ["flight", "path"],
+)
+LLM_REJECTED = Counter(
+    "rasa_llm_rejected_total",
+    "LLM calls refused by the backend limiter (rate, queue_full, timeout)",
+    ["backend", "reason"],
+)
+LLM_QUEUE_WAIT = Histogram(
+    "rasa_llm_queue_wait_seconds",
+    "Time an LLM call waited for a limiter slot before being sent",
+    ["backend"],
+    buckets=_BUCKETS,
+)
+LLM_HEDGES = Counter(
+    "rasa_llm_hedges_total",
+    "Hedged and fallback LLM attempts (hedge, fallback, secondary_won)",
+    ["event"],
+)
+LLM_TOKENS = Counter(
+    "rasa_llm_tokens_total",
+    "Prompt and completion tokens of LLM calls, as reported by the provider or estimated",
+    ["persona", "provider", "model", "kind", "source"],
+)
+
+_persona: ContextVar[str] = ContextVar("rasa_persona", default="unknown")
+
+
+def current_persona() -> str:
+    return _persona.get()
+
+
+@contextmanager
+def persona_scope(name: str) -> Iterator[None]:
+    """
+    Label every node and LLM metric recorded inside the block with `name`.
+    The label follows the context into LangGraph worker threads and tasks.
+    """
+    token = _persona.set(name or "unknown")
+    try:
+        yield
+    finally:
+        _persona.reset(token)
+
+
+@contextmanager
+def timed_node(node: str, kind: str) -> Iterator[None]:
+    """
+    Record latency (and errors) of one agent execution.
+    `kind` is "frame", "operator" or "domain_operator".
+    """
+    persona = _persona.get()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        # Cancellation (a client disconnecting) and GeneratorExit are not node errors
+        NODE_ERRORS.labels(persona, node, kind).inc()
+        raise
+    finally:
+        NODE_LATENCY.labels(persona, node, kind).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def timed_llm(provider: str, model: str) -> Iterator[None]:
+    """Record latency (and errors) of one LLM call."""
+    persona = _persona.get()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LLM_ERRORS.labels(persona, provider or "", model or "").inc()
+        raise
+    finally:
+        LLM_LATENCY.labels(persona, provider or "", model or "").observe(time.perf_counter() - start)
+
+
+def record_cache_event(cache: str, event: str, count: int = 1) -> None:
+    CACHE_EVENTS.labels(cache, event).inc(count)
+
+
+def record_latency_saved(cache: str, seconds: float) -> None:
+    LATENCY_SAVED.labels(cache).inc(seconds)
+
+
+def record_coalesced(flight: str, path: str) -> None:
+    COALESCED.labels(flight, path).inc()
+
+
+def record_llm_rejected(backend: str, reason: str) -> None:
+    LLM_REJECTED.labels(backend, reason).inc()
+
+
+def record_queue_wait(backend: str, seconds: float) -> None:
+    LLM_QUEUE_WAIT.labels(backend).observe(seconds)
+
+
+def record_hedge(event: str) -> None:
+    LLM_HEDGES.labels(event).inc()
+
+
+def record_tokens(provider: str, model: str, kind: str, count: int, source: str) -> None:
+    LLM_TOKENS.labels(_persona.get(), provider or "", model or "", kind, source).inc(count)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus text exposition of all registered metrics and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,24 @@
+# tests/conftest.py
+
+import pytest
+
+from rasa.llm import semantic_cache
+from rasa.llm.response_cache import get_response_cache
+from rasa.memory.in_memory import get_session_store
+
+
+def _caches():
+    caches = [get_response_cache(), get_session_store()]
+    if semantic_cache._default_cache is not None:
+        caches.append(semantic_cache._default_cache)
+    return caches
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_cache():
+    # Every test starts cold so a cached answer never hides a faked (or failing) LLM
+    for cache in _caches():
+        cache.clear()
+    yield
+    for cache in _caches():
+        cache.clear()
@@ -0,0 +1,58 @@
+# tests/test_api_batch.py
+
+from fastapi.testclient import TestClient
+
+from rasa.api.main import app
+from rasa.frames import stateless_frame
+
+client = TestClient(app)
+
+
+def test_output_batch_preserves_order_and_errors(monkeypatch):
+    async def fake_acall_llm(prompt, **kwargs):
+        return f"FAKE: {prompt}"
+
+    monkeypatch.setattr(stateless_frame, "call_llm", lambda prompt, **kwargs: f"FAKE: {prompt}")
+    monkeypatch.setattr(stateless_frame, "acall_llm", fake_acall_llm)
+
+    payload = {
+        "persona": "travel_concierge",
+        "max_concurrency": 2,
+        "items": [
+            {"input": "Plan a trip", "preferences": {"region": "asia", "travel_style": "adventurous"}},
+            {"input": "   "},
+            {"input": "Plan another trip", "preferences": {"region": "americas", "travel_style": "relaxed"}},
+        ],
+    }
+    response = client.post("/output/batch", json=payload)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert "Pokhara" in results[0]["output"]
+    assert results[1]["error"] and results[1]["output"] is None
+    assert "Santa Fe" in results[2]["output"]
+
+
+def test_output_batch_unknown_persona():
+    response = client.post("/output/batch", json={"persona": "nonexistent_persona", "items": [{"input": "hi"}]})
+    assert response.status_code == 404
+
+
+def test_run_batch_returns_exceptions_in_place(monkeypatch):
+    from rasa.core.persona import Persona
+    from rasa.core.runner import Runner
+
+    def flaky_llm(prompt, **kwargs):
+        if prompt == "boom":
+            raise RuntimeError("LLM failure")
+        return prompt.upper()
+
+    monkeypatch.setattr(stateless_frame, "call_llm", flaky_llm)
+    runner = Runner(Persona.build({"name": "batch", "frames": ["stateless_frame"], "operators": []}))
+
+    results = runner.run_batch([{"user_input": "a"}, {"user_input": "boom"}, {"user_input": "c"}], max_concurrency=2)
+
+    assert results[0]["output"] == "A"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2]["output"] == "C"
@@ -44,3 +44,9 @@ def test_output_persona_not_found():
     print("DEBUG: Response JSON:", response.text)
     assert response.status_code == 404
     assert "not found" in response.text.lower()
+
+def test_empty_input_is_rejected_before_the_persona_lookup():
+    for route in ("/output", "/output/json", "/stream"):
+        response = client.post(route, json={"persona": "nonexistent_persona", "input": "  "})
+        assert response.status_code == 400, route
+        assert "input" in response.json()["detail"]
@@ -0,0 +1,138 @@
+# tests/test_deadline.py
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.api import main
+from rasa.core.agent import OperatorAgent
+from rasa.core.deadline import Deadline, DeadlineExceeded
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.frames import stateless_frame
+from rasa.graph.graph_builder import GraphBuilder
+from rasa.llm.limiter import get_limiter, reset_limiters
+from rasa.llm.llm_adapter import close_adapters
+
+TRAVEL = "apps/travel_concierge/persona.yaml"
+
+
+@pytest.fixture
+def slow_ollama(monkeypatch):
+    with FakeOllamaServer(latency_ms=1000) as server:
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        monkeypatch.setenv("LLM_HOST", server.url)
+        close_adapters()
+        reset_limiters()
+        yield server
+        close_adapters()
+        reset_limiters()
+
+
+class Sleepy(OperatorAgent):
+    reads = ("output",)
+    writes = ("output",)
+
+    def run(self, state):
+        time.sleep(0.15)
+        return {"output": "late"}
+
+
+class Never(OperatorAgent):
+    reads = ("output",)
+    writes = ("output",)
+
+    def run(self, state):
+        raise AssertionError("must not start after the deadline")
+
+
+def _state(deadline: float) -> dict:
+    return {"output": "", "metadata": {"deadline": deadline, "deadline_started_at": time.time()}}
+
+
+def test_slow_sync_node_is_named_and_later_nodes_do_not_start():
+    graph = GraphBuilder("p", [("sleepy", Sleepy(name="sleepy")), ("never", Never(name="never"))]).compile()
+    with pytest.raises(DeadlineExceeded) as info:
+        graph.invoke(_state(0.05))
+    assert info.value.node == "sleepy"
+    assert "sleepy" in str(info.value)
+    unlimited = GraphBuilder("p", [("sleepy", Sleepy(name="sleepy"))]).compile()
+    assert unlimited.invoke({"output": ""})["output"] == "late"  # No deadline, no limit
+
+
+def test_runner_cuts_sync_llm_call_short(slow_ollama):
+    runner = Runner(Persona.from_yaml(TRAVEL))
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceeded) as info:
+        runner.run({"user_input": "Plan a trip", "metadata": {"deadline": 0.2, "llm_cache": False}})
+    assert info.value.node == "stateless_frame"
+    assert time.perf_counter() - start < 0.8
+
+
+def test_runner_cancels_async_llm_call(slow_ollama):
+    runner = Runner(Persona.from_yaml(TRAVEL))
+    limiter = get_limiter("ollama", slow_ollama.url)
+
+    async def main_():
+        with pytest.raises(DeadlineExceeded) as info:
+            await runner.arun({"user_input": "Plan a trip", "metadata": {"deadline": 0.2, "llm_cache": False}})
+        return info.value
+
+    start = time.perf_counter()
+    error = asyncio.run(main_())
+    assert error.node == "stateless_frame" and time.perf_counter() - start < 0.8
+    assert limiter.stats()["active"] == 0  # The backend slot was given back
+
+
+def test_persona_deadline_applies_when_the_request_has_none():
+    persona = Persona.from_yaml(TRAVEL)
+    persona.metadata["deadline"] = 5
+    state = Runner(persona)._prepare({"user_input": "hi", "metadata": {}})
+    assert Deadline.of(state).budget == 5.0
+    assert Deadline.of({"metadata": {}}) is None
+
+
+class FakeRequest:
+    """Just enough of starlette's Request: the client disconnects after `after` seconds."""
+
+    def __init__(self, after: float):
+        self.after = after
+
+    async def receive(self):
+        await asyncio.sleep(self.after)
+        return {"type": "http.disconnect"}
+
+
+def test_disconnect_cancels_the_work():
+    cancelled = []
+
+    async def generate():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main_():
+        with pytest.raises(main.ClientDisconnected):
+            await main._unless_disconnected(FakeRequest(0.05), generate())
+        return await main._unless_disconnected(FakeRequest(5), asyncio.sleep(0, result="done"))
+
+    assert asyncio.run(main_()) == "done"
+    assert cancelled == [True]
+
+
+def test_api_reports_the_node_that_ran_out_of_time(monkeypatch):
+    async def slow_acall_llm(prompt, **kwargs):
+        await asyncio.sleep(1)
+        return "too late"
+
+    monkeypatch.setattr(stateless_frame, "acall_llm", slow_acall_llm)
+    response = TestClient(main.app).post(
+        "/output", json={"persona": "travel_concierge", "input": "Plan a trip", "metadata": {"deadline": 0.1}}
+    )
+    assert response.status_code == 504
+    assert "stateless_frame" in response.json()["detail"]
@@ -0,0 +1,89 @@
+# tests/test_graph_builder.py
+
+from rasa.core.agent import OperatorAgent
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.graph.graph_builder import GraphBuilder
+
+
+class Upper(OperatorAgent):
+    reads = ("output",)
+    writes = ("output",)
+    pure = True
+
+    def run(self, state):
+        return {"output": state["output"].upper()}
+
+
+class Exclaim(OperatorAgent):
+    reads = ("output",)
+    writes = ("output",)
+    pure = True
+
+    def run(self, state):
+        return {"output": state["output"] + "!"}
+
+
+class Lookup(OperatorAgent):
+    reads = ("user_input",)
+    writes = ("context",)
+
+    def run(self, state):
+        return {"context": {"looked_up": state["user_input"]}}
+
+
+class Noop(OperatorAgent):
+    reads = ()
+    writes = ()
+    passthrough = True
+
+    def run(self, state):
+        return {}
+
+
+def test_passthrough_agents_are_pruned():
+    builder = GraphBuilder("p", [("noop", Noop(name="noop")), ("upper", Upper(name="upper"))])
+
+    assert builder.plan.pruned == ["noop"]
+    assert [node.name for node in builder.plan.nodes] == ["upper"]
+
+
+def test_pure_chain_is_fused_into_one_node():
+    agents = [("upper", Upper(name="upper")), ("exclaim", Exclaim(name="exclaim"))]
+    builder = GraphBuilder("p", agents)
+
+    assert builder.plan.fused == [["upper", "exclaim"]]
+    result = builder.compile().invoke({"output": "go"})
+    assert result["output"] == "GO!"
+
+
+def test_fusion_keeps_parallel_branches_apart():
+    agents = [
+        ("upper", Upper(name="upper")),
+        ("lookup", Lookup(name="lookup")),
+        ("exclaim", Exclaim(name="exclaim")),
+    ]
+    builder = GraphBuilder("p", agents)
+
+    assert builder.plan.dependencies == {"upper+exclaim": [], "lookup": []}
+    result = builder.compile().invoke({"user_input": "q", "output": "go"})
+    assert result["output"] == "GO!"
+    assert result["context"] == {"looked_up": "q"}
+
+
+def test_unoptimized_plan_keeps_every_agent():
+    agents = [("noop", Noop(name="noop")), ("upper", Upper(name="upper")), ("exclaim", Exclaim(name="exclaim"))]
+    builder = GraphBuilder("p", agents, optimize=False)
+
+    assert builder.plan.pruned == []
+    assert len(builder.plan.nodes) == 3
+
+
+def test_runner_reports_optimized_plan():
+    persona = Persona.from_yaml("apps/travel_concierge/persona.yaml")
+    runner = Runner(persona)
+
+    assert runner.plan.pruned == []  # The memory frames recall into the prompt
+    assert runner.plan.fused == [["preference_agent", "heuristic_agent", "tone_formatter"]]
+    assert runner.dependencies["session_frame"] == runner.dependencies["short_term_frame"] == []
+    assert runner.dependencies["stateless_frame"] == ["session_frame", "short_term_frame"]
@@ -0,0 +1,117 @@
+# tests/test_hedging.py
+
+import asyncio
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.llm import hedging, llm_client
+from rasa.llm.hedging import LatencyTracker, arun_hedged, parse_targets, run_hedged
+
+
+def test_parse_targets():
+    assert parse_targets("ollama:llama3:8b@http://gpu2:11434, openai:gpt-4o-mini") == [
+        ("ollama", "llama3:8b", "http://gpu2:11434"),
+        ("openai", "gpt-4o-mini", None),
+    ]
+    assert parse_targets("") == []
+    with pytest.raises(ValueError):
+        parse_targets("ollama")
+
+
+def test_latency_tracker_percentile_needs_samples():
+    tracker = LatencyTracker(min_samples=10)
+    for ms in range(1, 10):
+        tracker.add(ms / 1000)
+    assert tracker.percentile(95) is None
+    tracker.add(0.010)
+    assert tracker.percentile(50) == pytest.approx(0.006)
+    assert tracker.percentile(95) == pytest.approx(0.010)
+
+
+def test_fallback_chain_on_errors():
+    def broken():
+        raise ConnectionError("primary down")
+
+    assert run_hedged([broken, broken, lambda: "third"], delay=None) == (2, "third")
+    with pytest.raises(ConnectionError):
+        run_hedged([broken], delay=None)
+
+
+def test_hedge_beats_a_slow_primary():
+    def slow():
+        time.sleep(0.3)
+        return "slow"
+
+    start = time.perf_counter()
+    assert run_hedged([slow, lambda: "fast"], delay=0.02) == (1, "fast")
+    assert time.perf_counter() - start < 0.2
+    # A primary answering before the delay is never hedged
+    assert run_hedged([lambda: "quick", slow], delay=0.2) == (0, "quick")
+
+
+def test_async_hedge_cancels_the_loser():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "slow"
+
+    async def fast():
+        await asyncio.sleep(0.01)
+        return "fast"
+
+    async def main():
+        result = await arun_hedged([slow, fast], delay=0.02)
+        await asyncio.sleep(0)  # Let the cancellation land
+        return result
+
+    assert asyncio.run(main()) == (1, "fast")
+    assert cancelled == [True]
+
+
+@pytest.fixture
+def servers():
+    with ExitStack() as stack:
+        slow = stack.enter_context(FakeOllamaServer(latency_ms=400))
+        fast = stack.enter_context(FakeOllamaServer(latency_ms=5))
+        yield slow, fast
+
+
+def test_call_llm_hedges_to_the_fallback(servers, monkeypatch):
+    slow, fast = servers
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_FALLBACKS", f"ollama:llama3@{fast.url}")
+    monkeypatch.setenv("LLM_HEDGE", "true")
+    monkeypatch.setenv("LLM_HEDGE_DELAY", "0.05")
+
+    start = time.perf_counter()
+    answer = llm_client.call_llm("Plan a trip", provider="ollama", model="llama3", host=slow.url)
+    assert answer == "Fake answer to: Plan a trip"
+    assert time.perf_counter() - start < 0.3
+    assert slow.requests == 1 and fast.requests == 1
+
+
+def test_acall_llm_falls_back_on_failure(servers, monkeypatch):
+    slow, fast = servers
+    slow.fail = True
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_FALLBACKS", f"ollama:llama3@{fast.url}")
+
+    answer = asyncio.run(llm_client.acall_llm("Plan a trip", provider="ollama", model="llama3", host=slow.url))
+    assert answer == "Fake answer to: Plan a trip"
+    assert fast.requests == 1
+
+
+def test_attempt_pool_is_sized_from_the_limiter_settings(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "40")
+    monkeypatch.setenv("LLM_QUEUE_SIZE", "10")
+    monkeypatch.setattr(hedging, "_executor", None)
+    assert hedging._get_executor()._max_workers == 100
+    assert run_hedged([lambda: "primary"], delay=0.1) == (0, "primary")
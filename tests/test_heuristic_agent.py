@@ -43,4 +43,32 @@ def test_heuristic_agent_dispatch(monkeypatch):
     }
 
     updated = agent.run(state)
-    assert updated["output"] == "Test destination recommendation"
\ No newline at end of file
+    assert updated["output"] == "Test destination recommendation"
+
+def test_runner_binds_domain_operators_at_build_time():
+    from rasa.core.persona import Persona
+    from rasa.core.runner import Runner
+
+    persona = Persona.from_yaml("apps/economist_advisor/persona.yaml")
+    runner = Runner(persona)
+
+    heuristic = runner.operators["heuristic_agent"]
+    assert list(heuristic.domain_operators) == ["economy_heuristic_agent"]
+    assert heuristic.domain_operators is runner.domain_operators
+
+    state = {"preferences": {"topic": "interest_rates", "focus": "small_business"}, "metadata": {}}
+    assert "borrowing costs" in heuristic.run(state)["output"]
+
+
+def test_runner_fails_fast_on_unknown_domain_operator():
+    from rasa.core.persona import Persona
+    from rasa.core.runner import Runner
+
+    persona = Persona.build({
+        "name": "broken",
+        "frames": ["session_frame"],
+        "operators": ["heuristic_agent"],
+        "domain_operators": ["definitely_missing_operator"],
+    })
+    with pytest.raises(ImportError, match="definitely_missing_operator"):
+        Runner(persona)
@@ -0,0 +1,81 @@
+# tests/test_host_pool.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import pytest
+import requests
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.llm.host_pool import HostPool, parse_hosts
+from rasa.llm.llm_adapter import LLMAdapter
+
+
+@pytest.fixture
+def servers():
+    with ExitStack() as stack:
+        fast = stack.enter_context(FakeOllamaServer(latency_ms=5))
+        slow = stack.enter_context(FakeOllamaServer(latency_ms=60))
+        yield fast, slow
+
+
+def test_parse_hosts_accepts_comma_separated_urls():
+    assert parse_hosts(" http://a:11434/, http://b:11434 ,") == ["http://a:11434", "http://b:11434"]
+    with pytest.raises(ValueError):
+        HostPool("")
+
+
+def test_ewma_routing_prefers_the_faster_host(servers):
+    fast, slow = servers
+    llm = LLMAdapter(provider="ollama", model="llama3", host=f"{fast.url},{slow.url}")
+    for i in range(20):
+        assert llm.generate(f"q{i}") == f"Fake answer to: q{i}"
+    assert slow.requests >= 1  # Tried once to learn its latency
+    assert fast.requests > 3 * slow.requests
+
+
+def test_least_outstanding_spreads_concurrent_requests(servers):
+    fast, slow = servers
+    llm = LLMAdapter(provider="ollama", model="llama3", host=[fast.url, slow.url])
+    llm.hosts.strategy = "least_outstanding"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(llm.generate, [f"q{i}" for i in range(16)]))
+    assert fast.requests + slow.requests == 16
+    assert slow.requests >= 2
+
+
+def test_failing_host_is_ejected_and_probed_back_in(servers):
+    fast, slow = servers
+    llm = LLMAdapter(provider="ollama", model="llama3", host=f"{fast.url},{slow.url}")
+    llm.hosts.strategy = "least_outstanding"
+    llm.hosts.eject_seconds = 0.2
+    slow.fail = True
+
+    errors = 0
+    for i in range(12):
+        try:
+            llm.generate(f"q{i}")
+        except requests.HTTPError:
+            errors += 1
+    assert errors == llm.hosts.eject_after  # Then the failing host is out of rotation
+    assert [h["healthy"] for h in llm.hosts.stats()] == [True, False]
+
+    slow.fail = False
+    time.sleep(0.25)
+    before = slow.requests
+    llm.generate("probe")  # The probe goes to the recovered host
+    assert slow.requests == before + 1
+    assert [h["healthy"] for h in llm.hosts.stats()] == [True, True]
+
+
+def test_client_errors_do_not_eject_a_host():
+    pool = HostPool("http://a:11434,http://b:11434", eject_after=1)
+
+    class NotFound(Exception):
+        response = type("Response", (), {"status_code": 404})()
+
+    with pytest.raises(NotFound):
+        with pool.route():
+            raise NotFound()
+    assert all(h["healthy"] for h in pool.stats())
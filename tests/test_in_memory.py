@@ -0,0 +1,85 @@
+# tests/test_in_memory.py
+
+import time
+
+import pytest
+
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.frames import stateless_frame
+from rasa.memory.in_memory import ENTRY_OVERHEAD, SessionStore
+
+TRAVEL = "apps/travel_concierge/persona.yaml"
+
+
+def test_least_recently_used_record_is_evicted_first():
+    store = SessionStore(max_entries=2)
+    store.put("a", {"turns": 1})
+    store.put("b", {"turns": 2})
+    assert store.get("a") == {"turns": 1}  # "a" is now the most recent
+    store.put("c", {"turns": 3})
+    assert store.get("b") is None and store.get("a") is not None
+    assert store.stats()["evictions"] == 1
+
+
+def test_byte_bound_and_copies():
+    record = {"notes": "x" * 100}
+    size = len("k0") + len('{"notes":""}') + 100 + ENTRY_OVERHEAD
+    store = SessionStore(max_bytes=3 * size)
+    for i in range(5):
+        store.put(f"k{i}", record)
+    assert len(store) == 3 and store.stats()["bytes"] == 3 * size
+    store.get("k4")["notes"] = "changed"
+    assert store.get("k4") == record
+    with pytest.raises(ValueError):
+        store.put("huge", {"notes": "x" * 4 * size})
+    store.delete("k3")
+    assert store.stats()["bytes"] == 2 * size
+
+
+def test_records_expire_after_ttl():
+    store = SessionStore(ttl=0.05)
+    store.put("a", {"turns": 1})
+    time.sleep(0.1)
+    assert store.get("a") is None
+    assert store.stats()["expirations"] == 1 and len(store) == 0
+
+
+def test_runner_recalls_earlier_turns_per_user(monkeypatch):
+    prompts = []
+
+    def fake_llm(prompt, **kwargs):
+        prompts.append(prompt)
+        return f"Answer {len(prompts)}"
+
+    monkeypatch.setattr(stateless_frame, "call_llm", fake_llm)
+    runner = Runner(Persona.from_yaml(TRAVEL))
+    runner.run({"user_input": "Plan a trip to Japan", "preferences": {"budget": 900},
+                "metadata": {"user_id": "alice"}})
+    runner.run({"user_input": "What about May?", "metadata": {"user_id": "alice"}})
+    runner.run({"user_input": "What about May?", "metadata": {"user_id": "bob"}})
+    runner.run({"user_input": "What about May?", "metadata": {}})
+
+    assert "- recent_1: Plan a trip to Japan -> " in prompts[1]
+    assert "- session_preferences: budget: 900" in prompts[1]
+    assert "recent_1" not in prompts[2] and "recent_1" not in prompts[3]  # Other users, anonymous requests
+
+
+def test_streamed_turns_are_remembered(monkeypatch):
+    monkeypatch.setattr(stateless_frame, "stream_llm", lambda prompt, **kwargs: iter(["Go ", "to Kyoto."]))
+    runner = Runner(Persona.from_yaml(TRAVEL))
+    answer = "".join(runner.stream({"user_input": "Where in Japan?", "metadata": {"user_id": "alice"}}))
+    state = runner._recall([runner._prepare({"user_input": "And then?", "metadata": {"user_id": "alice"}})])[0]
+    recalled = runner.frames["short_term_frame"].run(state)["memory"]
+    assert recalled == {"recent_1": f"Where in Japan? -> {answer}"}
+
+
+def test_batch_keeps_every_turn_of_a_user(monkeypatch):
+    monkeypatch.setattr(stateless_frame, "call_llm", lambda prompt, **kwargs: "Answer")
+    runner = Runner(Persona.from_yaml(TRAVEL))
+    runner.run_batch([
+        {"user_input": f"Question {i}", "metadata": {"user_id": "alice"}} for i in range(3)
+    ])
+    state = runner._recall([runner._prepare({"user_input": "And then?", "metadata": {"user_id": "alice"}})])[0]
+    recalled = runner.frames["short_term_frame"].run(state)["memory"]
+    assert [turn.split(" -> ")[0] for turn in recalled.values()] == ["Question 0", "Question 1", "Question 2"]
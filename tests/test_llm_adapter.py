@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.llm.llm_adapter import LLMAdapter, close_adapters, get_adapter
+
+
+@pytest.fixture
+def ollama():
+    with FakeOllamaServer() as server:
+        yield server
+
+
+def test_ollama_generate_against_fake_server(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    assert llm.generate("Plan a trip to Lisbon") == "Fake answer to: Plan a trip to Lisbon"
+    assert ollama.requests == 1
+
+
+def test_ollama_generate_raises_on_server_error(ollama):
+    ollama.fail = True
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    with pytest.raises(requests.HTTPError):
+        llm.generate("Plan a trip to Lisbon")
+
+
+def test_adapter_reuses_connections(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    for _ in range(5):
+        llm.generate("hello")
+    assert ollama.requests == 5
+    assert ollama.connections == 1
+    llm.close()
+
+
+def test_get_adapter_is_keyed_by_provider_host_and_model(ollama):
+    close_adapters()
+    first = get_adapter("ollama", "llama3", host=ollama.url)
+    assert get_adapter("ollama", "llama3", host=ollama.url) is first
+    assert get_adapter("ollama", "mistral", host=ollama.url) is not first
+    assert get_adapter("ollama", "llama3", host="http://other:11434") is not first
+    close_adapters()
+    assert get_adapter("ollama", "llama3", host=ollama.url) is not first
+    close_adapters()
+
+
+def test_adapter_uses_configured_timeouts(monkeypatch):
+    monkeypatch.setenv("LLM_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("LLM_READ_TIMEOUT", "30")
+    monkeypatch.setenv("LLM_POOL_SIZE", "4")
+    llm = LLMAdapter(provider="ollama", model="llama3", host="http://localhost:11434")
+    assert llm.timeout == (1.5, 30.0)
+    assert llm.pool_size == 4
+
+
+def test_ollama_stream_yields_chunks(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    chunks = list(llm.stream("Plan a trip to Lisbon"))
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Fake answer to: Plan a trip to Lisbon"
+
+
+def test_ollama_agenerate_against_fake_server(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+
+    async def main():
+        try:
+            return await llm.agenerate("Plan a trip to Lisbon")
+        finally:
+            await llm.aclose()
+
+    assert asyncio.run(main()) == "Fake answer to: Plan a trip to Lisbon"
+
+
+def test_ollama_agenerate_raises_on_server_error(ollama):
+    ollama.fail = True
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(llm.agenerate("Plan a trip to Lisbon"))
+
+
+def test_agenerate_runs_concurrently_on_one_loop():
+    with FakeOllamaServer(latency_ms=100) as server:
+        llm = LLMAdapter(provider="ollama", model="llama3", host=server.url, pool_size=8)
+
+        async def main():
+            try:
+                return await asyncio.gather(*(llm.agenerate(f"q{i}") for i in range(8)))
+            finally:
+                await llm.aclose()
+
+        start = time.perf_counter()
+        answers = asyncio.run(main())
+        elapsed = time.perf_counter() - start
+
+    assert answers == [f"Fake answer to: q{i}" for i in range(8)]
+    assert server.max_in_flight == 8
+    assert elapsed < 0.5  # Sequentially it would take 0.8s
+
+
+def test_ollama_astream_yields_chunks(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+
+    async def main():
+        return [chunk async for chunk in llm.astream("Plan a trip to Lisbon")]
+
+    chunks = asyncio.run(main())
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Fake answer to: Plan a trip to Lisbon"
+
+
+def test_async_clients_of_other_loops_are_closed(ollama, caplog):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+
+    async def use():
+        await llm.agenerate("hi")
+        return llm.async_http
+
+    # A client of a loop that is still running is closed on that loop
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    live = asyncio.run_coroutine_threadsafe(use(), loop).result()
+    assert asyncio.run(use()) is not live  # A new loop replaces the running loop's client
+    for _ in range(100):
+        if live.is_closed:
+            break
+        time.sleep(0.01)
+    assert live.is_closed
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+    # Clients of closed loops (each asyncio.run) are dropped without warnings
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(use())
+        llm.close()
+    assert not llm._async_clients and not caplog.records
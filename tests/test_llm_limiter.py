@@ -0,0 +1,130 @@
+# tests/test_llm_limiter.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from rasa.api.main import app
+from rasa.frames import stateless_frame
+from rasa.llm import limiter as limiter_module
+from rasa.llm.limiter import LLMLimiter, LLMOverloaded, get_limiter
+
+
+def test_limiter_caps_concurrent_calls():
+    limiter = LLMLimiter("test", max_concurrency=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call(_):
+        with limiter.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(call, range(6)))
+
+    assert peak[0] == 2
+    assert limiter.stats()["active"] == 0
+
+
+def test_full_queue_fails_fast_with_retry_after():
+    limiter = LLMLimiter("test", max_concurrency=1, max_queue=0)
+    limiter.acquire()
+    with pytest.raises(LLMOverloaded) as exc:
+        limiter.acquire()
+    assert exc.value.reason == "queue_full"
+    assert exc.value.status_code == 503
+    assert exc.value.retry_after >= 1
+    limiter.release()
+    limiter.acquire()  # The slot is free again
+    limiter.release()
+
+
+def test_queued_call_times_out():
+    limiter = LLMLimiter("test", max_concurrency=1, queue_timeout=0.05)
+    limiter.acquire()
+    with pytest.raises(LLMOverloaded) as exc:
+        limiter.acquire()
+    assert exc.value.reason == "timeout"
+    assert limiter.stats()["queued"] == 0
+    limiter.release()
+    assert limiter.stats()["active"] == 0
+
+
+def test_rate_limit_rejects_with_429():
+    limiter = LLMLimiter("test", rate=1, burst=1, queue_timeout=0.1)
+    with limiter.slot():
+        pass
+    with pytest.raises(LLMOverloaded) as exc:
+        limiter.acquire()
+    assert exc.value.reason == "rate"
+    assert exc.value.status_code == 429
+
+
+def test_async_waiters_share_slots_and_survive_cancellation():
+    limiter = LLMLimiter("test", max_concurrency=1)
+
+    async def call(results, i):
+        async with limiter.aslot():
+            await asyncio.sleep(0.01)
+            results.append(i)
+
+    async def main():
+        results = []
+        first = asyncio.ensure_future(call(results, 0))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(call(results, 1))
+        rest = [asyncio.ensure_future(call(results, i)) for i in (2, 3)]
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, *rest)
+        return results
+
+    assert asyncio.run(main()) == [0, 2, 3]
+    assert limiter.stats()["active"] == 0 and limiter.stats()["queued"] == 0
+
+
+def test_adaptive_limit_shrinks_on_slow_calls_and_recovers():
+    limiter = LLMLimiter("test", max_concurrency=8, target_latency=1.0)
+    limiter.observe(2.0)
+    assert limiter.limit == 6
+    for _ in range(6):
+        limiter.observe(0.1)
+    assert limiter.limit == 7
+
+
+def test_one_burst_of_slow_calls_shrinks_the_limit_once():
+    limiter = LLMLimiter("test", max_concurrency=16, target_latency=1.0)
+    admitted = time.perf_counter()
+    for _ in range(16):
+        limiter.observe(2.0, admitted)
+    assert limiter.limit == 12
+    limiter.observe(2.0, time.perf_counter())  # Admitted after the decrease: a new signal
+    assert limiter.limit == 9
+
+
+def test_host_pool_limiter_admits_the_limit_per_host(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "4")
+    monkeypatch.setattr(limiter_module, "_limiters", {})
+    assert get_limiter("ollama", "http://a:11434").max_concurrency == 4
+    assert get_limiter("ollama", "http://a:11434,http://b:11434,http://c:11434").max_concurrency == 12
+
+
+def test_api_returns_retry_after_when_overloaded(monkeypatch):
+    async def overloaded(prompt, **kwargs):
+        raise LLMOverloaded("ollama", "queue_full", 2.5)
+
+    monkeypatch.setattr(stateless_frame, "acall_llm", overloaded)
+    client = TestClient(app)
+
+    response = client.post("/output", json={"persona": "economist_advisor", "input": "Explain inflation"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
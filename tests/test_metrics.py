@@ -0,0 +1,87 @@
+# tests/test_metrics.py
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from rasa.api.main import app
+from rasa.llm.llm_adapter import LLMAdapter
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_reports_node_and_llm_latency(monkeypatch):
+    async def fake_agenerate(self, prompt, **kwargs):
+        return f"FAKE: {prompt}"
+
+    monkeypatch.setattr(LLMAdapter, "generate", lambda self, prompt, **kwargs: f"FAKE: {prompt}")
+    monkeypatch.setattr(LLMAdapter, "agenerate", fake_agenerate)
+
+    payload = {"persona": "economist_advisor", "input": "Explain inflation", "preferences": {"topic": "inflation"}}
+    assert client.post("/output", json=payload).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+
+    assert 'rasa_node_latency_seconds_count{kind="frame",node="stateless_frame",persona="pragmatic_economist"}' in body
+    assert 'node="economy_heuristic_agent"' in body and 'kind="domain_operator"' in body
+    assert 'rasa_llm_latency_seconds_count{model=' in body
+    assert 'rasa_cache_events_total{cache="runner",event="miss"}' in body or 'event="hit"' in body
+
+
+def test_node_errors_are_counted(monkeypatch):
+    from rasa.utils import trace
+
+    def boom(self, prompt, **kwargs):
+        raise RuntimeError("backend down")
+
+    async def aboom(self, prompt, **kwargs):
+        boom(self, prompt, **kwargs)
+
+    monkeypatch.setattr(LLMAdapter, "generate", boom)
+    monkeypatch.setattr(LLMAdapter, "agenerate", aboom)
+    before = trace.NODE_ERRORS.labels("pragmatic_economist", "stateless_frame", "frame")._value.get()
+
+    payload = {"persona": "economist_advisor", "input": "Explain inflation"}
+    assert client.post("/output", json=payload).status_code == 500
+
+    after = trace.NODE_ERRORS.labels("pragmatic_economist", "stateless_frame", "frame")._value.get()
+    assert after == before + 1
+
+
+def test_cancelled_runs_are_not_counted_as_errors():
+    from rasa.utils import trace
+
+    before = trace.NODE_ERRORS.labels("unknown", "slow", "frame")._value.get()
+    with pytest.raises(GeneratorExit):
+        with trace.timed_node("slow", "frame"):
+            raise GeneratorExit
+    with pytest.raises(asyncio.CancelledError):
+        with trace.timed_llm("ollama", "llama3"):
+            raise asyncio.CancelledError
+    assert trace.NODE_ERRORS.labels("unknown", "slow", "frame")._value.get() == before
+
+
+def test_streamed_runs_label_every_node_with_the_persona(monkeypatch):
+    from rasa.utils import trace
+
+    async def fake_astream(self, prompt, **kwargs):
+        for chunk in ("Hold ", "for now."):
+            yield chunk
+
+    monkeypatch.setattr(LLMAdapter, "astream", fake_astream)
+    # This persona forwards chunks as they come: the operators run after the first one is sent
+    nodes = {"preference_agent": "operator", "heuristic_agent": "operator", "tone_formatter": "operator",
+             "sector_insights_operator": "domain_operator"}
+    before = {node: trace.NODE_LATENCY.labels("unknown", node, kind)._sum.get() for node, kind in nodes.items()}
+
+    payload = {"persona": "strategic_stock_analyst", "input": "Should I rebalance?"}
+    response = client.post("/stream", json=payload)
+    assert response.status_code == 200 and response.text.startswith("Hold")
+
+    body = client.get("/metrics").text
+    for node, kind in nodes.items():
+        assert f'kind="{kind}",node="{node}",persona="strategic_stock_analyst"' in body
+        assert trace.NODE_LATENCY.labels("unknown", node, kind)._sum.get() == before[node]
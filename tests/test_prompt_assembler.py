@@ -0,0 +1,78 @@
+# tests/test_prompt_assembler.py
+
+import pytest
+import yaml
+from jinja2 import TemplateSyntaxError
+
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.frames import stateless_frame
+from rasa.prompts.assembler import PromptAssembler
+
+TRAVEL = "apps/travel_concierge/persona.yaml"
+
+
+def test_default_style_sends_the_input_unchanged():
+    assembler = PromptAssembler(Persona.build({"name": "plain"}))
+    assert assembler.prefix == ""
+    assert assembler.render({"user_input": "  Plan a trip  "}) == "Plan a trip"
+
+
+def test_stable_prefix_comes_first_and_input_last():
+    assembler = PromptAssembler(Persona.from_yaml(TRAVEL))
+    first = assembler.render({"user_input": "Plan a trip", "preferences": {"region": "asia", "budget": 900}})
+    second = assembler.render({"user_input": "Somewhere warm?"})
+
+    assert first.startswith(assembler.prefix) and second.startswith(assembler.prefix)
+    assert "story-teller" in assembler.prefix and "travel domain" in assembler.prefix
+    assert first.index("- budget: 900") < first.index("- region: asia")  # Sorted, so prompts are stable
+    assert first.endswith("Plan a trip")
+
+
+def test_description_ending_in_a_period_is_not_doubled():
+    assembler = PromptAssembler(Persona.from_yaml("apps/economist_advisor/persona.yaml"))
+    assert "policy impacts." in assembler.prefix and ".." not in assembler.prefix
+    assert "travel advice." in PromptAssembler(Persona.from_yaml(TRAVEL)).prefix
+
+
+def test_context_key_ignores_the_input_only():
+    assembler = PromptAssembler(Persona.from_yaml(TRAVEL))
+    prefs = {"region": "asia"}
+    key = assembler.context_key({"user_input": "a", "preferences": prefs})
+    assert key == assembler.context_key({"user_input": "b", "preferences": prefs})
+    assert key != assembler.context_key({"user_input": "a", "preferences": {"region": "europe"}})
+
+
+def _app(tmp_path, template: str) -> Persona:
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "stateless_prompt.j2").write_text(template)
+    (tmp_path / "persona.yaml").write_text(yaml.safe_dump({"name": "custom", "frames": ["stateless_frame"]}))
+    return Persona.from_yaml(str(tmp_path / "persona.yaml"))
+
+
+def test_app_templates_override_the_defaults(tmp_path):
+    assembler = PromptAssembler(_app(tmp_path, "Q: {{ input }}"))
+    assert assembler.render({"user_input": "why?"}) == "Q: why?"
+
+
+def test_broken_template_fails_at_build(tmp_path):
+    with pytest.raises(TemplateSyntaxError):
+        Runner(_app(tmp_path, "{{ input"))
+
+
+def test_runner_sends_and_records_the_assembled_prompt(monkeypatch):
+    sent = []
+
+    def fake_llm(prompt, **kwargs):
+        sent.append((prompt, kwargs))
+        return "FAKE"
+
+    monkeypatch.setattr(stateless_frame, "call_llm", fake_llm)
+    runner = Runner(Persona.from_yaml("apps/economist_advisor/persona.yaml"))
+    state = runner.run({"user_input": "Explain inflation", "preferences": {"topic": "inflation"}})
+
+    prompt, kwargs = sent[0]
+    assert state["prompt"] == prompt
+    assert prompt.startswith(runner.prompts.prefix) and prompt.endswith("Explain inflation")
+    assert "- topic: inflation" in prompt
+    assert kwargs["semantic_text"] == "Explain inflation"
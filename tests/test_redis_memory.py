@@ -0,0 +1,90 @@
+# tests/test_redis_memory.py
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("ormsgpack")
+
+from rasa.core.persona import Persona  # noqa: E402
+from rasa.core.runner import Runner  # noqa: E402
+from rasa.frames import stateless_frame  # noqa: E402
+from rasa.memory import redis_memory  # noqa: E402
+from rasa.memory.redis_memory import RedisMemory  # noqa: E402
+
+TRAVEL = "apps/travel_concierge/persona.yaml"
+
+
+@pytest.fixture
+def memory():
+    return RedisMemory(fakeredis.FakeRedis(), ttl=60)
+
+
+@pytest.fixture
+def prompts():
+    return []
+
+
+@pytest.fixture
+def runner(memory, prompts, monkeypatch):
+    def fake_llm(prompt, **kwargs):
+        prompts.append(prompt)
+        return "See Kyoto."
+
+    async def fake_acall_llm(prompt, **kwargs):
+        return fake_llm(prompt)
+
+    monkeypatch.setattr(stateless_frame, "call_llm", fake_llm)
+    monkeypatch.setattr(stateless_frame, "acall_llm", fake_acall_llm)
+    runner = Runner(Persona.from_yaml(TRAVEL))
+    runner.memory = memory
+    return runner
+
+
+def test_records_round_trip_in_one_pipeline(memory):
+    memory.put_many({"session:a": {"preferences": {"budget": 900}, "turns": 2}, "short_term:a": {"turns": []}})
+    assert memory.get_many(["session:a", "short_term:a", "session:b"]) == {
+        "session:a": {"preferences": {"budget": 900}, "turns": 2},
+        "short_term:a": {"turns": []},
+    }
+    assert memory.round_trips == 2
+    assert 0 < memory.client.ttl("rasa:memory:session:a") <= 60
+    memory.clear()
+    assert memory.get_many(["session:a"]) == {}
+
+
+def test_each_run_reads_and_writes_in_one_round_trip_each(runner, memory, prompts):
+    runner.run({"user_input": "Plan a trip to Japan", "preferences": {"budget": 900}, "metadata": {"user_id": "alice"}})
+    asyncio.run(runner.arun({"user_input": "What about May?", "metadata": {"user_id": "alice"}}))
+    assert memory.round_trips == 4
+    assert "- recent_1: Plan a trip to Japan -> " in prompts[1]
+    assert "- session_preferences: budget: 900" in prompts[1]
+
+
+def test_batch_shares_the_round_trips(runner, memory):
+    states = [{"user_input": "Plan a trip", "metadata": {"user_id": user}} for user in ("a", "b", "c")]
+    runner.run_batch(states)
+    assert memory.round_trips == 2
+    assert len(memory.get_many([f"short_term:thoughtful_travel_concierge/user/{u}" for u in "abc"])) == 3
+
+
+def test_redis_outage_runs_without_memory(runner):
+    class Down:
+        def pipeline(self, transaction=False):
+            raise ConnectionError("redis is down")
+
+    runner.memory = RedisMemory(Down())
+    state = runner.run({"user_input": "Plan a trip", "metadata": {"user_id": "alice"}})
+    assert state["output"]
+
+
+def test_pooled_clients_wait_for_a_free_connection(monkeypatch):
+    import redis
+
+    monkeypatch.setattr(redis_memory, "_pools", {})
+    memory = RedisMemory.from_url("redis://localhost:6379/0", pool_size=4, pool_timeout=2.5)
+    pool = memory.client.connection_pool
+    # A full pool blocks the calling worker thread instead of raising "Too many connections"
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 4 and pool.timeout == 2.5
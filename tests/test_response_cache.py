@@ -0,0 +1,80 @@
+# tests/test_response_cache.py
+
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.llm import llm_client, response_cache
+from rasa.llm.llm_adapter import LLMAdapter
+from rasa.llm.response_cache import ResponseCache, cache_key
+
+
+def test_cache_key_covers_provider_model_prompt_and_params():
+    base = cache_key("ollama", "llama3", "hi", {"temperature": 0.2})
+    assert base == cache_key("OLLAMA", "llama3", "hi", {"temperature": 0.2})
+    assert base != cache_key("openai", "llama3", "hi", {"temperature": 0.2})
+    assert base != cache_key("ollama", "mistral", "hi", {"temperature": 0.2})
+    assert base != cache_key("ollama", "llama3", "hello", {"temperature": 0.2})
+    assert base != cache_key("ollama", "llama3", "hi", {"temperature": 0.7})
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(max_size=2, ttl=10)
+
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # "b" is now least recently used
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite")
+    first = ResponseCache(max_size=4, ttl=0, sqlite_path=path)
+    first.set("k", "persisted answer")
+    first.close()
+
+    second = ResponseCache(max_size=4, ttl=0, sqlite_path=path)
+    assert second.get("k") == "persisted answer"
+    assert second.disk_hits == 1
+    assert second.get("k") == "persisted answer"  # promoted to memory
+    assert second.hits == 1
+    second.close()
+
+
+def test_call_llm_serves_repeats_from_cache(monkeypatch):
+    calls = []
+
+    def fake_generate(self, prompt, **kwargs):
+        calls.append(prompt)
+        return f"FAKE: {prompt}"
+
+    monkeypatch.setattr(LLMAdapter, "generate", fake_generate)
+    assert llm_client.call_llm("same prompt") == llm_client.call_llm("same prompt")
+    assert len(calls) == 2  # Off by default: sampled answers are not replayed
+
+    calls.clear()
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    assert llm_client.call_llm("same prompt") == "FAKE: same prompt"
+    assert llm_client.call_llm("same prompt") == "FAKE: same prompt"
+    assert llm_client.call_llm("same prompt", temperature=0.1) == "FAKE: same prompt"
+    assert llm_client.call_llm("same prompt", use_cache=False) == "FAKE: same prompt"
+    assert len(calls) == 3
+
+
+def test_persona_can_opt_out(monkeypatch):
+    calls = []
+    monkeypatch.setattr(LLMAdapter, "generate", lambda self, prompt, **kwargs: calls.append(prompt) or "FAKE")
+
+    persona = Persona.from_yaml("apps/economist_advisor/persona.yaml")
+    persona.metadata["llm_cache"] = False
+    runner = Runner(persona)
+    for _ in range(2):
+        runner.run({"user_input": "Explain inflation", "metadata": {"tone": "analytical"}})
+    assert len(calls) == 2
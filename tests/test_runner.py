@@ -53,3 +53,71 @@ def test_runner_executes_flow(dummy_persona):
     assert "context" in final_state
     assert final_state["context"]["location"] == "Test City"
     assert final_state["output"] == "Visit Test City for a fun trip!"
+
+
+def make_persona(frames, operators, **metadata):
+    return Persona(
+        name="schedule_test",
+        description="Scheduling test persona",
+        state_stack=frames,
+        operators=operators,
+        prompt_style="default",
+        memory_scope="user",
+        metadata=metadata
+    )
+
+
+def test_dag_schedule_runs_independent_agents_in_parallel():
+    persona = make_persona(
+        ["session_frame", "short_term_frame"],
+        ["preference_agent", "tone_formatter"],
+    )
+    runner = Runner(persona, schedule="dag", optimize=False)
+
+    assert runner.dependencies["session_frame"] == []
+    assert runner.dependencies["short_term_frame"] == []  # Both write memory, which the reducer merges
+    assert runner.dependencies["preference_agent"] == []
+    assert runner.dependencies["tone_formatter"] == []
+    assert len(runner.critical_path()) == 1
+
+    state = {"user_input": "hi", "output": "Go.", "preferences": {"Region": "Asia"}, "metadata": {"tone": "concise"}}
+    final_state = runner.run(state)
+    assert final_state["context"]["preferences"] == {"region": "asia"}
+    assert final_state["output"] == "Go."
+
+
+def test_dag_schedule_matches_serial_result():
+    state = {"user_input": "hi", "output": "You must go!", "preferences": {"Region": "Asia"}, "metadata": {"tone": "friendly"}}
+    results = []
+    for schedule in ("serial", "dag"):
+        persona = make_persona(["session_frame"], ["preference_agent", "tone_formatter"])
+        results.append(Runner(persona, schedule=schedule).run({**state, "metadata": {**state["metadata"]}}))
+
+    assert results[0]["output"] == results[1]["output"]
+    assert results[0]["context"] == results[1]["context"]
+
+
+def test_undeclared_agents_keep_persona_order(dummy_persona):
+    runner = Runner(dummy_persona, schedule="dag")
+    assert runner.dependencies == {"dummy_frame": [], "dummy_operator": ["dummy_frame"]}
+
+
+def test_unknown_schedule_rejected(dummy_persona):
+    with pytest.raises(ValueError):
+        Runner(dummy_persona, schedule="random")
+
+
+def test_runner_arun_uses_async_agents(dummy_persona):
+    import asyncio
+
+    runner = Runner(dummy_persona)
+    frame = runner.frames["dummy_frame"]
+
+    async def arun(state):
+        await asyncio.sleep(0)
+        return {**state, "context": {"location": "Async City"}}
+
+    frame.arun = arun
+    final_state = asyncio.run(runner.arun({"user_input": "Suggest a travel idea"}))
+
+    assert final_state["output"] == "Visit Async City for a fun trip!"
@@ -0,0 +1,87 @@
+# tests/test_runner_cache.py
+
+import os
+import textwrap
+
+import pytest
+
+from rasa.core.runner_cache import RunnerCache
+
+PERSONA_YAML = textwrap.dedent("""
+    name: cache_test_persona
+    state_stack:
+      - session_frame
+    operators:
+      - preference_agent
+      - tone_formatter
+    metadata:
+      tone: {tone}
+""")
+
+
+def write_persona(path, tone="default"):
+    path.write_text(PERSONA_YAML.format(tone=tone))
+    return str(path)
+
+
+def test_runner_cache_hit_and_miss(tmp_path):
+    cache = RunnerCache(max_size=4)
+    path = write_persona(tmp_path / "persona.yaml")
+
+    first = cache.get(path)
+    second = cache.get(path)
+
+    assert first is second
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_runner_cache_invalidates_on_yaml_change(tmp_path):
+    cache = RunnerCache(max_size=4)
+    path = write_persona(tmp_path / "persona.yaml")
+    first = cache.get(path)
+
+    write_persona(tmp_path / "persona.yaml", tone="friendly")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = cache.get(path)
+
+    assert second is not first
+    assert second.persona.metadata["tone"] == "friendly"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_runner_cache_touch_without_change_is_a_hit(tmp_path):
+    cache = RunnerCache(max_size=4)
+    path = write_persona(tmp_path / "persona.yaml")
+    first = cache.get(path)
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert cache.get(path) is first
+    assert cache.stats()["hits"] == 1
+
+
+def test_runner_cache_evicts_least_recently_used(tmp_path):
+    cache = RunnerCache(max_size=2)
+    paths = []
+    for i in range(3):
+        (tmp_path / str(i)).mkdir()
+        paths.append(write_persona(tmp_path / str(i) / "persona.yaml"))
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])  # paths[1] is now least recently used
+    cache.get(paths[2])
+
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    cache.get(paths[0])
+    assert cache.stats()["hits"] == 2
+
+
+def test_runner_cache_missing_persona(tmp_path):
+    cache = RunnerCache()
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(tmp_path / "missing.yaml"))
@@ -0,0 +1,110 @@
+# tests/test_semantic_cache.py
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from rasa.api.main import app
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.llm import llm_client, semantic_cache
+from rasa.llm.llm_adapter import LLMAdapter
+from rasa.llm.semantic_cache import SemanticCache, get_semantic_cache
+from rasa.memory.vector_memory import HashEmbedder
+
+
+def test_near_duplicate_hits_within_scope_only():
+    cache = SemanticCache(HashEmbedder(), threshold=0.9)
+    vector = cache.embed("Suggest a relaxed spring trip in Europe")
+    cache.store("travel/user/alice", vector, "Suggest a relaxed spring trip in Europe", "Hallstatt", 1.5)
+
+    near = cache.embed("suggest a relaxed spring trip in europe?")
+    assert cache.lookup("travel/user/alice", near) is not None
+    assert cache.lookup("travel/user/bob", near) is None
+    assert cache.lookup("travel/user/alice", cache.embed("What drives inflation?")) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["lookups"] == 3
+    assert stats["latency_saved_s"] > 1.0
+
+
+def test_scopes_are_bounded_and_expire():
+    cache = SemanticCache(HashEmbedder(), threshold=0.9, max_scopes=2, ttl=0.05)
+    vector = cache.embed("Suggest a relaxed spring trip in Europe")
+    for user in ("alice", "bob", "carol"):
+        cache.store(f"travel/user/{user}", vector, "Suggest a relaxed spring trip in Europe", "Hallstatt", 1.5)
+    assert cache.stats()["scopes"] == 2
+    assert cache.lookup("travel/user/alice", vector) is None  # Least recently used, evicted
+    assert cache.lookup("travel/user/carol", vector) is not None
+    assert cache.stats()["scopes"] == 2  # Lookups never create scopes
+
+    time.sleep(0.06)
+    assert cache.lookup("travel/user/carol", vector) is None
+    assert cache.stats()["scopes"] == 1
+
+
+def test_semantic_cache_refuses_the_hash_embedder(monkeypatch, caplog):
+    monkeypatch.setenv("EMBEDDER", "hash")
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "true")
+    monkeypatch.setattr(semantic_cache, "_default_cache", None)
+    monkeypatch.setattr(semantic_cache, "_refused", None)
+
+    async def fake_agenerate(self, prompt, **kwargs):
+        return "FAKE"
+
+    monkeypatch.setattr(LLMAdapter, "agenerate", fake_agenerate)
+    with TestClient(app) as client:  # Checked at startup
+        assert "model embedder" in caplog.text
+        assert get_semantic_cache() is None
+
+        # Requests run without the semantic cache; /status reports why
+        response = client.post("/output", json={"persona": "economist_advisor", "input": "Explain inflation",
+                                                "metadata": {"user_id": "alice"}})
+        assert response.status_code == 200
+        status = client.get("/status").json()["semantic_cache"]
+        assert status["enabled"] is False and "model embedder" in status["error"]
+
+
+@pytest.fixture
+def counting_llm(monkeypatch):
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "true")
+    # The hash embedder stands in for a model embedder on these rephrasings
+    monkeypatch.setattr(semantic_cache, "_default_cache", SemanticCache(HashEmbedder(), threshold=0.92))
+    calls = []
+
+    def fake_generate(self, prompt, **kwargs):
+        calls.append(prompt)
+        return f"FAKE: {prompt}"
+
+    monkeypatch.setattr(LLMAdapter, "generate", fake_generate)
+    return calls
+
+
+def test_call_llm_answers_rephrasing_from_semantic_cache(counting_llm):
+    first = llm_client.call_llm("Suggest a relaxed spring trip in Europe", cache_scope="travel/user/")
+    again = llm_client.call_llm("suggest a relaxed spring trip in Europe!", cache_scope="travel/user/")
+    assert again == first
+    assert len(counting_llm) == 1
+
+    # Without a scope only exact matches are cached
+    llm_client.call_llm("suggest a relaxed spring trip in europe", cache_scope=None)
+    assert len(counting_llm) == 2
+
+
+def test_runner_scopes_semantic_hits_by_user(counting_llm):
+    runner = Runner(Persona.from_yaml("apps/economist_advisor/persona.yaml"))
+
+    def ask(text, user_id):
+        return runner.run({"user_input": text, "metadata": {"tone": "analytical", "user_id": user_id}})
+
+    ask("Explain inflation in simple terms", "alice")
+    ask("Explain inflation in simple terms.", "alice")
+    assert len(counting_llm) == 1
+    ask("explain inflation in simple terms!", "bob")
+    assert len(counting_llm) == 2
+
+    # Anonymous requests never share a semantic scope
+    ask("Explain inflation in simple terms", None)
+    ask("Explain inflation in simple terms.", None)
+    assert len(counting_llm) == 4
@@ -0,0 +1,118 @@
+# tests/test_session_context.py
+
+import asyncio
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.llm.llm_adapter import LLMAdapter, close_adapters
+from rasa.llm.session_context import SessionContexts
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    with FakeOllamaServer() as server:
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        monkeypatch.setenv("LLM_HOST", server.url)
+        close_adapters()
+        yield server
+        close_adapters()
+
+
+def test_store_evicts_least_recent_and_expires_sessions():
+    store = SessionContexts(max_sessions=2, ttl=0.05)
+    store.put("a", [1, 2])
+    store.put("b", [3])
+    assert store.get("a").context.tolist() == [1, 2]
+    store.put("c", [4])  # "b" is now the least recently used
+    assert store.get("b") is None
+    assert store.stats()["evictions"] == 1
+    time.sleep(0.06)
+    assert store.get("a") is None
+    assert store.stats()["expirations"] == 1
+
+
+def test_follow_up_turn_sends_context_instead_of_the_transcript(ollama, monkeypatch):
+    monkeypatch.setenv("LLM_KEEP_ALIVE", "30m")
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    long_prompt = "You are a travel planner. " * 20 + "Where to in May?"
+
+    llm.generate(long_prompt, session_id="s1", followup_prompt="unused on the first turn")
+    assert ollama.last_payload["prompt"] == long_prompt
+    assert "context" not in ollama.last_payload
+    assert ollama.last_payload["keep_alive"] == "30m"
+    first_prefill = ollama.prefill_tokens
+
+    llm.generate(long_prompt + " And June?", session_id="s1", followup_prompt="And June?")
+    assert ollama.last_payload["prompt"] == "And June?"
+    assert len(ollama.last_payload["context"]) > first_prefill
+    assert ollama.prefill_tokens - first_prefill == 2
+
+    llm.generate("Where to in May?")  # No session: nothing stored or sent
+    assert "context" not in ollama.last_payload
+    assert len(llm.sessions) == 1
+
+
+def test_async_stream_records_the_final_context(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+
+    async def turn(prompt):
+        return "".join([chunk async for chunk in llm.astream(prompt, session_id="s1", followup_prompt=prompt)])
+
+    async def main():
+        try:
+            await turn("Plan a trip")
+            await turn("Cheaper?")
+        finally:
+            await llm.aclose()
+
+    asyncio.run(main())
+    assert ollama.last_payload["prompt"] == "Cheaper?"
+    assert ollama.last_payload["context"]
+
+
+def test_session_sticks_to_the_host_holding_its_context():
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FakeOllamaServer()) for _ in range(2)]
+        llm = LLMAdapter(provider="ollama", model="llama3", host=",".join(s.url for s in servers))
+        llm.hosts.strategy = "least_outstanding"
+        for i in range(6):
+            llm.generate(f"turn {i}", session_id="s1")
+        assert sorted(s.requests for s in servers) == [0, 6]
+
+
+def test_runner_continues_the_session_without_caching(ollama):
+    runner = Runner(Persona.from_yaml("apps/travel_concierge/persona.yaml"))
+    metadata = {"session_id": "abc"}
+
+    first = runner.run({"user_input": "Plan a trip", "metadata": metadata})
+    assert ollama.last_payload["prompt"] == first["prompt"]
+    assert ollama.last_payload["prompt"].startswith(runner.prompts.prefix)
+
+    runner.run({"user_input": "Plan a trip", "metadata": metadata})
+    assert ollama.requests == 2  # Same question, but the conversation moved on
+    assert ollama.last_payload["prompt"] == "Plan a trip"
+    assert ollama.last_payload["context"]
+
+
+def test_runner_keys_sessions_by_persona_and_user(ollama):
+    travel = Runner(Persona.from_yaml("apps/travel_concierge/persona.yaml"))
+    economist = Runner(Persona.from_yaml("apps/economist_advisor/persona.yaml"))
+
+    travel.run({"user_input": "Plan a trip", "metadata": {"session_id": "abc", "user_id": "alice"}})
+    # Same session id, but another user or persona: a fresh conversation with the full prompt
+    travel.run({"user_input": "Plan a trip", "metadata": {"session_id": "abc", "user_id": "bob"}})
+    assert ollama.last_payload["prompt"].startswith(travel.prompts.prefix)
+    assert "context" not in ollama.last_payload
+    economist.run({"user_input": "Explain inflation", "metadata": {"session_id": "abc", "user_id": "alice"}})
+    assert ollama.last_payload["prompt"].startswith(economist.prompts.prefix)
+    assert "context" not in ollama.last_payload
+
+    # The session's context already holds the earlier turns: no recalled history is resent
+    travel.run({"user_input": "And June?", "metadata": {"session_id": "abc", "user_id": "alice"}})
+    assert ollama.last_payload["prompt"] == "And June?"
+    assert ollama.last_payload["context"]
@@ -0,0 +1,140 @@
+# tests/test_single_flight.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rasa.core.deadline import DeadlineExceeded, node_deadline
+from rasa.llm import llm_client
+from rasa.llm.llm_adapter import LLMAdapter
+from rasa.llm.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "k", work) for _ in range(5)]
+        while flight.coalesced < 4:
+            time.sleep(0.005)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    flight = SingleFlight("test")
+    release = threading.Event()
+
+    def fail():
+        release.wait(2)
+        raise RuntimeError("backend down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "k", fail) for _ in range(3)]
+        while flight.coalesced < 2:
+            time.sleep(0.005)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="backend down"):
+                future.result()
+
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+
+def test_waiting_caller_gives_up_at_its_own_deadline():
+    flight = SingleFlight("test")
+    release = threading.Event()
+
+    def slow():
+        release.wait(2)
+        return "late"
+
+    def follower():
+        state = {"metadata": {"deadline": 0.05, "deadline_started_at": time.time()}}
+        with node_deadline(state, "stateless_frame"):
+            return flight.do("k", slow)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", slow)
+        while flight.in_flight() < 1:
+            time.sleep(0.005)
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceeded, match="stateless_frame"):
+            pool.submit(follower).result()
+        assert time.perf_counter() - start < 1.0
+        release.set()
+        assert leader.result() == "late"
+
+
+def test_async_single_flight_survives_one_caller_cancelling():
+    flight = AsyncSingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first
+
+    result, first = asyncio.run(main())
+    assert result == "result"
+    assert first.cancelled()
+    assert len(calls) == 1 and flight.coalesced == 1
+
+
+def test_call_llm_coalesces_identical_prompts(monkeypatch):
+    calls = []
+
+    def slow_generate(self, prompt, **kwargs):
+        calls.append(prompt)
+        time.sleep(0.1)
+        return f"FAKE: {prompt}"
+
+    monkeypatch.setattr(LLMAdapter, "generate", slow_generate)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")  # Isolate coalescing from caching
+    before = llm_client.flights.coalesced
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: llm_client.call_llm("popular question"), range(4)))
+
+    assert results == ["FAKE: popular question"] * 4
+    assert len(calls) == 1
+    assert llm_client.flights.coalesced - before == 3
+
+
+def test_acall_llm_coalesces_identical_prompts(monkeypatch):
+    calls = []
+
+    async def slow_agenerate(self, prompt, **kwargs):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return f"FAKE: {prompt}"
+
+    monkeypatch.setattr(LLMAdapter, "agenerate", slow_agenerate)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+
+    async def main():
+        return await asyncio.gather(*(llm_client.acall_llm("popular question") for _ in range(4)))
+
+    assert asyncio.run(main()) == ["FAKE: popular question"] * 4
+    assert len(calls) == 1
@@ -0,0 +1,32 @@
+# tests/test_state.py
+
+from rasa.core.state import apply_delta, merge_dicts
+
+
+def test_merge_dicts_is_shallow_merge():
+    left = {"intent": "travel", "preferences": {"region": "asia"}}
+    assert merge_dicts(left, {"preferences": {"region": "europe"}}) == {
+        "intent": "travel",
+        "preferences": {"region": "europe"},
+    }
+    assert merge_dicts(left, {}) is left
+    assert merge_dicts(None, None) == {}
+
+
+def test_apply_delta_merges_dict_keys_and_replaces_others():
+    state = {"output": "old", "context": {"a": 1}, "metadata": {"tone": "friendly"}}
+    updated = apply_delta(state, {"output": "new", "context": {"b": 2}})
+
+    assert updated == {"output": "new", "context": {"a": 1, "b": 2}, "metadata": {"tone": "friendly"}}
+    assert state["context"] == {"a": 1}  # Input state is left untouched
+
+
+def test_agents_return_partial_updates():
+    from rasa.operators.preference_agent import PreferenceAgent
+    from rasa.operators.tone_formatter import ToneFormatter
+
+    state = {"preferences": {"Region": " Asia "}, "context": {"intent": "x"}, "output": "Go.", "metadata": {}}
+
+    assert PreferenceAgent(name="preference_agent").run(state) == {"context": {"preferences": {"region": "asia"}}}
+    assert ToneFormatter(name="tone_formatter").run(state) == {"output": "Go."}
+    assert state["context"] == {"intent": "x"}
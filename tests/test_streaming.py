@@ -0,0 +1,78 @@
+# tests/test_streaming.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from rasa.api.main import app
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.core.streaming import ChunkPipeline, SentenceProcessor
+from rasa.frames import stateless_frame
+from rasa.operators.tone_formatter import ToneFormatter
+
+TEXT = "You should visit the old city! It is peaceful. You must try the food.\nEnjoy"
+
+
+def chunked(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def run_processor(processor, chunks):
+    return "".join(processor.feed(c) for c in chunks) + processor.flush()
+
+
+@pytest.mark.parametrize("tone", ["default", "friendly", "poetic", "concise"])
+@pytest.mark.parametrize("size", [1, 3, 7, 100])
+def test_tone_formatter_chunk_processor_matches_run(tone, size):
+    formatter = ToneFormatter(name="tone_formatter")
+    state = {"output": TEXT, "metadata": {"tone": tone}}
+    streamed = run_processor(formatter.chunk_processor(state), chunked(TEXT, size))
+    assert streamed == formatter.run(state)["output"]
+
+
+def test_chunk_pipeline_feeds_flush_output_downstream():
+    upper = SentenceProcessor(str.upper)
+    exclaim = SentenceProcessor(lambda text: text.replace(".", "!"), tail="?")
+    pipeline = ChunkPipeline([upper, exclaim])
+    assert run_processor(pipeline, chunked("one. two. three", 2)) == "ONE! TWO! THREE?"
+
+
+def fake_stream(prompt, **kwargs):
+    for word in f"Streamed answer to: {prompt}".split(" "):
+        yield word + " "
+
+
+async def fake_astream(prompt, **kwargs):
+    for chunk in fake_stream(prompt, **kwargs):
+        yield chunk
+
+
+def test_runner_stream_forwards_llm_chunks(monkeypatch):
+    monkeypatch.setattr(stateless_frame, "stream_llm", fake_stream)
+    runner = Runner(Persona.from_yaml("apps/strategic_stock_analyst/persona.yaml"))
+
+    chunks = list(runner.stream({"user_input": "Buy Apple?", "metadata": {"tone": "confident"}}))
+    assert len(chunks) > 1
+    # The fake echoes the assembled prompt: persona prefix first, the question last
+    assert "".join(chunks) == f"Streamed answer to: {runner.prompts.render({'user_input': 'Buy Apple?'})} "
+
+
+def test_runner_stream_falls_back_when_output_is_replaced(monkeypatch):
+    # The travel heuristic replaces the LLM text, so nothing can be streamed live
+    monkeypatch.setattr(stateless_frame, "stream_llm", fake_stream)
+    runner = Runner(Persona.from_yaml("apps/travel_concierge/persona.yaml"))
+
+    chunks = list(runner.stream({"user_input": "Plan a trip", "metadata": {"tone": "friendly"}}))
+    assert len(chunks) == 1
+    assert "Hallstatt" in chunks[0]
+
+
+def test_stream_endpoint_streams_chunks(monkeypatch):
+    monkeypatch.setattr(stateless_frame, "astream_llm", fake_astream)
+    client = TestClient(app)
+
+    payload = {"persona": "strategic_stock_analyst", "input": "Buy Apple?"}
+    with client.stream("POST", "/stream", json=payload) as response:
+        assert response.status_code == 200
+        body = "".join(response.iter_text())
+    assert body.startswith("Streamed answer to: You are") and body.endswith("Buy Apple? ")
@@ -0,0 +1,84 @@
+# tests/test_tokens.py
+
+import pytest
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.llm.llm_adapter import LLMAdapter, close_adapters
+from rasa.llm.tokens import estimate_tokens, record_usage, track_usage
+from rasa.prompts.assembler import ELLIPSIS, PromptAssembler
+from rasa.utils.trace import LLM_TOKENS
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    with FakeOllamaServer() as server:
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        monkeypatch.setenv("LLM_HOST", server.url)
+        close_adapters()
+        yield server
+        close_adapters()
+
+
+def _persona(budget: int) -> Persona:
+    return Persona.build({"name": "budgeted", "description": "Keeps prompts short", "prompt_style": "analytical",
+                          "metadata": {"token_budget": budget}})
+
+
+def test_missing_counts_are_estimated():
+    with track_usage() as usage:
+        record_usage("openai", "gpt-4o-mini", "x" * 40, "y" * 8)
+        record_usage("claude", "claude-3-haiku", "ignored", "ignored", prompt_tokens=7, completion_tokens=3)
+    assert usage.as_dict() == {"prompt": 17, "completion": 5, "total": 22, "calls": 2, "estimated": True}
+    assert estimate_tokens("") == 0
+
+
+def test_adapter_reports_ollama_counts(ollama):
+    llm = LLMAdapter(provider="ollama", model="llama3", host=ollama.url)
+    before = LLM_TOKENS.labels("unknown", "ollama", "llama3", "prompt", "reported")._value.get()
+    with track_usage() as usage:
+        llm.generate("Plan a trip to Lisbon")
+        "".join(llm.stream("Plan a trip"))
+    assert usage.prompt_tokens == 5 + 3  # The fake server counts words
+    assert usage.calls == 2 and not usage.estimated
+    assert LLM_TOKENS.labels("unknown", "ollama", "llama3", "prompt", "reported")._value.get() == before + 8
+
+
+def test_fit_trims_memory_before_preferences_and_input():
+    assembler = PromptAssembler(_persona(80))
+    state = {
+        "user_input": "Where should I go in May?",
+        "preferences": {"budget": 900},
+        "memory": {"last_trip": "Lisbon " * 60, "airline": "TAP"},
+    }
+    fitted, trimmed = assembler.fit(state)
+    assert trimmed == {"memory": ["last_trip"]}
+    assert fitted["memory"] == {"airline": "TAP"} and fitted["preferences"] == {"budget": 900}
+    assert estimate_tokens(assembler.render(fitted)) <= 80
+    assert assembler.fit({"user_input": "short"}) == ({"user_input": "short"}, {})
+
+
+def test_fit_keeps_both_ends_of_an_oversized_input():
+    assembler = PromptAssembler(_persona(80))
+    question = "Plan a trip. " + "filler " * 200 + "What about June?"
+    fitted, trimmed = assembler.fit({"user_input": question})
+    assert fitted["user_input"].startswith("Plan a trip.") and fitted["user_input"].endswith("June?")
+    assert ELLIPSIS in fitted["user_input"] and trimmed["input_chars"] > 0
+    assert estimate_tokens(assembler.render(fitted)) <= 81
+
+
+def test_budget_smaller_than_the_persona_prompt_fails_at_build():
+    with pytest.raises(ValueError):
+        PromptAssembler(_persona(5))
+
+
+def test_runner_records_tokens_and_trimming_in_metadata(ollama):
+    persona = Persona.from_yaml("apps/travel_concierge/persona.yaml")
+    persona.metadata["token_budget"] = 120
+    runner = Runner(persona)
+    state = runner.run({"user_input": "Plan a trip", "memory": {"notes": "long " * 400}, "metadata": {"llm_cache": False}})
+
+    assert state["metadata"]["tokens"]["prompt"] == len(ollama.last_payload["prompt"].split())
+    assert state["metadata"]["tokens"]["calls"] == 1
+    assert state["metadata"]["trimmed"] == {"memory": ["notes"]}
@@ -0,0 +1,167 @@
+# tests/test_vector_memory.py
+
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.fake_llm import FakeOllamaServer
+from rasa.core.persona import Persona
+from rasa.core.runner import Runner
+from rasa.frames import stateless_frame
+from rasa.memory import vector_memory
+from rasa.memory.vector_memory import HashEmbedder, LocalVectorStore, OllamaEmbedder, VectorMemory
+
+
+def test_hash_embedder_ranks_rephrasings_above_unrelated_text():
+    embedder = HashEmbedder()
+    base, rephrased, unrelated = embedder.embed([
+        "What is a good relaxed trip in Europe this spring?",
+        "what's a good relaxed trip in europe this spring",
+        "Explain how interest rates affect inflation",
+    ])
+    assert np.isclose(np.linalg.norm(base), 1.0)
+    assert base @ rephrased > 0.9
+    assert base @ unrelated < 0.5
+
+
+def test_vector_memory_returns_top_k_and_overwrites_oldest():
+    memory = VectorMemory(dim=2, max_size=3)
+    for i, vector in enumerate([[1, 0], [0, 1], [1, 1]]):
+        memory.add(np.array(vector, dtype=np.float32), f"v{i}")
+
+    assert [p for _, p in memory.search(np.array([1, 0.1]), k=2)] == ["v0", "v2"]
+
+    memory.add(np.array([-1, 0], dtype=np.float32), "v3")  # Replaces v0
+    assert len(memory) == 3
+    assert memory.search(np.array([1, 0]), k=1)[0][1] == "v2"
+
+
+def test_ollama_embedder_against_fake_server():
+    with FakeOllamaServer() as server:
+        vectors = OllamaEmbedder("nomic-embed-text", server.url).embed(["hello world", "hello world"])
+    assert vectors.shape == (2, 256)
+    assert np.isclose(vectors[0] @ vectors[1], 1.0)
+
+
+def clustered(n: int, dim: int = 32, clusters: int = 50, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def test_ivf_search_agrees_with_exact_search():
+    vectors = clustered(5000)
+    exact = LocalVectorStore(ivf_threshold=10**9, flush_every=10**9)
+    approx = LocalVectorStore(ivf_threshold=1000, nprobe=8, flush_every=10**9)
+    for i, vector in enumerate(vectors):
+        exact.add(vector, i)
+        approx.add(vector, i)
+    exact.flush()
+    approx.flush()
+    assert exact._ivf is None and approx._ivf is not None
+
+    queries = clustered(50, seed=1)
+    overlap = [
+        len({p for _, p in exact.search(q, k=10)} & {p for _, p in approx.search(q, k=10)}) / 10 for q in queries
+    ]
+    assert np.mean(overlap) >= 0.9
+
+
+def test_store_persists_to_memory_mapped_files(tmp_path):
+    vectors = clustered(300)
+    store = LocalVectorStore(path=str(tmp_path), ivf_threshold=200, flush_every=64)
+    for i, vector in enumerate(vectors):
+        store.add(vector, {"turn": i}, owner="alice" if i % 3 else "bob")
+    query = vectors[7]
+    assert store.search(query, k=1, owner="alice")[0][1] == {"turn": 7}  # Row 7 is still buffered
+
+    store.flush()
+    reader = LocalVectorStore(path=str(tmp_path), read_only=True)
+    assert isinstance(reader._columns["vectors"].values, np.memmap) and len(reader) == 300
+    assert reader._ivf is not None
+    assert reader.search(query, k=3, owner="alice") == store.search(query, k=3, owner="alice")
+    assert all(hit["turn"] % 3 == 0 for _, hit in reader.search(query, k=5, owner="bob"))
+
+    # Readers pick up the writer's next generation
+    store.add(vectors[0], {"turn": "new"}, owner="carol")
+    store.flush()
+    assert reader.search(vectors[0], k=1, owner="carol")[0][1] == {"turn": "new"}
+
+    # One writer per path; closing flushes and hands the path over
+    with pytest.raises(RuntimeError, match="already open for writing"):
+        LocalVectorStore(path=str(tmp_path))
+    store.add(vectors[1], {"turn": "last"}, owner="dave")
+    store.close()
+    reopened = LocalVectorStore(path=str(tmp_path))
+    assert reopened.search(vectors[1], k=1, owner="dave")[0][1] == {"turn": "last"}
+    reopened.close()
+
+
+def test_buffered_rows_are_flushed_on_a_timer(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path), flush_interval=0.05)
+    store.add(np.ones(8), {"turn": 1}, owner="alice")
+    time.sleep(0.2)
+    assert json.loads((tmp_path / "meta.json").read_text())["rows"] == 1
+    store.close()
+
+
+def test_in_memory_store_keeps_the_newest_rows():
+    vectors = clustered(100)
+    store = LocalVectorStore(max_rows=40, flush_every=16, ivf_threshold=30)
+    for i, vector in enumerate(vectors):
+        store.add(vector, {"turn": i}, owner="bob" if i % 2 else "alice")
+    store.flush()
+    assert len(store) == 40 and store._ivf is not None
+    turns = {hit["turn"] for _, hit in store.search(vectors[0], k=100, owner="alice")}
+    assert turns == set(range(60, 100, 2))
+    assert store.search(vectors[99], k=1)[0] == (pytest.approx(1.0), {"turn": 99})
+
+
+def test_long_term_frame_recalls_related_turns(monkeypatch):
+    prompts = []
+    monkeypatch.setattr(stateless_frame, "call_llm", lambda prompt, **kwargs: prompts.append(prompt) or "Noted.")
+    persona = Persona.build({"name": "recall", "frames": ["long_term_frame", "stateless_frame"], "memory_scope": "user"})
+    assert Runner(persona).plan.pruned == ["long_term_frame"]  # The default vector DB has no built-in client
+
+    monkeypatch.setenv("DEFAULT_VECTOR_DB_TYPE", "local")
+    monkeypatch.setattr(vector_memory, "_default_store", None)
+    runner = Runner(persona)
+    for text in ("Plan a spring trip to Kyoto", "Explain how interest rates affect inflation", "Kyoto trip in spring?"):
+        runner.run({"user_input": text, "metadata": {"user_id": "alice"}})
+    runner.run({"user_input": "Kyoto trip in spring?", "metadata": {"user_id": "bob"}})
+
+    assert "- related_1: Plan a spring trip to Kyoto -> Noted." in prompts[2]
+    assert "inflation" not in prompts[2]
+    assert "related_1" not in prompts[3]
+
+
+def test_async_runs_remember_long_term_turns_off_the_event_loop(monkeypatch, tmp_path):
+    async def fake_llm(prompt, **kwargs):
+        return "Noted."
+
+    monkeypatch.setattr(stateless_frame, "acall_llm", fake_llm)
+    monkeypatch.setenv("DEFAULT_VECTOR_DB_TYPE", "local")
+    monkeypatch.setenv("LONG_TERM_PATH", str(tmp_path))
+    monkeypatch.setattr(vector_memory, "_default_store", None)
+    persona = Persona.build({"name": "recall", "frames": ["long_term_frame", "stateless_frame"], "memory_scope": "user"})
+    runner = Runner(persona)
+    store = runner.frames["long_term_frame"].store
+    on_loop = []
+    add = store.add
+
+    def tracking_add(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        add(*args, **kwargs)
+
+    monkeypatch.setattr(store, "add", tracking_add)
+    asyncio.run(runner.arun({"user_input": "Plan a spring trip to Kyoto", "metadata": {"user_id": "alice"}}))
+    assert on_loop == [False] and len(store) == 1
+    vector_memory.close_long_term_store()
+    assert json.loads((tmp_path / "meta.json").read_text())["rows"] == 1